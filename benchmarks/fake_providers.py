@@ -0,0 +1,692 @@
+# benchmarks/fake_providers.py
+"""
+외부 API 가짜 서버 (OpenAI, Anthropic, Replicate, Suno, S3)
+
+API 키/비용 없이 전체 파이프라인을 실행하기 위한 로컬 서버
+- 제공자별 지연 시간 분포(로그정규)와 실패율 지정 가능
+- Replicate 결과는 로컬에서 만든 합성 MP4/JPEG, Suno 결과는 합성 MP3
+- LLM 응답은 프롬프트의 출력 형식 표시로 노드를 구분해 파싱 가능한 응답 생성
+
+단독 실행: python -m benchmarks.fake_providers --port 9000 --time-scale 0.1
+연결 설정 (.env):
+    OPENAI_BASE_URL=http://127.0.0.1:9000/openai/v1
+    ANTHROPIC_BASE_URL=http://127.0.0.1:9000/anthropic
+    REPLICATE_BASE_URL=http://127.0.0.1:9000/replicate
+    SUNO_API_BASE_URL=http://127.0.0.1:9000/suno
+    S3_ENDPOINT_URL=http://127.0.0.1:9000
+"""
+import os
+import re
+import json
+import time
+import uuid
+import random
+import asyncio
+import hashlib
+import argparse
+import tempfile
+import subprocess
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote
+from xml.sax.saxutils import escape
+import httpx
+import numpy as np
+from PIL import Image
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+from fastapi.staticfiles import StaticFiles
+
+
+@dataclass
+class ProviderProfile:
+    """지연 시간 분포 (중앙값 초, 로그정규 sigma) 및 실패율"""
+    median: float
+    sigma: float = 0.3
+    failure_rate: float = 0.0
+
+    def sample_latency(self, rng: random.Random, time_scale: float) -> float:
+        return self.median * rng.lognormvariate(0, self.sigma) * time_scale
+
+    def should_fail(self, rng: random.Random) -> bool:
+        return rng.random() < self.failure_rate
+
+
+# 실제 서비스 기준 대략적인 지연 시간
+DEFAULT_PROFILES = {
+    "openai": ProviderProfile(2.0, 0.4),
+    "anthropic": ProviderProfile(3.0, 0.4),
+    "replicate_image": ProviderProfile(8.0, 0.3),
+    "replicate_video": ProviderProfile(60.0, 0.3),
+    "replicate": ProviderProfile(3.0, 0.3),
+    "suno": ProviderProfile(90.0, 0.25),
+    "s3": ProviderProfile(0.05, 0.3)
+}
+
+# Replicate "Prefer: wait" 최대 대기 (실제 API와 동일하게 이후에는 진행 중 상태 반환)
+REPLICATE_MAX_WAIT = 60.0
+
+
+def parse_profile(value: str) -> Tuple[str, ProviderProfile]:
+    """'openai=2.0,0.4,0.05' → (제공자, 중앙값/sigma/실패율)"""
+    name, _, spec = value.partition("=")
+    parts = [float(p) for p in spec.split(",") if p]
+    defaults = DEFAULT_PROFILES.get(name, ProviderProfile(1.0))
+
+    return name, ProviderProfile(
+        median = parts[0] if len(parts) > 0 else defaults.median,
+        sigma = parts[1] if len(parts) > 1 else defaults.sigma,
+        failure_rate = parts[2] if len(parts) > 2 else defaults.failure_rate
+    )
+
+
+# ================= Synthetic media =================
+
+def _ffmpeg_exe() -> str:
+    from moviepy.config import get_setting
+    return get_setting("FFMPEG_BINARY")
+
+
+def build_media(media_dir: str, input_images: int = 3) -> None:
+    """합성 입력 이미지 / 장면 이미지 / 영상 세그먼트 / 음악 생성 (이미 있으면 재사용)"""
+    os.makedirs(media_dir, exist_ok = True)
+    rng = np.random.default_rng(0)
+
+    def gradient_image(path: str, size: Tuple[int, int], base: Tuple[int, int, int]) -> None:
+        if os.path.exists(path):
+            return
+        w, h = size
+        x = np.linspace(0, 1, w, dtype = np.float32)[None, :, None]
+        y = np.linspace(0, 1, h, dtype = np.float32)[:, None, None]
+        pixels = np.array(base, dtype = np.float32) * (0.5 + 0.5 * x) * (0.6 + 0.4 * y)
+        pixels += rng.normal(0, 8, (h, w, 3))
+        Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8)).save(path, quality = 90)
+
+    for i in range(input_images):
+        gradient_image(os.path.join(media_dir, f"input_{i}.jpg"), (1024, 1024), (200 - i * 40, 120 + i * 30, 90 + i * 50))
+
+    gradient_image(os.path.join(media_dir, "scene.jpg"), (1280, 720), (220, 150, 110))
+
+    segment_path = os.path.join(media_dir, "segment.mp4")
+    if not os.path.exists(segment_path):
+        subprocess.run([
+            _ffmpeg_exe(), "-hide_banner", "-loglevel", "error", "-y",
+            "-f", "lavfi", "-i", "testsrc2=size=1280x720:rate=24:duration=5",
+            "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p",
+            segment_path
+        ], check = True)
+
+    track_path = os.path.join(media_dir, "track.mp3")
+    if not os.path.exists(track_path):
+        subprocess.run([
+            _ffmpeg_exe(), "-hide_banner", "-loglevel", "error", "-y",
+            "-f", "lavfi", "-i", "sine=frequency=220:duration=90",
+            "-c:a", "libmp3lame", "-b:a", "128k",
+            track_path
+        ], check = True)
+
+
+# ================= LLM responses =================
+
+def _scenarios(text: str) -> str:
+    return json.dumps([
+        {"title": f"시나리오 {i}", "content": "매장의 아침을 여는 장면에서 시작해 대표 메뉴가 완성되는 과정을 따라가며 손님이 첫 입을 맛보는 순간으로 마무리되는 따뜻한 이야기입니다. " * 2}
+        for i in range(1, 4)
+    ], ensure_ascii = False)
+
+
+def _image_analysis(text: str, image_count: int) -> str:
+    return json.dumps([
+        {"main_object": ["대표 메뉴", "매장 내부"], "brand_identity": ["따뜻함", "모던"], "description": f"입력 이미지 {i} 설명"}
+        for i in range(max(1, image_count))
+    ], ensure_ascii = False)
+
+
+def _scenes(text: str) -> str:
+    match = re.search(r"정확히 (\d+)개의 장면", text)
+    count = int(match.group(1)) if match else 3
+
+    return json.dumps([
+        {"장면 제목": f"Scene {i}", "장면 설명": f"Close-up of the signature dish {i}. Warm light fills the counter. Steam rises slowly."}
+        for i in range(1, count + 1)
+    ], ensure_ascii = False)
+
+
+def _scene_plan(text: str) -> str:
+    scenes = json.loads(_scenes(text))
+
+    return json.dumps({
+        "scenes": [{"title": scene["장면 제목"], "content": scene["장면 설명"]} for scene in scenes],
+        "scene_summary": "Warm amber and cream palette, cozy modern mood, soft natural light with shallow depth of field."
+    })
+
+
+def _scene_config(text: str) -> str:
+    return json.dumps({"image_index": [0], "flux-kontext-prompt": "A warm cafe counter with the signature dish in soft morning light"})
+
+
+def _scene_configs(text: str) -> str:
+    match = re.search(r"다음 (\d+)개 장면 각각", text)
+    count = int(match.group(1)) if match else 3
+
+    return json.dumps({"scenes": [
+        {"scene_index": i, **json.loads(_scene_config(text))}
+        for i in range(1, count + 1)
+    ]})
+
+
+def _character(text: str) -> str:
+    return json.dumps({
+        "has_characters": False,
+        "start_character": "no person",
+        "tail_character": "no person",
+        "same_person": True,
+        "gender_change": False,
+        "key_differences": []
+    })
+
+
+def _suno_prompt(text: str) -> str:
+    match = re.search(r"Starts with (\d+)bpm", text)
+    bpm = match.group(1) if match else "100"
+
+    return json.dumps({"prompt": f"{bpm}bpm warm acoustic groove", "style": "indie", "title": "Morning Counter", "negativeTags": ["vocals", "heavy metal"]})
+
+
+def _report(text: str) -> str:
+    return json.dumps({
+        "performance_score": 72,
+        "performance_grade": "B",
+        "content_effectiveness": {"engagement": "양호"},
+        "detailed_analysis": {"views": "평균 이상"},
+        "insights": [{"title": "댓글 반응 긍정적", "detail": "긍정 비율이 높음"}],
+        "content_recommendations": [{"action": "후속 콘텐츠 제작"}],
+        "strategy": {"short_term": "댓글 응답 강화"},
+        "action_items": [{"priority": "high", "timeline": "7d", "action": "후속 게시글", "owner": "마케팅", "success_metric": "조회수", "dependencies": []}]
+    }, ensure_ascii = False)
+
+
+def _markdown_report(text: str) -> str:
+    return "# 📊 SNS 게시글 성과 분석 보고서\n\n## 요약\n- 성과 점수: **72**\n\n## 📌 우선순위 액션 아이템\n| 우선순위 | 액션 |\n|---|---|\n| 높음 | 후속 게시글 |\n"
+
+
+def _content(text: str) -> str:
+    return json.dumps({"title": "대표 메뉴 소개", "content": "따뜻한 분위기의 매장", "keywords": ["카페", "디저트"], "mood": "따뜻함", "target_audience": "20-30대"}, ensure_ascii = False)
+
+
+def _trend(text: str) -> str:
+    return json.dumps({
+        "keywords": ["디저트"], "hashtags": ["카페투어"], "memes": [], "current_issues": [],
+        "popular_topics": ["신메뉴"], "business_trend": ["저당"], "season_trend": ["가을"], "location_trend": []
+    }, ensure_ascii = False)
+
+
+def _post(text: str) -> str:
+    return json.dumps({"title": "가을 신메뉴 출시", "content": "따뜻한 가을 디저트를 만나보세요. 지금 매장에서 확인하세요!"}, ensure_ascii = False)
+
+
+def _hashtags(text: str) -> str:
+    return "카페, 디저트, 신메뉴, 가을, 카페투어, 데일리, 맛집"
+
+
+def _default(text: str) -> str:
+    return "Multiple shots. Slow push-in on the counter as warm light spreads across the signature dish, steam rising gently."
+
+
+# 프롬프트에 포함된 출력 형식 표시 → 응답 생성 함수 (앞에서부터 먼저 일치하는 항목 사용)
+# 해시태그/게시글 프롬프트는 트렌드 분석 결과를 포함하므로 트렌드보다 먼저 확인
+LLM_RESPONDERS: List[Tuple[str, Callable[[str], str]]] = [
+    ('"scene_summary":', _scene_plan),
+    ('"scenes": [', _scene_configs),
+    ("flux-kontext-prompt", _scene_config),
+    ("Compare the main human characters", _character),
+    ('"negativeTags"', _suno_prompt),
+    ('"performance_score"', _report),
+    ("<음식점|카페|패션|뷰티|테크>", lambda text: "카페"),
+    ("마크다운 보고서", _markdown_report),
+    ('"장면 제목"', _scenes),
+    ("스토리 형식의 시나리오 설명", _scenarios),
+    ("쉼표로 구분된 해시태그", _hashtags),
+    ('"title": "게시글 제목"', _post),
+    ('"season_trend"', _trend),
+    ('"target_audience"', _content)
+]
+
+
+def _message_text(content: Any) -> Tuple[str, int]:
+    """메시지 content → (텍스트, 이미지 개수)"""
+    if isinstance(content, str):
+        return content, 0
+
+    texts, images = [], 0
+    for part in content or []:
+        if part.get("type") == "text":
+            texts.append(part.get("text", ""))
+        elif part.get("type") in ("image_url", "image"):
+            images += 1
+
+    return "\n".join(texts), images
+
+
+def fake_llm_reply(system: Any, messages: List[Dict[str, Any]]) -> str:
+    system_text, _ = _message_text(system)
+    parts = [system_text]
+    image_count = 0
+
+    for message in messages:
+        text, images = _message_text(message.get("content"))
+        parts.append(text)
+        image_count += images
+
+    text = "\n".join(parts)
+
+    if '"main_object"' in text:
+        return _image_analysis(text, image_count)
+
+    for marker, responder in LLM_RESPONDERS:
+        if marker in text:
+            return responder(text)
+
+    return _default(text)
+
+
+def _token_count(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+# ================= App =================
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def create_app(media_dir: str,
+               profiles: Optional[Dict[str, ProviderProfile]] = None,
+               time_scale: float = 1.0,
+               seed: int = 0) -> FastAPI:
+    """가짜 제공자 서버 (public_base_url은 첫 요청의 Host 기준)"""
+    profiles = {**DEFAULT_PROFILES, **(profiles or {})}
+    rng = random.Random(seed)
+
+    predictions: Dict[str, Dict[str, Any]] = {}
+    suno_tasks: Dict[str, Dict[str, Any]] = {}
+    s3_objects: Dict[Tuple[str, str], Tuple[bytes, float]] = {}
+    s3_uploads: Dict[str, Dict[int, bytes]] = {}
+
+    app = FastAPI(title = "Fake providers")
+    app.state.counters = {}
+
+    def count(name: str) -> None:
+        app.state.counters[name] = app.state.counters.get(name, 0) + 1
+
+    def base_url(request: Request) -> str:
+        return str(request.base_url).rstrip("/")
+
+    async def delay(provider: str) -> bool:
+        """지연 후 실패 여부 반환"""
+        profile = profiles[provider]
+        await asyncio.sleep(profile.sample_latency(rng, time_scale))
+        return profile.should_fail(rng)
+
+    # ---------- OpenAI ----------
+
+    @app.post("/openai/v1/chat/completions")
+    async def openai_chat(request: Request):
+        count("openai")
+        body = await request.json()
+
+        if await delay("openai"):
+            return JSONResponse({"error": {"message": "fake overload", "type": "server_error"}}, status_code = 503)
+
+        prompt_text = json.dumps(body.get("messages"), ensure_ascii = False)
+        content = fake_llm_reply("", body.get("messages", []))
+
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": _token_count(prompt_text),
+                "completion_tokens": _token_count(content),
+                "total_tokens": _token_count(prompt_text) + _token_count(content)
+            }
+        }
+
+    # ---------- Anthropic ----------
+
+    @app.post("/anthropic/v1/messages")
+    async def anthropic_messages(request: Request):
+        count("anthropic")
+        body = await request.json()
+
+        if await delay("anthropic"):
+            return JSONResponse({"type": "error", "error": {"type": "overloaded_error", "message": "fake overload"}}, status_code = 529)
+
+        prompt_text = json.dumps(body.get("messages"), ensure_ascii = False) + str(body.get("system", ""))
+        content = fake_llm_reply(body.get("system", ""), body.get("messages", []))
+
+        return {
+            "id": f"msg_{uuid.uuid4().hex}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model"),
+            "content": [{"type": "text", "text": content}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": _token_count(prompt_text), "output_tokens": _token_count(content)}
+        }
+
+    # ---------- Replicate ----------
+
+    def prediction_output(record: Dict[str, Any], request: Request) -> Any:
+        model = record["model"]
+        files = f"{base_url(request)}/files"
+
+        if "seedance" in model:
+            return f"{files}/segment.mp4"
+        if "flux" in model:
+            return f"{files}/scene.jpg"
+
+        # 댓글 감정 분석
+        texts = record["input"].get("texts") or []
+        ids = record["input"].get("ids") or list(range(len(texts)))
+        labels = ["POSITIVE", "NEUTRAL", "NEGATIVE"]
+
+        return {
+            "individual_results": [{"id": ids[i], "result": labels[i % 3]} for i in range(len(texts))],
+            "keywords": {"positive": ["맛있다"], "negative": ["비싸다"], "neutral": ["매장"]}
+        }
+
+    def prediction_view(record: Dict[str, Any], request: Request) -> Dict[str, Any]:
+        """경과 시간 기준 상태 갱신 후 응답 형식으로 반환"""
+        elapsed = time.monotonic() - record["started"]
+
+        if record["status"] not in ("succeeded", "failed", "canceled") and elapsed >= record["latency"]:
+            record["status"] = "failed" if record["fail"] else "succeeded"
+            record["completed_at"] = _now()
+
+        elif record["status"] == "starting" and elapsed >= record["latency"] * 0.1:
+            record["status"] = "processing"
+
+        view = {
+            "id": record["id"],
+            "model": record["model"],
+            "version": record["version"],
+            "status": record["status"],
+            "input": record["input"],
+            "output": prediction_output(record, request) if record["status"] == "succeeded" else None,
+            "logs": "",
+            "error": "fake failure" if record["status"] == "failed" else None,
+            "metrics": {"predict_time": round(min(elapsed, record["latency"]), 3)},
+            "created_at": record["created_at"],
+            "started_at": record["created_at"],
+            "completed_at": record.get("completed_at"),
+            "urls": {
+                "get": f"{base_url(request)}/replicate/v1/predictions/{record['id']}",
+                "cancel": f"{base_url(request)}/replicate/v1/predictions/{record['id']}/cancel"
+            }
+        }
+
+        return view
+
+    async def create_prediction(request: Request, model: str, version: str, body: Dict[str, Any]):
+        count("replicate")
+        provider = "replicate_video" if "seedance" in model else "replicate_image" if "flux" in model else "replicate"
+        profile = profiles[provider]
+
+        record = {
+            "id": uuid.uuid4().hex[:20],
+            "model": model,
+            "version": version,
+            "status": "starting",
+            "input": body.get("input", {}),
+            "created_at": _now(),
+            "started": time.monotonic(),
+            "latency": profile.sample_latency(rng, time_scale),
+            "fail": profile.should_fail(rng)
+        }
+        predictions[record["id"]] = record
+
+        # 동기 대기 요청: 완료(또는 최대 대기 시간)까지 응답 보류
+        if "wait" in request.headers.get("prefer", ""):
+            await asyncio.sleep(min(record["latency"], REPLICATE_MAX_WAIT * time_scale))
+
+        return JSONResponse(prediction_view(record, request), status_code = 201)
+
+    @app.post("/replicate/v1/models/{owner}/{name}/predictions")
+    async def replicate_model_prediction(owner: str, name: str, request: Request):
+        return await create_prediction(request, f"{owner}/{name}", "", await request.json())
+
+    @app.post("/replicate/v1/predictions")
+    async def replicate_version_prediction(request: Request):
+        body = await request.json()
+        return await create_prediction(request, "fake/version-model", body.get("version", ""), body)
+
+    @app.get("/replicate/v1/predictions/{prediction_id}")
+    async def replicate_get_prediction(prediction_id: str, request: Request):
+        record = predictions.get(prediction_id)
+        if record is None:
+            return JSONResponse({"detail": "Not found"}, status_code = 404)
+        return prediction_view(record, request)
+
+    @app.post("/replicate/v1/predictions/{prediction_id}/cancel")
+    async def replicate_cancel_prediction(prediction_id: str, request: Request):
+        record = predictions.get(prediction_id)
+        if record is None:
+            return JSONResponse({"detail": "Not found"}, status_code = 404)
+
+        if record["status"] not in ("succeeded", "failed"):
+            record["status"] = "canceled"
+            record["completed_at"] = _now()
+
+        return prediction_view(record, request)
+
+    @app.get("/replicate/v1/models/{owner}/{name}/versions/{version_id}")
+    async def replicate_version(owner: str, name: str, version_id: str):
+        return {"id": version_id, "created_at": _now(), "cog_version": "0.9.0", "openapi_schema": {}}
+
+    # ---------- Suno ----------
+
+    @app.post("/suno/api/v1/generate")
+    async def suno_generate(request: Request):
+        count("suno")
+        body = await request.json()
+        profile = profiles["suno"]
+
+        task_id = uuid.uuid4().hex
+        task = {
+            "started": time.monotonic(),
+            "latency": profile.sample_latency(rng, time_scale),
+            "fail": profile.should_fail(rng),
+            "callback_url": body.get("callBackUrl")
+        }
+        suno_tasks[task_id] = task
+
+        asyncio.get_running_loop().create_task(send_suno_callback(task_id, task, base_url(request)))
+
+        return {"code": 200, "msg": "success", "data": {"taskId": task_id}}
+
+    def suno_tracks(base: str) -> List[Dict[str, Any]]:
+        return [{"id": uuid.uuid4().hex, "audioUrl": f"{base}/files/track.mp3", "duration": 90} for _ in range(2)]
+
+    def suno_status(task: Dict[str, Any]) -> str:
+        progress = (time.monotonic() - task["started"]) / max(task["latency"], 1e-6)
+
+        if progress >= 1:
+            return "GENERATE_AUDIO_FAILED" if task["fail"] else "SUCCESS"
+        if progress >= 0.8:
+            return "FIRST_SUCCESS"
+        if progress >= 0.5:
+            return "TEXT_SUCCESS"
+        return "PENDING"
+
+    async def send_suno_callback(task_id: str, task: Dict[str, Any], base: str) -> None:
+        """완료 시점에 콜백 전송 (응답 없는 주소면 무시, 폴링으로 대기)"""
+        if not task["callback_url"] or "example.com" in task["callback_url"]:
+            return
+
+        await asyncio.sleep(task["latency"])
+
+        if task["fail"]:
+            payload = {"code": 500, "msg": "fake failure", "data": {"callbackType": "error", "task_id": task_id, "data": []}}
+        else:
+            tracks = [{"audio_url": track["audioUrl"]} for track in suno_tracks(base)]
+            payload = {"code": 200, "msg": "success", "data": {"callbackType": "complete", "task_id": task_id, "data": tracks}}
+
+        try:
+            async with httpx.AsyncClient(timeout = 5) as client:
+                await client.post(task["callback_url"], json = payload)
+        except Exception as e:
+            print(f"[FAKE SUNO] 콜백 전송 실패: {e}")
+
+    @app.get("/suno/api/v1/generate/record-info")
+    async def suno_record_info(taskId: str, request: Request):
+        task = suno_tasks.get(taskId)
+        if task is None:
+            return {"code": 404, "msg": "task not found", "data": None}
+
+        status = suno_status(task)
+        response = {"sunoData": suno_tracks(base_url(request))} if status == "SUCCESS" else None
+
+        return {"code": 200, "msg": "success", "data": {"taskId": taskId, "status": status, "response": response}}
+
+    # ---------- Files ----------
+
+    app.mount("/files", StaticFiles(directory = media_dir), name = "files")
+
+    # ---------- S3 (path-style, 업로드/조회/목록에 필요한 동작만) ----------
+
+    def s3_xml(body: str, status_code: int = 200) -> Response:
+        return Response(f'<?xml version="1.0" encoding="UTF-8"?>\n{body}', status_code = status_code, media_type = "application/xml")
+
+    def s3_error(code: str, status_code: int) -> Response:
+        return s3_xml(f"<Error><Code>{code}</Code><Message>{code}</Message></Error>", status_code)
+
+    def etag(data: bytes) -> str:
+        return f'"{hashlib.md5(data).hexdigest()}"'
+
+    @app.api_route("/{bucket}", methods = ["GET", "PUT", "HEAD"])
+    async def s3_bucket(bucket: str, request: Request):
+        if request.method in ("PUT", "HEAD"):
+            return Response(status_code = 200)
+
+        # ListObjectsV2
+        prefix = request.query_params.get("prefix", "")
+        contents = "".join(
+            f"<Contents><Key>{escape(key)}</Key>"
+            f"<LastModified>{datetime.fromtimestamp(modified, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.000Z')}</LastModified>"
+            f"<ETag>{escape(etag(data))}</ETag><Size>{len(data)}</Size><StorageClass>STANDARD</StorageClass></Contents>"
+            for (b, key), (data, modified) in sorted(s3_objects.items())
+            if b == bucket and key.startswith(prefix)
+        )
+        key_count = contents.count("<Contents>")
+
+        return s3_xml(
+            f'<ListBucketResult xmlns="http://s3.amazonaws.com/doc/2006-03-01/"><Name>{bucket}</Name>'
+            f"<Prefix>{escape(prefix)}</Prefix><KeyCount>{key_count}</KeyCount><MaxKeys>1000</MaxKeys>"
+            f"<IsTruncated>false</IsTruncated>{contents}</ListBucketResult>"
+        )
+
+    @app.api_route("/{bucket}/{key:path}", methods = ["GET", "PUT", "POST", "HEAD", "DELETE"])
+    async def s3_object(bucket: str, key: str, request: Request):
+        params = request.query_params
+        count("s3")
+
+        if await delay("s3") and request.method in ("PUT", "POST"):
+            return s3_error("SlowDown", 503)
+
+        # 멀티파트 업로드
+        if request.method == "POST" and "uploads" in params:
+            upload_id = uuid.uuid4().hex
+            s3_uploads[upload_id] = {}
+            return s3_xml(
+                f"<InitiateMultipartUploadResult><Bucket>{bucket}</Bucket><Key>{escape(key)}</Key>"
+                f"<UploadId>{upload_id}</UploadId></InitiateMultipartUploadResult>"
+            )
+
+        if request.method == "PUT" and "uploadId" in params:
+            parts = s3_uploads.get(params["uploadId"])
+            if parts is None:
+                return s3_error("NoSuchUpload", 404)
+            data = await request.body()
+            parts[int(params["partNumber"])] = data
+            return Response(status_code = 200, headers = {"ETag": etag(data)})
+
+        if request.method == "POST" and "uploadId" in params:
+            parts = s3_uploads.pop(params["uploadId"], None)
+            if parts is None:
+                return s3_error("NoSuchUpload", 404)
+            data = b"".join(parts[number] for number in sorted(parts))
+            s3_objects[(bucket, key)] = (data, time.time())
+            return s3_xml(
+                f"<CompleteMultipartUploadResult><Location>/{bucket}/{escape(key)}</Location><Bucket>{bucket}</Bucket>"
+                f"<Key>{escape(key)}</Key><ETag>{escape(etag(data))}</ETag></CompleteMultipartUploadResult>"
+            )
+
+        if request.method == "DELETE" and "uploadId" in params:
+            s3_uploads.pop(params["uploadId"], None)
+            return Response(status_code = 204)
+
+        # 단일 객체
+        if request.method == "PUT" and "x-amz-copy-source" in request.headers:
+            source_bucket, _, source_key = unquote(request.headers["x-amz-copy-source"]).lstrip("/").partition("/")
+            source = s3_objects.get((source_bucket, source_key))
+            if source is None:
+                return s3_error("NoSuchKey", 404)
+
+            s3_objects[(bucket, key)] = (source[0], time.time())
+            return s3_xml(
+                f"<CopyObjectResult><ETag>{etag(source[0])}</ETag>"
+                f"<LastModified>{datetime.now(timezone.utc).isoformat()}</LastModified></CopyObjectResult>"
+            )
+
+        if request.method == "PUT":
+            data = await request.body()
+            s3_objects[(bucket, key)] = (data, time.time())
+            return Response(status_code = 200, headers = {"ETag": etag(data)})
+
+        if request.method == "DELETE":
+            s3_objects.pop((bucket, key), None)
+            return Response(status_code = 204)
+
+        stored = s3_objects.get((bucket, key))
+        if stored is None:
+            return Response(status_code = 404) if request.method == "HEAD" else s3_error("NoSuchKey", 404)
+
+        data, modified = stored
+        headers = {
+            "ETag": etag(data),
+            "Content-Length": str(len(data)),
+            "Last-Modified": datetime.fromtimestamp(modified, timezone.utc).strftime("%a, %d %b %Y %H:%M:%S GMT")
+        }
+
+        if request.method == "HEAD":
+            return Response(status_code = 200, headers = headers)
+        return Response(data, status_code = 200, headers = headers, media_type = "application/octet-stream")
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description = "외부 API 가짜 서버")
+    parser.add_argument("--host", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = 9000)
+    parser.add_argument("--media-dir", default = os.path.join(tempfile.gettempdir(), "fake_providers_media"))
+    parser.add_argument("--time-scale", type = float, default = 1.0, help = "지연 시간 배율 (0.1 = 10배 빠르게)")
+    parser.add_argument("--profile", action = "append", default = [], help = "제공자=중앙값,sigma,실패율 (예: openai=1.5,0.4,0.02)")
+    parser.add_argument("--seed", type = int, default = 0)
+    args = parser.parse_args()
+
+    build_media(args.media_dir)
+    profiles = dict(parse_profile(value) for value in args.profile)
+
+    uvicorn.run(create_app(args.media_dir, profiles, args.time_scale, args.seed), host = args.host, port = args.port, log_level = "warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+# benchmarks/pipeline_benchmark.py
+"""
+전체 파이프라인 벤치마크 (가짜 외부 API 사용, API 키/비용 없음)
+
+benchmarks.fake_providers 서버와 FastAPI 앱(main.app), 영상 생성 워커를 한 프로세스에서 띄우고
+각 라우터를 지정한 동시성으로 호출해 처리량, 지연 시간 분위수(p50/p95/p99), 노드별/외부 호출별 시간을 출력
+
+필요: Redis Stack (RedisJSON, LangGraph 체크포인트), REDIS_URL로 지정
+
+실행:
+    python -m benchmarks.pipeline_benchmark --scenario sns_post --requests 20 --concurrency 4
+    python -m benchmarks.pipeline_benchmark --scenario shorts --requests 4 --concurrency 2 --time-scale 0.05
+    python -m benchmarks.pipeline_benchmark --scenario shorts --scene-planning separate   # 장면 생성/요약 2단계 비교
+    python -m benchmarks.pipeline_benchmark --scenario all --profile replicate_video=60,0.3,0.1
+"""
+import os
+import time
+import socket
+import asyncio
+import argparse
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import httpx
+import uvicorn
+from prometheus_client import REGISTRY
+from benchmarks.fake_providers import build_media, create_app, parse_profile
+
+SCENARIOS = ("shorts", "sns_post", "comments", "report")
+
+# 영상 생성 작업 상태 조회 간격
+JOB_POLL_INTERVAL = 0.5
+
+
+@dataclass
+class RequestResult:
+    ok: bool
+    seconds: float
+    phases: Dict[str, float] = field(default_factory = dict)
+    error: Optional[str] = None
+
+
+# ================= Servers =================
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(app, port: int) -> uvicorn.Server:
+    """uvicorn 서버를 백그라운드 스레드로 시작 (요청 가능 상태까지 대기)"""
+    server = uvicorn.Server(uvicorn.Config(app, host = "127.0.0.1", port = port, log_level = "warning"))
+    threading.Thread(target = server.run, daemon = True).start()
+
+    while not server.started:
+        time.sleep(0.05)
+
+    return server
+
+
+def configure_environment(fake_url: str, api_url: str, args: argparse.Namespace) -> None:
+    """설정(config.settings) import 전에 외부 API 주소를 가짜 서버로 지정"""
+    os.environ.update({
+        "OPENAI_API_KEY": "fake",
+        "CLAUDE_API_KEY": "fake",
+        "REPLICATE_API_KEY": "fake",
+        "SUNO_API_KEY": "fake",
+        "AWS_ACCESS_KEY_ID": "fake",
+        "AWS_SECRET_ACCESS_KEY": "fake",
+        "AWS_DEFAULT_REGION": "us-east-1",
+        "OPENAI_BASE_URL": f"{fake_url}/openai/v1",
+        "ANTHROPIC_BASE_URL": f"{fake_url}/anthropic",
+        "REPLICATE_BASE_URL": f"{fake_url}/replicate",
+        "SUNO_API_BASE_URL": f"{fake_url}/suno",
+        "S3_ENDPOINT_URL": fake_url,
+        "WORKSPACE_ROOT": os.path.join(tempfile.gettempdir(), "pipeline_benchmark_workspaces"),
+        # 캐시 적중으로 외부 호출이 생략되지 않도록 기본은 캐시 끔
+        "ARTIFACT_BACKEND": "local" if args.with_cache else "none",
+        "LLM_CACHE_ENABLED": "true" if args.with_cache else "false",
+        # 가짜 서버 기준으로 폴링 간격도 함께 축소
+        "REPLICATE_POLL_INTERVAL": str(max(0.05, 3.0 * args.time_scale)),
+        "SUNO_POLL_MIN_INTERVAL": str(max(0.05, 5.0 * args.time_scale)),
+        "SUNO_POLL_MAX_INTERVAL": str(max(0.1, 30.0 * args.time_scale))
+    })
+
+    os.environ["SHORTS_FUSED_SCENE_PLANNING"] = "true" if args.scene_planning == "fused" else "false"
+
+    if args.suno_callback:
+        os.environ["SUNO_CALLBACK_URL"] = f"{api_url}/api/shorts/suno/callback"
+
+
+def start_workers(count: int) -> None:
+    """영상 생성 워커 루프를 스레드로 실행 (별도 워커 프로세스 대신)"""
+    from workers.shorts_worker import worker_loop
+
+    for i in range(count):
+        threading.Thread(target = worker_loop, args = (i,), daemon = True).start()
+
+
+# ================= Scenarios =================
+
+def image_urls(fake_url: str, count: int = 3) -> List[str]:
+    return [f"{fake_url}/files/input_{i}.jpg" for i in range(count)]
+
+
+async def run_shorts(client: httpx.AsyncClient, fake_url: str, index: int, args: argparse.Namespace) -> RequestResult:
+    """시나리오 생성 → 영상 작업 등록 → 완료까지 상태 조회"""
+    phases = {}
+    started = time.perf_counter()
+
+    response = await client.post("/api/shorts/agent/scenarios", json = {
+        "store_name": f"벤치마크 카페 {index}",
+        "business_type": "카페",
+        "brand_concept": ["따뜻함", "모던"],
+        "platform": "instagram",
+        "ad_type": "신메뉴",
+        "target_audience": "20-30대",
+        "scenario_prompt": "가을 신메뉴를 따뜻하게 소개"
+    })
+    response.raise_for_status()
+    scenario_response = response.json()
+    phases["scenarios"] = time.perf_counter() - started
+
+    if not scenario_response["scenarios"]:
+        raise RuntimeError("시나리오 없음")
+
+    scenario = scenario_response["scenarios"][0]
+    response = await client.post("/api/shorts/agent/videos", json = {
+        "session_id": scenario_response["session_id"],
+        "title": scenario["title"],
+        "content": scenario["content"],
+        "ad_duration": args.ad_duration,
+        "image_list": image_urls(fake_url)
+    })
+    response.raise_for_status()
+    job_id = response.json()["job_id"]
+
+    video_started = time.perf_counter()
+    while True:
+        await asyncio.sleep(JOB_POLL_INTERVAL)
+        job = (await client.get(f"/api/shorts/agent/videos/{job_id}")).json()
+
+        if job["status"] in ("succeeded", "failed"):
+            break
+
+    phases["video"] = time.perf_counter() - video_started
+
+    if job["status"] == "failed":
+        raise RuntimeError(job.get("error") or "영상 생성 실패")
+
+    return RequestResult(ok = True, seconds = time.perf_counter() - started, phases = phases)
+
+
+async def run_sns_post(client: httpx.AsyncClient, fake_url: str, index: int, args: argparse.Namespace) -> RequestResult:
+    started = time.perf_counter()
+
+    response = await client.post("/sns-post/agent/post", json = {
+        "content_data": image_urls(fake_url, 1)[0],
+        "sns_platform": "instagram",
+        "business_type": "카페",
+        "user_keywords": ["신메뉴", "가을"],
+        "location": "서울"
+    })
+    response.raise_for_status()
+
+    return RequestResult(ok = True, seconds = time.perf_counter() - started)
+
+
+async def run_comments(client: httpx.AsyncClient, fake_url: str, index: int, args: argparse.Namespace) -> RequestResult:
+    started = time.perf_counter()
+
+    response = await client.post("/api/comments/analyze", json = {
+        "comments": [{"id": i, "content": f"댓글 {i} 맛있어요"} for i in range(args.comments)]
+    })
+    response.raise_for_status()
+
+    return RequestResult(ok = True, seconds = time.perf_counter() - started)
+
+
+async def run_report(client: httpx.AsyncClient, fake_url: str, index: int, args: argparse.Namespace) -> RequestResult:
+    started = time.perf_counter()
+
+    response = await client.post("/api/analysis/report", json = {
+        "metrics": {"post_id": index, "view_count": 12000, "like_count": 640, "comment_count": 85},
+        "emotion_data": {
+            "positive_count": 60, "negative_count": 10, "neutral_count": 15,
+            "positive_keywords": ["맛있다"], "negative_keywords": ["비싸다"], "neutral_keywords": ["매장"]
+        },
+        "title": "가을 신메뉴 출시",
+        "description": "따뜻한 가을 디저트를 만나보세요",
+        "url": f"{fake_url}/files/input_0.jpg",
+        "tags": ["카페", "디저트"],
+        "publish_at": "2025-09-01T10:00:00"
+    })
+    response.raise_for_status()
+
+    return RequestResult(ok = True, seconds = time.perf_counter() - started)
+
+
+SCENARIO_RUNNERS: Dict[str, Callable] = {
+    "shorts": run_shorts,
+    "sns_post": run_sns_post,
+    "comments": run_comments,
+    "report": run_report
+}
+
+
+async def run_scenario(name: str, api_url: str, fake_url: str, args: argparse.Namespace) -> Tuple[List[RequestResult], float]:
+    """요청 args.requests개를 동시성 args.concurrency로 실행, (결과, 전체 소요 시간) 반환"""
+    runner = SCENARIO_RUNNERS[name]
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(client: httpx.AsyncClient, index: int) -> RequestResult:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                return await runner(client, fake_url, index, args)
+            except Exception as e:
+                return RequestResult(ok = False, seconds = time.perf_counter() - started, error = str(e)[:200])
+
+    timeout = httpx.Timeout(args.request_timeout)
+    limits = httpx.Limits(max_connections = args.concurrency * 2)
+
+    async with httpx.AsyncClient(base_url = api_url, timeout = timeout, limits = limits) as client:
+        started = time.perf_counter()
+        results = await asyncio.gather(*(one(client, i) for i in range(args.requests)))
+
+    return list(results), time.perf_counter() - started
+
+
+# ================= Report =================
+
+def percentile(values: List[float], q: float) -> float:
+    """선형 보간 분위수"""
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def histogram_totals(metric: str, keys: Tuple[str, ...]) -> Dict[Tuple[str, ...], Tuple[float, float]]:
+    """Prometheus 히스토그램의 레이블 조합별 (누적 시간, 횟수)"""
+    totals: Dict[Tuple[str, ...], List[float]] = {}
+
+    for family in REGISTRY.collect():
+        if family.name != metric:
+            continue
+
+        for sample in family.samples:
+            if sample.name not in (f"{metric}_sum", f"{metric}_count"):
+                continue
+
+            label = tuple(sample.labels.get(key, "") for key in keys)
+            entry = totals.setdefault(label, [0.0, 0.0])
+            entry[0 if sample.name.endswith("_sum") else 1] += sample.value
+
+    return {label: (total, count) for label, (total, count) in totals.items()}
+
+
+def histogram_delta(before: Dict, after: Dict) -> Dict[Tuple[str, ...], Tuple[float, float]]:
+    delta = {}
+
+    for label, (total, count) in after.items():
+        prev_total, prev_count = before.get(label, (0.0, 0.0))
+        if count - prev_count > 0:
+            delta[label] = (total - prev_total, count - prev_count)
+
+    return delta
+
+
+def print_breakdown(title: str, delta: Dict[Tuple[str, ...], Tuple[float, float]]) -> None:
+    if not delta:
+        return
+
+    grand_total = sum(total for total, _ in delta.values()) or 1.0
+
+    print(f"\n{title}")
+    print(f"{'':<48} {'횟수':>6} {'평균(s)':>9} {'합계(s)':>9} {'비중':>7}")
+
+    for label, (total, count) in sorted(delta.items(), key = lambda item: -item[1][0]):
+        print(f"{' / '.join(label):<48} {int(count):>6} {total / count:>9.3f} {total:>9.2f} {total / grand_total:>6.1%}")
+
+
+def print_report(name: str, results: List[RequestResult], wall_seconds: float) -> None:
+    succeeded = [r for r in results if r.ok]
+    latencies = [r.seconds for r in succeeded]
+
+    print(f"\n=== {name}: 요청 {len(results)}개, 성공 {len(succeeded)}개, {wall_seconds:.2f}초 ===")
+    print(f"처리량: {len(succeeded) / wall_seconds:.3f} req/s")
+    print(
+        f"지연 시간: p50 {percentile(latencies, 0.5):.3f}s, p95 {percentile(latencies, 0.95):.3f}s, "
+        f"p99 {percentile(latencies, 0.99):.3f}s, 최대 {max(latencies, default = 0):.3f}s"
+    )
+
+    phase_names = sorted({phase for r in succeeded for phase in r.phases})
+    for phase in phase_names:
+        values = [r.phases[phase] for r in succeeded if phase in r.phases]
+        print(f"  {phase:<10} p50 {percentile(values, 0.5):.3f}s, p95 {percentile(values, 0.95):.3f}s")
+
+    errors = [r.error for r in results if not r.ok]
+    for error in sorted(set(errors))[:5]:
+        print(f"  실패 ({errors.count(error)}): {error}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = "전체 파이프라인 벤치마크 (가짜 외부 API)")
+    parser.add_argument("--scenario", default = "sns_post", choices = [*SCENARIOS, "all"])
+    parser.add_argument("--requests", type = int, default = 10)
+    parser.add_argument("--concurrency", type = int, default = 2)
+    parser.add_argument("--workers", type = int, default = 2, help = "영상 생성 워커 스레드 수 (shorts)")
+    parser.add_argument("--ad-duration", type = int, default = 15, help = "영상 길이(초), 5초당 장면 1개")
+    parser.add_argument("--comments", type = int, default = 50, help = "댓글 분석 요청당 댓글 수")
+    parser.add_argument("--time-scale", type = float, default = 0.05, help = "가짜 API 지연 시간 배율")
+    parser.add_argument("--profile", action = "append", default = [], help = "제공자=중앙값,sigma,실패율 (예: openai=1.5,0.4,0.02)")
+    parser.add_argument("--scene-planning", default = "fused", choices = ["fused", "separate"], help = "장면 생성 + 요약 통합(1회 호출) / 개별(2회 호출)")
+    parser.add_argument("--suno-callback", action = "store_true", help = "Suno 완료를 폴링 대신 콜백으로 수신")
+    parser.add_argument("--with-cache", action = "store_true", help = "결과물/LLM 캐시 사용")
+    parser.add_argument("--request-timeout", type = float, default = 600.0)
+    parser.add_argument("--seed", type = int, default = 0)
+    args = parser.parse_args()
+
+    media_dir = os.path.join(tempfile.gettempdir(), "fake_providers_media")
+    build_media(media_dir)
+
+    fake_port, api_port = free_port(), free_port()
+    fake_url, api_url = f"http://127.0.0.1:{fake_port}", f"http://127.0.0.1:{api_port}"
+
+    profiles = dict(parse_profile(value) for value in args.profile)
+    start_server(create_app(media_dir, profiles, args.time_scale, args.seed), fake_port)
+
+    # 앱/설정은 환경 변수 지정 후 import
+    configure_environment(fake_url, api_url, args)
+    from main import app
+
+    start_server(app, api_port)
+
+    scenarios = SCENARIOS if args.scenario == "all" else (args.scenario,)
+    if "shorts" in scenarios:
+        start_workers(args.workers)
+
+    print(f"가짜 API: {fake_url}, 앱: {api_url}, 지연 배율 {args.time_scale}, 동시성 {args.concurrency}")
+
+    for name in scenarios:
+        nodes_before = histogram_totals("aivle_node_duration_seconds", ("graph", "node"))
+        calls_before = histogram_totals("aivle_external_call_duration_seconds", ("provider", "operation"))
+
+        results, wall_seconds = asyncio.run(run_scenario(name, api_url, fake_url, args))
+
+        print_report(name, results, wall_seconds)
+        print_breakdown("노드별 실행 시간", histogram_delta(nodes_before, histogram_totals("aivle_node_duration_seconds", ("graph", "node"))))
+        print_breakdown("외부 호출별 시간", histogram_delta(calls_before, histogram_totals("aivle_external_call_duration_seconds", ("provider", "operation"))))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,14 +9,115 @@ class Settings(BaseSettings):
     replicate_api_key: Optional[str] = None
     suno_api_key: Optional[str] = None
 
+    # 외부 API 주소 (미지정 시 기본 주소, 벤치마크에서는 benchmarks.fake_providers 주소 지정)
+    openai_base_url: Optional[str] = None
+    anthropic_base_url: Optional[str] = None
+    replicate_base_url: Optional[str] = None
+
     redis_host: str = "localhost"
     redis_port: str = "6379"
     redis_db: str = "0"
+    redis_url: str = "redis://redis-stack:6379"
 
     aws_access_key_id: Optional[str] = None
     aws_secret_access_key: Optional[str] = None
     aws_default_region: Optional[str] = None
 
+    # S3 업로드 (endpoint 지정 시 로컬 S3 호환 서버, 멀티파트 파트 크기/동시 업로드 수)
+    s3_bucket: str = "aivle-temp"
+    s3_endpoint_url: Optional[str] = None
+    s3_max_pool_connections: int = 16
+    s3_multipart_threshold: int = 8 * 1024 ** 2
+    s3_multipart_chunksize: int = 8 * 1024 ** 2
+    s3_max_concurrency: int = 8
+    # 최종 영상 mux 출력을 파일 대신 파이프로 받아 인코딩 중에 업로드 (fragmented MP4)
+    s3_stream_upload: bool = False
+
+    # LangGraph 체크포인트 (큰 채널 값은 압축 blob으로 분리 저장)
+    checkpoint_ttl_minutes: int = 3600
+    checkpoint_blob_min_bytes: int = 2048
+    checkpoint_compression_level: int = 6
+
+    # Shorts 백그라운드 작업 (Redis 큐 + 워커 프로세스)
+    shorts_job_queue: str = "shorts:jobs"
+    shorts_job_ttl_seconds: int = 60 * 60 * 24
+    shorts_worker_concurrency: int = 2
+    shorts_worker_lease_seconds: int = 30
+
+    # 장면 생성 + 스타일 요약을 한 번의 LLM 호출로 처리 (False면 generate_scenes → summarize_scenes 두 단계)
+    shorts_fused_scene_planning: bool = True
+
+    # 입력 이미지 분석과 장면 생성을 병렬 실행 (장면 생성 프롬프트에는 이미지 분석 결과 미포함)
+    shorts_parallel_image_analysis: bool = True
+
+    # 세션별 작업 공간 (scratch_root 지정 시 중간 파일은 tmpfs 등 별도 경로, 오래된 세션은 워커 시작 시 정리)
+    workspace_root: str = "./workspaces"
+    workspace_scratch_root: Optional[str] = None
+    workspace_max_age_seconds: int = 60 * 60 * 24
+
+    # Shorts 노드 동시 처리 수
+    scene_image_concurrency: int = 4
+    seedance_prompt_concurrency: int = 4
+
+    # Replicate 호출 제한 (토큰 버킷) 및 prediction 폴링
+    replicate_submit_rate: float = 0.5
+    replicate_submit_burst: int = 2
+    replicate_poll_interval: float = 3.0
+    seedance_timeout_seconds: int = 900
+
+    # 파일 다운로드 (공용 커넥션 풀, 전체/호스트별 동시 처리 수, 지수 백오프 재시도)
+    download_max_concurrency: int = 8
+    download_max_per_host: int = 4
+    download_retries: int = 5
+    download_backoff_base: float = 1.0
+    download_backoff_max: float = 30.0
+    download_connect_timeout: float = 10.0
+    download_read_timeout: float = 60.0
+
+    # 참고 이미지 캐시 (세션별 디코딩/축소 이미지와 합성 결과, 최근 세션 수만큼 메모리에 유지)
+    image_cache_max_sessions: int = 8
+    image_max_size: int = 1024
+
+    # 장면 이미지 생성 참고 이미지 (합성 결과 가로 최대 크기/JPEG 품질, 결과물 저장소에 올려 URL로 전달)
+    reference_image_max_width: int = 2048
+    reference_image_quality: int = 85
+
+    # 생성 결과물(장면 이미지/영상 세그먼트/음악) 캐시: none | local | s3
+    artifact_backend: str = "local"
+    artifact_local_dir: str = "./artifacts"
+    artifact_max_bytes: int = 10 * 1024 ** 3
+    artifact_public_base_url: Optional[str] = None
+    artifact_s3_bucket: str = "aivle-temp"
+    artifact_s3_prefix: str = "artifacts/"
+    artifact_url_ttl_seconds: int = 60 * 60 * 24
+    artifact_evict_interval_seconds: int = 600
+
+    # Suno 음악 생성 (콜백 URL이 없으면 폴링만 사용)
+    suno_api_base_url: str = "https://api.sunoapi.org"
+    suno_callback_url: Optional[str] = None
+    suno_callback_token: Optional[str] = None
+    suno_poll_min_interval: float = 5.0
+    suno_poll_max_interval: float = 30.0
+    suno_timeout_seconds: float = 1000.0
+
+    # LLM 응답 캐시 (Redis exact-match, 호출 위치별 TTL)
+    llm_cache_enabled: bool = True
+
+    # SNS 트렌드 캐시 (플랫폼/업종/지역/날짜별, 만료 TREND_REFRESH_AHEAD_SECONDS초 전부터 조회 시 백그라운드 갱신)
+    trend_cache_ttl_seconds: int = 60 * 60 * 6
+    trend_refresh_ahead_seconds: int = 60 * 30
+    trend_refresh_retry_seconds: int = 60 * 5
+    trend_cache_max_entries: int = 256
+
+    # 음악 선행 생성 후 실제 영상 분석과의 BPM/시각 에너지(0~100)/평균 밝기(0~1) 차이가 이 값을 넘으면 재생성
+    # (예상 분석의 시각 에너지는 중립값 50 고정 → 실제 영상이 매우 정적/역동적인 경우만 재생성)
+    music_reconcile_tempo_threshold: int = 15
+    music_reconcile_energy_threshold: float = 40.0
+    music_reconcile_brightness_threshold: float = 0.2
+
+    # 영상 + 음악 머지 시 영상 스트림 복사 (False면 moviepy 재인코딩)
+    merge_mux_only: bool = True
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -1,11 +1,12 @@
 # core/agent_graph.py
-from typing import Literal
+from dataclasses import dataclass
+from typing import Optional
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.redis import RedisSaver
 from nodes.shorts.input_image_analyzer import analyse_input_images
 from nodes.shorts.scenes_summarizer import summarize_scenes
-import redis
 from nodes.shorts.scene_generator import generate_scenes
+from nodes.shorts.scene_planner import generate_scenes_with_summary
 from nodes.shorts.scene_image_generator import generate_scene_images
 from nodes.shorts.human_select import user_select_scenario
 from states.shorts_state import ShortsState
@@ -14,44 +15,114 @@ from nodes.shorts.scenarios_generator import generate_scenarios
 from nodes.shorts.seedance_prompt_generator import seedance_prompt_generation
 from nodes.shorts.video_series_generator import generate_video_series
 from nodes.shorts.video_analyzer import analyze_final_video
-from nodes.shorts.suno_music_prompt_generator import generate_suno_music_prompt
 from nodes.shorts.music_generator import generate_music
 from nodes.shorts.merge_video_audio import merge_video_with_audio
+from nodes.shorts.provisional_analyzer import generate_provisional_music_prompt
+from nodes.shorts.music_reconciler import reconcile_music
+from utils.graph_utils import changed_fields
+from utils.metrics import timed_node
+from utils.redis_utils import get_redis_client
+from utils.checkpoint_serde import CompressedBlobSerializer
+from config.settings import settings
 
-# 그래프 정의 시작
-builder = StateGraph(ShortsState)
-
-# 노드 등록
-builder.add_node("analyse_input_images", analyse_input_images)
-builder.add_node("create_scenarios", generate_scenarios)
-builder.add_node("user_select_scenario", user_select_scenario)
-builder.add_node("generate_scenes", generate_scenes)
-builder.add_node("generate_scene_images", generate_scene_images)
-builder.add_node("summarize_scenes", summarize_scenes)
-
-builder.add_node("seedance_prompt_generation", seedance_prompt_generation)
-builder.add_node("generate_video_series", generate_video_series)
-builder.add_node("analyze_final_video", analyze_final_video)
-builder.add_node("generate_suno_music_prompt", generate_suno_music_prompt)
-builder.add_node("generate_music", generate_music)
-builder.add_node("merge_video_with_audio", merge_video_with_audio)
-
-# 노드 연결
-builder.set_entry_point("create_scenarios")
-builder.add_edge("create_scenarios", "user_select_scenario")
-builder.add_edge("user_select_scenario", "analyse_input_images")
-builder.add_edge("analyse_input_images", "generate_scenes")
-builder.add_edge("generate_scenes", "summarize_scenes")
-builder.add_edge("summarize_scenes", "generate_scene_images")
-builder.add_edge("generate_scene_images", "seedance_prompt_generation")
-builder.add_edge("seedance_prompt_generation", "generate_video_series")
-builder.add_edge("generate_video_series", "analyze_final_video")
-builder.add_edge("analyze_final_video", "generate_suno_music_prompt")
-builder.add_edge("generate_suno_music_prompt", "generate_music")
-builder.add_edge("generate_music", "merge_video_with_audio")
-builder.add_edge("merge_video_with_audio", END)
-
-
-redis_client = redis.Redis.from_url("redis://redis-stack:6379")
-checkpointer = RedisSaver(redis_client=redis_client, ttl={"default_ttl": 3600})
-graph = builder.compile(checkpointer=checkpointer)
+
+@dataclass(frozen=True)
+class ShortsGraphOptions:
+    """그래프 구성 옵션 (벤치마크 등에서 구성별 비교용)"""
+    # 장면 생성 + 스타일 요약을 한 노드(LLM 1회)로 처리
+    fused_scene_planning: bool = True
+    # 입력 이미지 분석과 장면 생성을 병렬 실행 (장면 이미지 생성 전에 합류)
+    parallel_image_analysis: bool = True
+
+    @classmethod
+    def from_settings(cls) -> "ShortsGraphOptions":
+        return cls(
+            fused_scene_planning=settings.shorts_fused_scene_planning,
+            parallel_image_analysis=settings.shorts_parallel_image_analysis
+        )
+
+
+def create_checkpointer() -> RedisSaver:
+    redis_client = get_redis_client()
+    checkpointer = RedisSaver(redis_client=redis_client, ttl={"default_ttl": settings.checkpoint_ttl_minutes})
+
+    # 큰 값(seedance_results, video_analysis 등)은 압축 blob으로 한 번만 저장하고 체크포인트에는 참조만 기록
+    checkpointer.serde = CompressedBlobSerializer(
+        redis_client,
+        min_blob_bytes=settings.checkpoint_blob_min_bytes,
+        blob_ttl_seconds=settings.checkpoint_ttl_minutes * 60 * 2,
+        compression_level=settings.checkpoint_compression_level
+    )
+    return checkpointer
+
+
+def build_shorts_graph(options: Optional[ShortsGraphOptions] = None, checkpointer: Optional[RedisSaver] = None):
+    """숏폼 영상 생성 그래프 (options 미지정 시 설정값 사용)"""
+    options = options or ShortsGraphOptions.from_settings()
+    builder = StateGraph(ShortsState)
+
+    def add_node(name, node):
+        """노드 등록 (실행 시간 계측, 변경된 필드만 반환)"""
+        builder.add_node(name, timed_node("shorts", name)(changed_fields(node)))
+
+    # 노드 등록 (변경된 필드만 반환 → 바뀐 채널만 기록, 병렬 브랜치 충돌 방지)
+    add_node("analyse_input_images", analyse_input_images)
+    add_node("create_scenarios", generate_scenarios)
+    add_node("user_select_scenario", user_select_scenario)
+    add_node("generate_scene_images", generate_scene_images)
+
+    if options.fused_scene_planning:
+        add_node("generate_scenes_with_summary", generate_scenes_with_summary)
+    else:
+        add_node("generate_scenes", generate_scenes)
+        add_node("summarize_scenes", summarize_scenes)
+
+    # 영상 브랜치 / 음악 브랜치는 병렬 실행
+    add_node("seedance_prompt_generation", seedance_prompt_generation)
+    add_node("generate_video_series", generate_video_series)
+    add_node("analyze_final_video", analyze_final_video)
+    add_node("generate_provisional_music_prompt", generate_provisional_music_prompt)
+    add_node("generate_music", generate_music)
+    add_node("reconcile_music", reconcile_music)
+    add_node("merge_video_with_audio", merge_video_with_audio)
+
+    # 노드 연결
+    builder.set_entry_point("create_scenarios")
+    builder.add_edge("create_scenarios", "user_select_scenario")
+
+    # 장면 생성 단계 (통합 노드 1개 또는 장면 생성 → 요약)
+    if options.fused_scene_planning:
+        scene_entry = scene_exit = "generate_scenes_with_summary"
+    else:
+        scene_entry, scene_exit = "generate_scenes", "summarize_scenes"
+        builder.add_edge("generate_scenes", "summarize_scenes")
+
+    if options.parallel_image_analysis:
+        # 이미지 분석(image_list, brand_concept)과 장면 생성(scenes, scene_summary)은 서로 다른 필드만 기록
+        # → 같은 superstep에서 병렬 실행 후 둘 다 끝나면 장면 이미지 생성
+        builder.add_edge("user_select_scenario", "analyse_input_images")
+        builder.add_edge("user_select_scenario", scene_entry)
+        builder.add_edge(["analyse_input_images", scene_exit], "generate_scene_images")
+    else:
+        builder.add_edge("user_select_scenario", "analyse_input_images")
+        builder.add_edge("analyse_input_images", scene_entry)
+        builder.add_edge(scene_exit, "generate_scene_images")
+
+    # 영상 브랜치: 프롬프트 → 영상 생성 → 분석
+    builder.add_edge("generate_scene_images", "seedance_prompt_generation")
+    builder.add_edge("seedance_prompt_generation", "generate_video_series")
+    builder.add_edge("generate_video_series", "analyze_final_video")
+
+    # 음악 브랜치: 예상 분석 기반 프롬프트 → 음악 생성 (영상 생성과 같은 단계에서 실행)
+    builder.add_edge("generate_scene_images", "generate_provisional_music_prompt")
+    builder.add_edge("generate_provisional_music_prompt", "generate_music")
+
+    # 두 브랜치 합류 후 음악 검증 (필요 시 재생성) → 머지
+    builder.add_edge(["analyze_final_video", "generate_music"], "reconcile_music")
+    builder.add_edge("reconcile_music", "merge_video_with_audio")
+    builder.add_edge("merge_video_with_audio", END)
+
+    return builder.compile(checkpointer=checkpointer or create_checkpointer())
+
+
+graph = build_shorts_graph()
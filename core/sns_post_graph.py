@@ -1,34 +1,75 @@
 # core/sns_post_graph.py
+import threading
 from langgraph.graph import StateGraph, START, END
-from states.sns_post_state import SNSPostState
+from states.sns_post_state import SNSPostState, PostData
 from nodes.sns_post.content_analyzer import content_analyzer
 from nodes.sns_post.trend_analyzer import trend_analyzer
 from nodes.sns_post.post_generator import post_generator
 from nodes.sns_post.hashtag_generator import hashtag_generator
-from typing import List, Optional, Any
+from typing import Any, Dict, List, Optional, Sequence
+from utils.metrics import timed_node
 
-def sns_post_workflow() -> Any:
-    
-    # StateGraph 생성
+SNS_POST_NODES = {
+    "content_analyzer": content_analyzer,
+    "trend_analyzer": trend_analyzer,
+    "post_generator": post_generator,
+    "hashtag_generator": hashtag_generator
+}
+
+# 그래프 종류별 노드 순서 (순차 실행)
+SNS_POST_VARIANTS = {
+    # 게시글 + 해시태그 전체 생성
+    "post": ["content_analyzer", "trend_analyzer", "post_generator", "hashtag_generator"],
+    # 기존 게시글(generated_post)의 해시태그만 생성
+    "hashtags": ["trend_analyzer", "hashtag_generator"],
+    # 트렌드 분석만
+    "trend": ["trend_analyzer"]
+}
+
+# 컴파일된 그래프는 체크포인터 없이 상태를 갖지 않으므로 프로세스 내 모든 요청이 공유 (동시 invoke 가능)
+_compiled_graphs: Dict[str, Any] = {}
+_compiled_graphs_lock = threading.Lock()
+
+
+def build_sns_post_graph(node_names: Sequence[str]) -> Any:
+    """노드를 순서대로 연결한 그래프 컴파일"""
     workflow = StateGraph(SNSPostState)
-    
-    # 노드 추가
-    workflow.add_node("content_analyzer", content_analyzer)
-    workflow.add_node("trend_analyzer", trend_analyzer)
-    workflow.add_node("post_generator", post_generator)
-    workflow.add_node("hashtag_generator", hashtag_generator)
-    
+
+    for name in node_names:
+        workflow.add_node(name, timed_node("sns_post", name)(SNS_POST_NODES[name]))
+
     # 엣지 연결 (순차 실행)
-    workflow.add_edge(START, "content_analyzer")
-    workflow.add_edge("content_analyzer", "trend_analyzer")
-    workflow.add_edge("trend_analyzer", "post_generator")
-    workflow.add_edge("post_generator", "hashtag_generator")
-    workflow.add_edge("hashtag_generator", END)
-    
-    # 워크플로우 컴파일
-    app = workflow.compile()
-    
-    return app
+    for source, target in zip([START, *node_names], [*node_names, END]):
+        workflow.add_edge(source, target)
+
+    return workflow.compile()
+
+
+def get_sns_post_graph(variant: str = "post") -> Any:
+    """공용 컴파일 그래프 (종류별 1개, 처음 요청 시 컴파일)"""
+    graph = _compiled_graphs.get(variant)
+    if graph is not None:
+        return graph
+
+    with _compiled_graphs_lock:
+        graph = _compiled_graphs.get(variant)
+        if graph is None:
+            graph = build_sns_post_graph(SNS_POST_VARIANTS[variant])
+            _compiled_graphs[variant] = graph
+
+    return graph
+
+
+def warm_sns_post_graphs() -> None:
+    """모든 종류의 그래프를 미리 컴파일 (서버 시작 시)"""
+    for variant in SNS_POST_VARIANTS:
+        get_sns_post_graph(variant)
+
+    print(f"[WORKFLOW] SNS 게시글 그래프 컴파일 완료: {', '.join(SNS_POST_VARIANTS)}")
+
+
+def sns_post_workflow() -> Any:
+    return get_sns_post_graph("post")
 
 
 def run_sns_post_generation(
@@ -38,10 +79,10 @@ def run_sns_post_generation(
     business_type: str,
     location: Optional[str] = None
 ) -> SNSPostState:
-    
-    # 워크플로우 생성
-    app = sns_post_workflow()
-    
+
+    # 워크플로우 (공용 컴파일 그래프)
+    app = get_sns_post_graph("post")
+
     # 초기 상태 생성
     initial_state = SNSPostState(
         content_data=content_data,
@@ -50,25 +91,47 @@ def run_sns_post_generation(
         user_keywords=user_keywords,
         location=location
     )
-    
+
     # 워크플로우 실행
     try:
         print("[WORKFLOW] SNS 게시글 생성 워크플로우 시작")
-        
+
         # 워크플로우 실행
         final_state_dict = app.invoke(initial_state)
-        
+
         # AddableValuesDict를 SNSPostState로 변환
         final_state = SNSPostState(**final_state_dict)
-        
+
         print("[WORKFLOW] 워크플로우 완료!")
         if final_state.generated_post:
             print(f"   - 제목: {final_state.generated_post.title}")
             print(f"   - 본문: {final_state.generated_post.content}")
             print(f"   - 해시태그: {final_state.hashtags}")
-        
+
         return final_state
-        
+
     except Exception as e:
         print(f"[WORKFLOW] 워크플로우 실행 오류: {e}")
-        return initial_state
\ No newline at end of file
+        return initial_state
+
+
+def run_hashtag_generation(
+    post_title: str,
+    post_content: str,
+    user_keywords: List[str],
+    sns_platform: str,
+    business_type: str,
+    location: Optional[str] = None
+) -> SNSPostState:
+    """기존 게시글의 해시태그만 생성 (트렌드 분석 → 해시태그 생성)"""
+    initial_state = SNSPostState(
+        content_data="",  # 해시태그 생성에는 불필요
+        sns_platform=sns_platform,
+        business_type=business_type,
+        user_keywords=user_keywords,
+        location=location,
+        generated_post=PostData(title=post_title, content=post_content)
+    )
+
+    final_state_dict = get_sns_post_graph("hashtags").invoke(initial_state)
+    return SNSPostState(**final_state_dict)
@@ -1,17 +1,39 @@
 # main.py
-from fastapi import FastAPI
+import os
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+from fastapi import FastAPI, Response
+from fastapi.staticfiles import StaticFiles
+from config.settings import settings
 from routers.shorts_router import router as shorts_router
 from routers.sns_post_router import router as sns_post_router
 from routers.comments_analysis_router import router as comments_analysis_router
 from routers.report_generation_router import router as report_generation_router
+from routers.suno_callback_router import router as suno_callback_router
+from core.sns_post_graph import warm_sns_post_graphs
+from utils.metrics import render_metrics
 
 
-app = FastAPI(title = "Backend AI")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 요청마다 다시 컴파일하지 않도록 SNS 게시글 그래프를 시작 시 한 번 컴파일
+    warm_sns_post_graphs()
+    yield
+
+
+app = FastAPI(title = "Backend AI", lifespan = lifespan)
 
 app.include_router(shorts_router)
 app.include_router(sns_post_router)
 app.include_router(comments_analysis_router)
 app.include_router(report_generation_router)
+app.include_router(suno_callback_router)
+
+# 로컬 아티팩트 캐시를 외부 공개 URL로 제공 (캐시된 장면 이미지를 Replicate 입력 URL로 재사용)
+if settings.artifact_backend == "local" and settings.artifact_public_base_url:
+    os.makedirs(settings.artifact_local_dir, exist_ok = True)
+    artifact_path = urlparse(settings.artifact_public_base_url).path.rstrip("/") or "/artifacts"
+    app.mount(artifact_path, StaticFiles(directory = settings.artifact_local_dir), name = "artifacts")
 
 
 @app.get("/")
@@ -19,6 +41,13 @@ async def root():
     return {"message": "Chaos Backend AI API"}
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus 메트릭 (노드/외부 호출 시간, 토큰, 전송량, 인코딩 시간)"""
+    body, content_type = render_metrics()
+    return Response(content = body, media_type = content_type)
+
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "services": ["agent", "sns_post", "comments_analysis", "report_generation"]}
@@ -1,17 +1,20 @@
-from config.settings import settings
 import os
 import re
-import anthropic
 from typing import Dict, Optional, Any
 import json
 from schemas.report_analysis_schema import PostAnalysisRequest
+from utils.llm_gateway import claude_message
+
+# 같은 게시글/지표 재요청 시 분석 재사용
+REPORT_CACHE_TTL = 60 * 60 * 24
+
+# 업종 분류는 제목/설명만으로 결정되므로 길게 유지
+CLASSIFICATION_CACHE_TTL = 60 * 60 * 24 * 30
 
 class AnalysisReport:
     def generate_analysis_report(self, analysis_data: PostAnalysisRequest) -> Dict[str, Any]:
         """게시글 성과 분석 리포트"""
 
-        client = anthropic.Anthropic(api_key = settings.claude_api_key)
-
         classified_industry = self.industry_classification(analysis_data.title, analysis_data.description)
         print(f"업종 분류: {classified_industry}\n")
 
@@ -188,7 +191,7 @@ class AnalysisReport:
         
 
         try:
-            response = client.messages.create(
+            response_text = claude_message(
                 model = "claude-sonnet-4-20250514",
                 max_tokens = 4500,
                 temperature = 0.3,
@@ -198,10 +201,11 @@ class AnalysisReport:
                         "role": "user",
                         "content": prompt
                     }
-                ]
+                ],
+                cache_ttl = REPORT_CACHE_TTL
             )
             
-            result = self.parse_response(response.content[0].text.strip())
+            result = self.parse_response(response_text)
             
 
             report_data = {
@@ -222,8 +226,6 @@ class AnalysisReport:
 
 
     def industry_classification(self, title: str, description: str) -> str:
-        client = anthropic.Anthropic(api_key = settings.claude_api_key)
-
         system_prompt = """
         You are an expert industry classifier specializing in Korean content analysis.
         Your task is to accurately classify content into one of five specific industry categories.
@@ -254,7 +256,7 @@ class AnalysisReport:
         """
 
         try:
-            response = client.messages.create(
+            result = claude_message(
                 model = "claude-sonnet-4-20250514",
                 max_tokens = 300,
                 temperature = 0.1,
@@ -264,10 +266,9 @@ class AnalysisReport:
                         "role": "user",
                         "content": prompt
                     }
-                ]
+                ],
+                cache_ttl = CLASSIFICATION_CACHE_TTL
             )
-            
-            result = response.content[0].text.strip()
 
             return result
         
@@ -1,21 +1,23 @@
 from config.settings import settings
 import replicate
 from typing import List, Dict, Any
+from utils.metrics import track_call
 
 # 출처: https://huggingface.co/Copycats/koelectra-base-v3-generalized-sentiment-analysis
 # 출처: https://huggingface.co/jhgan/ko-sroberta-multitask
 
 # Replicate 모델 주소: https://replicate.com/choiminji-020102/ko-comments-emotion-analyzer
 def analyze_emotions_batch(texts: List[str], ids: List[int] = None) -> Dict[str, Any]:
-    replicate_client = replicate.Client(api_token = settings.replicate_api_key)
+    replicate_client = replicate.Client(api_token = settings.replicate_api_key, base_url = settings.replicate_base_url)
 
-    output = replicate_client.run(
-        "choiminji-020102/ko-comments-emotion-analyzer:55f49ebbdc50dd9565906847fb96d0621a19e1122536df254d995d61437b0d1f",
-        
-        input = {
-            "texts": texts,
-            "ids": ids
-        }
-    )
+    with track_call("replicate", "ko-comments-emotion-analyzer"):
+        output = replicate_client.run(
+            "choiminji-020102/ko-comments-emotion-analyzer:55f49ebbdc50dd9565906847fb96d0621a19e1122536df254d995d61437b0d1f",
+            
+            input = {
+                "texts": texts,
+                "ids": ids
+            }
+        )
 
     return output
\ No newline at end of file
@@ -1,13 +1,14 @@
-from config.settings import settings
-import anthropic
 import json
+from utils.llm_gateway import claude_message
 from schemas.report_analysis_schema import PostAnalysisRequest
 
+# 같은 분석 결과의 보고서 재사용
+REPORT_CACHE_TTL = 60 * 60 * 24
+
+
 def generate_korean_markdown_report(report_data: dict, classified_industry: str, analysis_data: PostAnalysisRequest) -> str:
     """한국어 markdown 보고서 변환""" 
 
-    client = anthropic.Anthropic(api_key = settings.claude_api_key)
-    
     system_prompt = """
     당신은 디지털 마케팅 보고서 작성 전문가입니다. 
     20년 이상의 경력을 보유한 SNS 마케팅 컨설턴트로서, 복잡한 데이터 분석 결과를 
@@ -130,7 +131,7 @@ def generate_korean_markdown_report(report_data: dict, classified_industry: str,
     """
     
     try:
-        response = client.messages.create(
+        markdown_report = claude_message(
             model = "claude-sonnet-4-20250514",
             max_tokens = 6500,
             temperature = 0.2,
@@ -140,10 +141,9 @@ def generate_korean_markdown_report(report_data: dict, classified_industry: str,
                     "role": "user",
                     "content": prompt
                 }
-            ]
+            ],
+            cache_ttl = REPORT_CACHE_TTL
         )
-        
-        markdown_report = response.content[0].text.strip()
 
         if markdown_report.startswith("```markdown"):
             markdown_report = markdown_report.replace("```markdown", "").replace("```", "").strip()
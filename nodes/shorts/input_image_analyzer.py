@@ -1,10 +1,10 @@
 
 import json
-from config.settings import settings
-from openai import OpenAI
 from states.shorts_state import ShortsState
+from utils.llm_gateway import openai_chat
 
-client = OpenAI(api_key=settings.openai_api_key)
+# 같은 이미지 묶음 분석 결과 재사용
+LLM_CACHE_TTL = 60 * 60 * 24 * 7
 
 def analyse_input_images(state: ShortsState) -> ShortsState:
     
@@ -55,15 +55,14 @@ JSON 형태로만 응답해주세요. 코드블럭은 제외하세요.
             })
         
         # GPT-4o API 호출
-        response = client.chat.completions.create(
+        response_text = openai_chat(
             model="gpt-4o-mini",
             messages=messages,
             max_tokens=2000,
-            temperature=0.2
+            temperature=0.2,
+            cache_ttl=LLM_CACHE_TTL
         )
         
-        # 응답에서 JSON 추출
-        response_text = response.choices[0].message.content.strip()
         print("API 응답:")
         print(response_text)
         
@@ -5,8 +5,12 @@ from datetime import datetime
 import uuid
 from urllib.parse import quote
 from moviepy.editor import VideoFileClip, AudioFileClip, concatenate_audioclips
-import boto3
 from botocore.exceptions import ClientError, NoCredentialsError
+from utils.ffmpeg_utils import probe_video, probe_media_duration
+from utils.video_compositor import mux_video_with_audio, mux_video_with_audio_args
+from utils.s3_uploader import stream_ffmpeg_to_s3, upload_file
+from utils.workspace import get_workspace
+from utils.metrics import track_encode
 
 def merge_video_with_audio(state: ShortsState) -> ShortsState:
     """영상 + 오디오 + 마지막 Fadeout (2.5초) """
@@ -18,119 +22,191 @@ def merge_video_with_audio(state: ShortsState) -> ShortsState:
     # 음악 fadeout 설정
     music_fadeout_seconds = 2.5
     
-    os.makedirs(state.final_video_audio_dir, exist_ok = True)
+    # 작업 공간은 실행 중인 워커 설정 기준으로 session_id에서 계산
+    workspace = get_workspace(state.session_id)
 
     try:
-        # 비디오 & 오디오 로드
-        video = VideoFileClip(state.final_video_path)
-        audio = AudioFileClip(state.music_files[1])
+        output_path = workspace.output_path(state.final_video_audio_filename)
+        temp_audiofile = workspace.scratch_path("temp-audio.m4a")
 
-        video_duration = video.duration
-        audio_duration = audio.duration
+        s3_key = None
 
-        print(f"영상 길이: {video_duration:.2f}초")
-        print(f"오디오 길이: {audio_duration:.2f}초")
+        # 영상 스트림 복사 + 오디오 렌더링 결과를 인코딩 중에 바로 업로드 (실패 시 파일 출력 후 업로드)
+        if settings.merge_mux_only and settings.s3_stream_upload:
+            try:
+                s3_key = stream_mux_video_audio_s3(state.final_video_path, state.music_files[1], output_path, music_fadeout_seconds)
 
-        
-        # 오디오를 영상 길이에 맞춤
-        if audio_duration > video_duration:
-            audio = audio.subclip(0, video_duration)
+            except Exception as e:
+                print(f"스트리밍 업로드 실패, 파일 출력 후 업로드로 대체: {e}")
+
+        if s3_key is None:
+            # 영상 스트림 복사 + 오디오만 렌더링 (실패 시 moviepy 재인코딩)
+            if settings.merge_mux_only:
+                try:
+                    mux_video_audio(state.final_video_path, state.music_files[1], output_path, music_fadeout_seconds)
+
+                except Exception as e:
+                    print(f"스트림 복사 머지 실패, 재인코딩으로 대체: {e}")
+                    reencode_video_audio(state.final_video_path, state.music_files[1], output_path, music_fadeout_seconds, temp_audiofile)
+
+            else:
+                reencode_video_audio(state.final_video_path, state.music_files[1], output_path, music_fadeout_seconds, temp_audiofile)
 
+            print("영상 + 오디오 머지 완료\n")
+            print(f"최종 영상 생성 완료: {output_path}")
+
+            s3_key = upload_video_s3(output_path)
+
+        state.final_video_audio_path = output_path
+        state.final_video_audio_filename = os.path.basename(output_path)
+
+        state.key = s3_key
         
-        # 페이드아웃 시작 시점 지정
-        fadeout_start_time = max(0, video_duration - music_fadeout_seconds)
 
-        print(f"페이드아웃 시작: {fadeout_start_time:.2f}초")
-        print(f"페이드아웃 종료: {video_duration:.2f}초")
+        return state
 
-        output_path = os.path.join(state.final_video_audio_dir, state.final_video_audio_filename)
+    except Exception as e:
+        raise Exception(f"최종 영상(오디오 포함) 생성 실패: {e}")
 
-        # 오디오를 두 부분으로 나누기
-        if fadeout_start_time > 0:
-            # 페이드아웃 전 부분
-            audio_before_fade = audio.subclip(0, fadeout_start_time)
 
-            # 페이드아웃 부분
-            audio_fade_part = audio.subclip(fadeout_start_time, video_duration)
-            audio_fade_part = audio_fade_part.audio_fadeout(music_fadeout_seconds)
+def mux_video_audio(video_path: str, audio_path: str, output_path: str, music_fadeout_seconds: float) -> str:
+    """영상 재인코딩 없이 오디오 트림 + 페이드아웃 후 mux (faststart MP4)"""
 
-            # 두 부분 합치기
-            final_audio = concatenate_audioclips([audio_before_fade, audio_fade_part])
+    # 디코딩 없이 길이만 조회
+    video_duration = probe_video(video_path)["duration"]
+    audio_duration = probe_media_duration(audio_path)
 
-        else:
-            # 전체 오디오에 페이드아웃 적용
-            final_audio = audio.audio_fadeout(music_fadeout_seconds)
+    print(f"영상 길이: {video_duration:.2f}초")
+    print(f"오디오 길이: {audio_duration:.2f}초")
 
-        
-        # 영상에 오디오 적용
-        final_video = video.set_audio(final_audio)
+    fadeout_start_time = max(0, video_duration - music_fadeout_seconds)
+
+    print(f"페이드아웃 시작: {fadeout_start_time:.2f}초")
+    print(f"페이드아웃 종료: {video_duration:.2f}초")
+
+    print("영상 + 오디오 머지 중 (영상 스트림 복사)...")
+
+    return mux_video_with_audio(
+        video_path = video_path,
+        audio_path = audio_path,
+        output_path = output_path,
+        duration = video_duration,
+        fadeout_duration = music_fadeout_seconds
+    )
+
+
+def stream_mux_video_audio_s3(video_path: str, audio_path: str, output_path: str, music_fadeout_seconds: float) -> str:
+    """mux 출력(fragmented MP4)을 인코딩과 동시에 S3 멀티파트 업로드, 로컬에도 같은 내용 기록 후 key 반환"""
+
+    video_duration = probe_video(video_path)["duration"]
+
+    key = video_object_key(output_path)
+    print(f"영상 + 오디오 머지 + S3 스트리밍 업로드: s3://{settings.s3_bucket}/{key}")
+
+    stream_ffmpeg_to_s3(
+        mux_video_with_audio_args(
+            video_path = video_path,
+            audio_path = audio_path,
+            duration = video_duration,
+            fadeout_duration = music_fadeout_seconds
+        ),
+        key = key,
+        local_copy_path = output_path
+    )
+
+    print(f"최종 영상 생성 완료: {output_path}")
+
+    return key
+
+
+def reencode_video_audio(video_path: str,
+                         audio_path: str,
+                         output_path: str,
+                         music_fadeout_seconds: float,
+                         temp_audiofile: str = 'temp-audio.m4a') -> str:
+    """moviepy로 영상 + 오디오 재인코딩 (기존 방식)"""
+
+    # 비디오 & 오디오 로드
+    video = VideoFileClip(video_path)
+    audio = AudioFileClip(audio_path)
+
+    video_duration = video.duration
+    audio_duration = audio.duration
+
+    print(f"영상 길이: {video_duration:.2f}초")
+    print(f"오디오 길이: {audio_duration:.2f}초")
 
-        # 출력
-        print("영상 + 오디오 머지 중...")
+    
+    # 오디오를 영상 길이에 맞춤
+    if audio_duration > video_duration:
+        audio = audio.subclip(0, video_duration)
+
+    
+    # 페이드아웃 시작 시점 지정
+    fadeout_start_time = max(0, video_duration - music_fadeout_seconds)
+
+    print(f"페이드아웃 시작: {fadeout_start_time:.2f}초")
+    print(f"페이드아웃 종료: {video_duration:.2f}초")
+
+    # 오디오를 두 부분으로 나누기
+    if fadeout_start_time > 0:
+        # 페이드아웃 전 부분
+        audio_before_fade = audio.subclip(0, fadeout_start_time)
+
+        # 페이드아웃 부분
+        audio_fade_part = audio.subclip(fadeout_start_time, video_duration)
+        audio_fade_part = audio_fade_part.audio_fadeout(music_fadeout_seconds)
+
+        # 두 부분 합치기
+        final_audio = concatenate_audioclips([audio_before_fade, audio_fade_part])
+
+    else:
+        # 전체 오디오에 페이드아웃 적용
+        final_audio = audio.audio_fadeout(music_fadeout_seconds)
+
+    
+    # 영상에 오디오 적용
+    final_video = video.set_audio(final_audio)
+
+    # 출력
+    print("영상 + 오디오 머지 중...")
+    with track_encode("reencode"):
         final_video.write_videofile(
             output_path,
             codec = 'libx264',
             audio_codec = 'aac',
             fps = 24,
             bitrate = '12000k',
-            temp_audiofile = 'temp-audio.m4a',
+            temp_audiofile = temp_audiofile,
             remove_temp = True
         )
 
-        # 메모리 정리
-        video.close()
-        audio.close()
-
-        final_audio.close()
-        final_video.close()
-
-        print("영상 + 오디오 머지 완료\n")
-        print(f"최종 영상 생성 완료: {output_path}")
-        
-        s3_key = upload_video_s3(output_path)
+    # 메모리 정리
+    video.close()
+    audio.close()
 
-        state.final_video_audio_path = output_path
-        state.final_video_audio_filename = os.path.basename(output_path)
+    final_audio.close()
+    final_video.close()
 
-        state.key = s3_key
-        
+    return output_path
 
-        return state
 
-    except Exception as e:
-        raise Exception(f"최종 영상(오디오 포함) 생성 실패: {e}")
+def video_object_key(video_path: str) -> str:
+    """S3 key 생성 (uuid-비디오 파일명)"""
+    return f"{uuid.uuid4()}-{quote(os.path.basename(video_path))}"
 
 
 def upload_video_s3(video_path: str) -> str:
     """ 영상 파일을 S3에 업로드하고 key를 반환 """
     
     try:
-        # S3 boto 설정 (최종 비디오 파일 저장)
-        s3_client = boto3.client(
-            's3',
-            aws_access_key_id = settings.aws_access_key_id,
-            aws_secret_access_key = settings.aws_secret_access_key,
-            region_name = settings.aws_default_region
-        )
+        key = video_object_key(video_path)
         
-        bucket_name = 'aivle-temp'
+        print(f"S3 업로드: s3://{settings.s3_bucket}/{key}")
 
-        original_filename = os.path.basename(video_path)
-        
-        # key 생성 (uuid-비디오 파일명)
-        key = f"{uuid.uuid4()}-{quote(original_filename)}"
-        
-        print(f"S3 업로드: s3://{bucket_name}/{key}")
-        
+        # 공용 클라이언트 + 멀티파트 동시 업로드
+        upload_file(video_path, key)
 
-        s3_client.upload_file(
-            Filename = video_path,
-            Bucket = bucket_name,
-            Key = key
-        )
-
-        print(f"S3 업로드 완료: {key}")
-        
         return key
     
     
@@ -1,20 +1,31 @@
 from config.settings import settings
 from states.shorts_state import ShortsState
 import os
-import requests
-import time
+import shutil
 from typing import List, Dict, Optional, Tuple, Any
+from utils.download_utils import download_files, get_http_session
+from utils.ffmpeg_utils import probe_media_duration
+from utils.artifact_store import artifact_key, get_artifact_store
+from utils.suno_tracker import SunoTaskError, get_suno_tracker
+from utils.metrics import track_call
+from utils.workspace import get_workspace
+
+SUNO_MODEL = "V4_5PLUS"
+
+# Suno는 요청 1회에 곡 2개 생성
+SUNO_TRACKS_PER_TASK = 2
 
 
 def generate_music(state: ShortsState) -> ShortsState:
-    suno_url = "https://api.sunoapi.org/api/v1/generate"
+    suno_url = f"{settings.suno_api_base_url}/api/v1/generate"
     suno_api_key = settings.suno_api_key
 
     if not state.music_prompt:
         print("Suno 음악 생성 프롬프트 없음\n")
         return state
     
-    os.makedirs(state.music_output_dir, exist_ok = True)
+    # 작업 공간은 실행 중인 워커 설정 기준으로 session_id에서 계산
+    music_output_dir = get_workspace(state.session_id).scratch_dir("audio")
 
     try:
         payload = {
@@ -23,11 +34,30 @@ def generate_music(state: ShortsState) -> ShortsState:
             "title": state.music_prompt['title'],
             "customMode": True,
             "instrumental": True,
-            "model": "V4_5PLUS",
+            "model": SUNO_MODEL,
             "negativeTags": ', '.join(state.music_prompt['negativeTags']),
-            "callBackUrl": "https://api.example.com/callback"
+            # 필수 파라미터 (콜백 미설정 시 받을 곳이 없는 주소 → 폴링으로 대기)
+            "callBackUrl": settings.suno_callback_url or "https://api.example.com/callback"
         }
 
+        # 같은 프롬프트로 생성한 곡이 캐시에 모두 있으면 Suno 호출 생략
+        store = get_artifact_store()
+        cache_keys = music_cache_keys(payload) if store else []
+        cached_tracks = [store.get(key) for key in cache_keys] if store else []
+
+        if cached_tracks and all(cached_tracks):
+            print("Suno 음악 캐시 사용")
+            print("=" * 60)
+
+            for i, track in enumerate(cached_tracks, 1):
+                filepath = os.path.join(music_output_dir, f"audio_{i}.mp3")
+                shutil.copyfile(track.path, filepath)
+
+                state.music_urls.append(track.url or track.path)
+                state.music_files.append(filepath)
+
+            return state
+
         headers = {
             "Authorization": f"Bearer {suno_api_key}",
             "Content-Type": "application/json"
@@ -36,7 +66,8 @@ def generate_music(state: ShortsState) -> ShortsState:
         print("Suno 음악 생성 시작")
         print("=" * 60)
 
-        response = requests.post(suno_url, json = payload, headers = headers)
+        with track_call("suno", "submit"):
+            response = get_http_session().post(suno_url, json = payload, headers = headers, timeout = 30)
 
         result = response.json()
 
@@ -47,7 +78,7 @@ def generate_music(state: ShortsState) -> ShortsState:
 
         
         print("음악 생성 중...")
-        audio_url_1, audio_url_2 = get_audio_url(task_id, suno_api_key)
+        audio_url_1, audio_url_2 = get_audio_url(task_id)
 
         if not audio_url_1 or not audio_url_2:
             raise Exception("오디오 생성 실패")
@@ -61,16 +92,26 @@ def generate_music(state: ShortsState) -> ShortsState:
         print("=" * 60)
 
 
-        for i, url in enumerate(state.music_urls, 1):
-            filename = f"audio_{i}.mp3"
-            filepath = os.path.join(state.music_output_dir, filename)
-                
-            if download_audio_file(url, filepath):
-                state.music_files.append(filepath)
-                print(f"오디오 파일: {filename} 저장 완료")
-        
-            else:
-                print(f"오디오 파일: {filename} 다운로드 실패")
+        # 음악 파일 동시 다운로드 (스트리밍 저장, 이어받기, 길이 검증)
+        downloads = [
+            (url, os.path.join(music_output_dir, f"audio_{i}.mp3"))
+            for i, url in enumerate(state.music_urls, 1)
+        ]
+
+        results = download_files(downloads, validate = validate_audio_file)
+
+        for track_index, ((url, filepath), result) in enumerate(zip(downloads, results)):
+            filename = os.path.basename(filepath)
+
+            if isinstance(result, Exception):
+                print(f"오디오 파일: {filename} 다운로드 실패 ({result})")
+                continue
+
+            state.music_files.append(filepath)
+            print(f"오디오 파일: {filename} 저장 완료")
+
+            if store:
+                store.put_file(cache_keys[track_index], filepath, {"model": SUNO_MODEL, "track": track_index + 1})
         
         return state
     
@@ -82,61 +123,33 @@ def generate_music(state: ShortsState) -> ShortsState:
 
 # ================= Helper Functions =================
 
-def get_audio_url(task_id: str, suno_api_key: str) -> Tuple[Optional[str], Optional[str]]:
-    url = f"https://api.sunoapi.org/api/v1/generate/record-info?taskId={task_id}"
-    headers = {"Authorization": f"Bearer {suno_api_key}"}
-
-    # 시도 횟수
-    max_retries = 100
-    retries = 0
-
-    while retries < max_retries:
-        try:
-            response = requests.get(url, headers=headers)
-            data = response.json()
-
-            status = data.get('data', {}).get('status')
-            print(f"[{retries+1}/{max_retries}] Status: {status}")
-
-            if status in ('PENDING', 'TEXT_SUCCESS', 'FIRST_SUCCESS'):
-                time.sleep(10)
-                retries += 1
-                continue
-            
-            elif status == 'SUCCESS':
-                suno_data = data.get('data', {}).get('response', {}).get('sunoData', [])
-                audio_url_1 = suno_data[0].get('audioUrl') if len(suno_data) > 0 else None
-                audio_url_2 = suno_data[1].get('audioUrl') if len(suno_data) > 1 else None
-                return audio_url_1, audio_url_2
-
-            else:
-                return None, None
-    
-        except Exception as e:
-            raise Exception(f"오디오 추출 실패 {e}")
-
-    raise TimeoutError("Suno 오디오 생성 시간 초과")
+def get_audio_url(task_id: str) -> Tuple[Optional[str], Optional[str]]:
+    """생성 완료까지 대기 (콜백 수신 또는 공용 추적기의 폴링) 후 오디오 URL 2개 반환"""
+    try:
+        with track_call("suno", "generate"):
+            audio_urls = get_suno_tracker().wait(task_id)
+    except SunoTaskError as e:
+        print(f"Suno 생성 실패: {e}")
+        return None, None
 
+    audio_url_1 = audio_urls[0] if len(audio_urls) > 0 else None
+    audio_url_2 = audio_urls[1] if len(audio_urls) > 1 else None
+    return audio_url_1, audio_url_2
 
 
 
+def music_cache_keys(payload: Dict[str, Any]) -> List[str]:
+    """Suno 요청(콜백 URL 제외) 기반 곡별 캐시 키"""
+    params = {k: v for k, v in payload.items() if k not in ("prompt", "callBackUrl")}
 
-def download_audio_file(url: str, filename: str) -> bool:
-    """오디오 파일 다운로드"""
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
+    return [
+        artifact_key(SUNO_MODEL, payload["prompt"], params = {**params, "track": track})
+        for track in range(1, SUNO_TRACKS_PER_TASK + 1)
+    ]
 
-        
-        with open(filename, 'wb') as f:
-            f.write(response.content)
 
-        print(f"다운로드 완료: {filename}")
-      
-        return True
 
-    
-    except Exception as e:
-        print(f"오디오 파일 다운 실패: {e}")
-      
-        return False
+def validate_audio_file(path: str) -> None:
+    """다운로드한 오디오 파일 검증 (길이를 읽을 수 없으면 예외)"""
+    if probe_media_duration(path) <= 0:
+        raise ValueError("오디오 길이를 확인할 수 없음")
@@ -0,0 +1,88 @@
+from config.settings import settings
+from states.shorts_state import ShortsState
+from typing import Dict, Any
+from nodes.shorts.suno_music_prompt_generator import generate_suno_music_prompt, select_and_adjust_template
+from nodes.shorts.music_generator import generate_music
+
+
+def reconcile_music(state: ShortsState) -> ShortsState:
+    """선행 생성된 음악 검증: 실제 영상 분석과 템포/에너지/밝기 차이가 임계값을 넘으면 음악만 재생성
+
+    예상 분석은 모션을 알 수 없어 visual_energy가 중립값으로 고정되므로
+    모션 기반 에너지 단계/무드(intense/soft, energetic/calm)는 비교하지 않고 수치 차이만 비교
+    """
+
+    if not state.video_analysis:
+        print("비디오 분석 결과 없음, 선행 생성 음악 유지\n")
+        return state
+
+    industry = state.business_type.lower()
+
+    provisional = music_profile(industry, state.provisional_analysis) if state.provisional_analysis else None
+    actual = music_profile(industry, state.video_analysis)
+
+    reasons = []
+
+    if provisional is None or not state.music_files:
+        reasons.append("선행 생성 음악 없음")
+
+    else:
+        tempo_delta = abs(actual['bpm'] - provisional['bpm'])
+
+        if tempo_delta > settings.music_reconcile_tempo_threshold:
+            reasons.append(f"템포 차이 {tempo_delta}bpm ({provisional['bpm']} → {actual['bpm']})")
+
+        energy_delta = abs(actual['visual_energy'] - provisional['visual_energy'])
+
+        if energy_delta > settings.music_reconcile_energy_threshold:
+            reasons.append(f"에너지 차이 {energy_delta:.1f} ({provisional['visual_energy']:.1f} → {actual['visual_energy']:.1f})")
+
+        brightness_delta = abs(actual['avg_brightness'] - provisional['avg_brightness'])
+
+        if brightness_delta > settings.music_reconcile_brightness_threshold:
+            reasons.append(f"밝기 차이 {brightness_delta:.2f} ({provisional['avg_brightness']:.2f} → {actual['avg_brightness']:.2f})")
+
+    print("음악 검증 (예상 분석 vs 실제 분석)")
+    print("=" * 60)
+
+    state.music_reconciliation = {
+        'provisional': {**provisional, 'moods': sorted(provisional['moods'])} if provisional else None,
+        'actual': {**actual, 'moods': sorted(actual['moods'])},
+        'regenerated': bool(reasons),
+        'reasons': reasons
+    }
+
+    if not reasons:
+        print("차이가 임계값 이내, 선행 생성 음악 유지\n")
+        return state
+
+    print(f"음악 재생성: {', '.join(reasons)}\n")
+
+    # 실제 분석 기준으로 프롬프트 + 음악 재생성
+    state.music_prompt = None
+    state.music_alternatives = []
+    state.music_urls = []
+    state.music_files = []
+
+    state = generate_suno_music_prompt(state)
+
+    return generate_music(state)
+
+
+
+# ================= Helper Functions =================
+
+def music_profile(industry: str, analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """분석 결과가 음악 템플릿에 주는 영향 (BPM, 에너지/밝기 수치, 밝기 무드는 기록용)"""
+
+    template = select_and_adjust_template(industry, analysis)
+
+    # 업종 기본 무드와 모션 기반 무드(energetic/calm)는 제외
+    mood_markers = {'bright', 'uplifting', 'dark', 'moody'}
+
+    return {
+        'bpm': template['detected_bpm'],
+        'visual_energy': float(analysis.get('visual_energy', 50)),
+        'avg_brightness': float(analysis.get('avg_brightness', 0.5)),
+        'moods': set(template['mood_descriptors']) & mood_markers
+    }
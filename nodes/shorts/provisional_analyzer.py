@@ -0,0 +1,107 @@
+from states.shorts_state import ShortsState
+from typing import Dict, List, Any, Optional
+import cv2
+import numpy as np
+from nodes.shorts.video_analyzer import (
+    ANALYSIS_WIDTH,
+    analyze_frame,
+    downscale_frame,
+    process_analysis_results
+)
+from nodes.shorts.video_series_generator import SEGMENT_DURATION, SEGMENT_FPS, CROSSFADE_DURATION
+from nodes.shorts.suno_music_prompt_generator import generate_suno_music_prompt
+from utils.download_utils import fetch_bytes
+from utils.artifact_store import remember_digest
+
+# 렌더링 전 예상 시각 에너지 (select_and_adjust_template 기본값과 동일)
+NEUTRAL_VISUAL_ENERGY = 50.0
+
+
+def generate_provisional_music_prompt(state: ShortsState) -> ShortsState:
+    """영상 렌더링 전 예상 분석으로 음악 프롬프트 선행 생성 (영상 생성과 병렬 실행)"""
+
+    print("예상 영상 분석 (장면 이미지 + 계획 타이밍)")
+    print("=" * 60)
+
+    state.provisional_analysis = estimate_video_analysis(state.scenes_image_list)
+
+    return generate_suno_music_prompt(state)
+
+
+
+# ================= Helper Functions =================
+
+def planned_segment_timings(num_segments: int) -> Dict[str, Any]:
+    """계획된 세그먼트 길이/크로스페이드로 예상 영상 길이 및 전환 시점 계산"""
+
+    step = SEGMENT_DURATION - CROSSFADE_DURATION
+    starts = [i * step for i in range(num_segments)]
+    duration = num_segments * SEGMENT_DURATION - max(0, num_segments - 1) * CROSSFADE_DURATION
+
+    return {
+        'starts': starts,
+        'transitions': starts[1:],
+        'duration': max(0.0, duration)
+    }
+
+
+
+def load_scene_image(url: str) -> Optional[np.ndarray]:
+    """장면 이미지 다운로드 후 BGR 배열로 디코딩 (실패 시 None)"""
+    try:
+        data = fetch_bytes(url)
+
+        # 영상 세그먼트 캐시 키 계산 시 같은 장면 이미지를 다시 받지 않도록 digest 기억
+        remember_digest(url, data)
+
+        image = cv2.imdecode(np.frombuffer(data, dtype = np.uint8), cv2.IMREAD_COLOR)
+        return image
+
+    except Exception as e:
+        print(f"장면 이미지 로드 실패 ({url}): {e}")
+        return None
+
+
+
+def estimate_video_analysis(scene_image_urls: List[str]) -> Dict[str, Any]:
+    """장면 이미지별 색/밝기 통계 + 계획 타이밍으로 analyze_final_video와 같은 형식의 예상 분석 생성
+
+    모션 정보는 렌더링 전이라 없음 → 모션/리듬 값은 기본값 사용
+    """
+
+    timings = planned_segment_timings(len(scene_image_urls))
+
+    # 분석 데이터 컨테이너 (장면 이미지 1장 = 샘플 1개)
+    analysis_data = {
+        name: np.full(len(scene_image_urls), np.nan, dtype = np.float64)
+        for name in ('brightness', 'color_temps', 'motion', 'hue_values', 'saturation')
+    }
+
+    samples_taken = 0
+    for url in scene_image_urls:
+        image = load_scene_image(url)
+        if image is None:
+            continue
+
+        small = downscale_frame(image, ANALYSIS_WIDTH)
+
+        # 장면 간 차이는 모션이 아니므로 이전 프레임 없이 분석
+        analyze_frame(small, None, analysis_data, samples_taken)
+        samples_taken += 1
+
+    analysis_data = {name: column[:samples_taken] for name, column in analysis_data.items()}
+
+    video_info = {
+        'duration': timings['duration'],
+        'fps': SEGMENT_FPS
+    }
+
+    result = process_analysis_results(analysis_data, video_info)
+    result['scene_transitions'] = timings['transitions']
+
+    # 모션 기반 에너지는 알 수 없으므로 중립값 (템플릿 기본 에너지 유지)
+    result['visual_energy'] = NEUTRAL_VISUAL_ENERGY
+
+    print(f"예상 영상 길이: {timings['duration']:.1f}초, 장면 이미지 {samples_taken}/{len(scene_image_urls)}개 분석")
+
+    return result
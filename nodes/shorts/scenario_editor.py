@@ -1,9 +1,8 @@
 # nodes/scenario_editor.py
-from langchain_openai import ChatOpenAI
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import PromptTemplate
 from states.shorts_state import ShortsState
-from config.settings import settings
+from utils.llm_gateway import get_chat_model
 
 
 def edit_scenario(state: ShortsState) -> ShortsState:
@@ -74,7 +73,8 @@ content: (100자 이내의 구체적인 장면 설명)
 """
     )
 
-    llm = ChatOpenAI(temperature=0.8, model="gpt-4o-mini", streaming=False, api_key=settings.openai_api_key)
+    # 수정 요청마다 새 결과가 필요하므로 캐시 없이 공용 클라이언트만 사용
+    llm = get_chat_model("gpt-4o-mini", 0.8)
     chain_scenario = prompt | llm | StrOutputParser()
     raw_output = chain_scenario.invoke({
         "scenario_text": scenario_text,
@@ -1,17 +1,13 @@
 # nodes/scenario_generator.py
 import os
-from config.settings import settings
-import openai
 import json
 from repositories.in_memory_ad_style_repository import InMemoryAdStyleRepository
 from states.shorts_state import ShortsState
 from schemas.shorts_schema import Scenario
+from utils.llm_gateway import openai_chat
 
 
-def generate_scenarios(state: ShortsState, api_key=settings.openai_api_key) -> ShortsState:
-    # OpenAI 클라이언트 초기화
-    client = openai.OpenAI(api_key=api_key)
-    
+def generate_scenarios(state: ShortsState) -> ShortsState:
     # System Message 정의
     system_message = """당신은 소상공인을 위한 숏폼 동영상 광고 시나리오 전문가입니다.
 
@@ -46,14 +42,13 @@ def generate_scenarios(state: ShortsState, api_key=settings.openai_api_key) -> S
     ]
 
     try:
-        response = client.chat.completions.create(
+        # 매번 새로운 시나리오를 제안해야 하므로 캐시 사용 안 함
+        content = openai_chat(
             model="gpt-4o", 
             messages=messages,
             max_tokens=2000,
             temperature=0.7
         )
-
-        content = response.choices[0].message.content.strip()
         print(f"API 응답: {content}")
         
         scenarios = json.loads(content)
@@ -1,15 +1,33 @@
 # nodes/scene_generator.py
-from openai import OpenAI
 from schemas.shorts_schema import Scene
 from states.shorts_state import ShortsState
-from config.settings import settings
+from utils.llm_gateway import openai_chat
 import json, re, ast
 
+# 장면 구성 원칙 (장면 생성 / 장면+요약 통합 생성 공통)
+SCENE_GUIDE = """당신은 수백만 조회수를 만든 SNS 바이럴 영상 전문가입니다.
+
+🎯 **장면 구성 원칙**
+1. 각 장면은 **정확히 5초 분량**이어야 합니다.
+   - **하드 컷 전환**으로 각 장면이 명확히 구분되고, **장면 간 소재·연출이 절대 중복되지 않게** 작성하세요.
+
+2. 장면 전체 스토리는 **Hook → 중간 전달 → 제품 중심 마무리** 구조를 포함합니다.
+   - **첫 장면**: 강렬하고 임팩트 있는 연출로 이목을 집중시키는 훅 (예: 드라마틱한 변화, 예상 밖 연출, 시각적 충격)
+   - **중간**: 제품/공간의 핵심 가치와 매력 요소를 자연스럽게 전달
+   - **마지막 장면**: 홍보하려는 제품이나 브랜드를 명확히 보여주며 강렬한 인상으로 마무리 (로고, 제품샷, 매장 전경 등)
+
+3. 제품 특성을 극대화한 참신하고 독창적인 연출 필수
+   - 영화적·마법적 시각효과, 시간 흐름/공간 변형/사물 변신 등 창의적 아이디어 포함
+
+4. **촬영·시각 표현 가이드**
+   - 카메라 용어 필수: 드론 뷰, 클로즈업, 팬, 틸트, 줌, 슬로모션 등
+   - 시각 요소 필수: 색감, 질감, 조명, 배경, 소품, 움직임 등 구체적으로
+   - 금지: 텍스트/자막/대사/나레이션, 복잡한 스토리·은유
+
+"""
+
 
 def generate_scenes(state: ShortsState) -> ShortsState:
-    # OpenAI 클라이언트 초기화
-    client = OpenAI(api_key=settings.openai_api_key)
-    
     # 시스템 메시지와 사용자 프롬프트 생성
     system_message = create_system_message()
     user_prompt = create_user_prompt(state)
@@ -21,14 +39,12 @@ def generate_scenes(state: ShortsState) -> ShortsState:
     ]
     
     try:
-        response = client.chat.completions.create(
+        content = openai_chat(
             model="gpt-4o",
             messages=messages,
             max_tokens=2000,
             temperature=0.7
         )
-        
-        content = response.choices[0].message.content.strip()
         print(f"API 응답: {content}")
         
         scenes_data = extract_json(content)
@@ -52,26 +68,7 @@ def generate_scenes(state: ShortsState) -> ShortsState:
 
 
 def create_system_message():
-    return """당신은 수백만 조회수를 만든 SNS 바이럴 영상 전문가입니다.
-
-🎯 **장면 구성 원칙**
-1. 각 장면은 **정확히 5초 분량**이어야 합니다.
-   - **하드 컷 전환**으로 각 장면이 명확히 구분되고, **장면 간 소재·연출이 절대 중복되지 않게** 작성하세요.
-
-2. 장면 전체 스토리는 **Hook → 중간 전달 → 제품 중심 마무리** 구조를 포함합니다.
-   - **첫 장면**: 강렬하고 임팩트 있는 연출로 이목을 집중시키는 훅 (예: 드라마틱한 변화, 예상 밖 연출, 시각적 충격)
-   - **중간**: 제품/공간의 핵심 가치와 매력 요소를 자연스럽게 전달
-   - **마지막 장면**: 홍보하려는 제품이나 브랜드를 명확히 보여주며 강렬한 인상으로 마무리 (로고, 제품샷, 매장 전경 등)
-
-3. 제품 특성을 극대화한 참신하고 독창적인 연출 필수
-   - 영화적·마법적 시각효과, 시간 흐름/공간 변형/사물 변신 등 창의적 아이디어 포함
-
-4. **촬영·시각 표현 가이드**
-   - 카메라 용어 필수: 드론 뷰, 클로즈업, 팬, 틸트, 줌, 슬로모션 등
-   - 시각 요소 필수: 색감, 질감, 조명, 배경, 소품, 움직임 등 구체적으로
-   - 금지: 텍스트/자막/대사/나레이션, 복잡한 스토리·은유
-
-📦 **출력 규칙**
+    return SCENE_GUIDE + """📦 **출력 규칙**
 - **JSON 배열**만 출력 (코드 블록, 추가 설명, 서두·마무리 문장 금지)
 - 장면 제목과, 장면 설명 value는 영어로 출력
 - 각 장면은 다음 형식:
@@ -89,7 +86,13 @@ def create_user_prompt(state: ShortsState):
     prompt = f"""다음 정보를 바탕으로 **정확히 {scene_count}개의 장면**을 생성하세요.
 - 각 장면은 반드시 5초 분량입니다.
 - 출력은 JSON 배열 형식만 사용하세요. 코드 블록, 추가 설명 금지.
+"""
+    
+    return prompt + create_context_prompt(state)
 
+def create_context_prompt(state: ShortsState):
+    """매장 정보, 광고 조건, 시나리오, 이미지 요소"""
+    prompt = f"""
 📌 매장 정보:
 - 업종: {state.business_type}
 - 브랜드 컨셉: {', '.join(state.brand_concept)}
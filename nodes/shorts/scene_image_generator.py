@@ -1,84 +1,215 @@
 import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 from config.settings import settings
 from states.shorts_state import ShortsState
-from openai import OpenAI
 import replicate
-from utils.image_utils import combine_images
+from utils.image_utils import load_images, reference_image_url
+from utils.artifact_store import artifact_key, get_artifact_store, session_seed
+from utils.llm_gateway import openai_chat
+from utils.metrics import track_call
+
+FLUX_MODEL = "black-forest-labs/flux-kontext-max"
+
+# 장면별 참고 이미지 선택/프롬프트 재사용 (장면 이미지 캐시 키와 맞물림)
+LLM_CACHE_TTL = 60 * 60 * 24 * 7
+
+# 장면 분석 system 메시지 공통 부분 (장면별/전체 장면 호출)
+SCENE_CONFIG_GUIDE = """당신은 영상 제작에서 각 장면의 첫 프레임 이미지 생성을 담당하는 전문가입니다.
+
+🎯 **역할**: 
+- 장면 설명을 분석하여 첫 프레임에 적합한 참고 이미지를 선정
+- flux-kontext-max AI가 첫 프레임 이미지를 생성할 수 있는 최적의 프롬프트 작성
+
+📋 **분석 과정**:
+1. 장면의 첫 프레임에 어떤 시각적 요소가 필요한지 파악
+2. 전체 영상 스타일 가이드(scene_summary)를 바탕으로 일관성 유지 방향 결정
+3. 제공된 이미지들 중 가장 적합한 참고 이미지 선택
+4. flux-kontext-max가 이해하기 쉬운 영어 프롬프트 생성
+
+🔧 **선택 기준**:
+- 장면의 주요 객체/소품과 일치하는 이미지
+- 원하는 분위기/색감을 구현할 수 있는 이미지  
+- 브랜드 아이덴티티를 잘 반영하는 이미지
+- 단, 장면의 주요 객체/소품과 일치하는 것이 없다면 image_index를 빈 리스트로 반환
+
+"""
 
 def generate_scene_images(state: ShortsState) -> ShortsState:
     
-    openai_client = OpenAI(api_key=settings.openai_api_key)
-    replicate_client = replicate.Client(api_token=settings.replicate_api_key)
+    replicate_client = replicate.Client(api_token=settings.replicate_api_key, base_url=settings.replicate_base_url)
     
-    print(f"총 {len(state.scenes)}개 장면의 이미지를 생성합니다.")
+    max_workers = max(1, min(settings.scene_image_concurrency, len(state.scenes) or 1))
+    print(f"총 {len(state.scenes)}개 장면의 이미지를 생성합니다. (동시 처리: {max_workers})")
     
-    for i, scene in enumerate(state.scenes):
-        print(f"\n=== 장면 {i+1}/{len(state.scenes)} 처리 중 ===")
-        print(f"장면 제목: {scene.title}")
+    # 전체 장면의 참고 이미지 선택/프롬프트를 한 번에 생성 (검증 실패한 장면만 장면별 호출)
+    scene_configs = generate_scene_configs_for_flux_kontext(state)
+    
+    # 장면별 독립 실행 후 장면 순서대로 결과 수집 (실패한 장면은 None)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        scene_image_urls = list(executor.map(
+            lambda args: generate_single_scene_image(replicate_client, state, *args, scene_config=scene_configs[args[0]]),
+            enumerate(state.scenes)
+        ))
+    
+    state.scenes_image_list.extend(url for url in scene_image_urls if url)
+    
+    print(f"\n이미지 생성 완료: {len(state.scenes_image_list)}/{len(state.scenes)}개")
+    return state
+
+def generate_single_scene_image(replicate_client, state, i, scene, scene_config=None) -> Optional[str]:
+    """장면 하나의 첫 프레임 이미지 생성 (실패 시 None, scene_config가 없으면 장면별 GPT-4o 호출)"""
+    print(f"\n=== 장면 {i+1}/{len(state.scenes)} 처리 중 ===")
+    print(f"장면 제목: {scene.title}")
+    
+    try:
+        # GPT-4o로 이미지 선택 및 프롬프트 생성
+        if scene_config is None:
+            scene_config = generate_scene_config_for_flux_kontext(state, scene, i)
+        
+        if not scene_config:
+            print(f"장면 {i+1} 분석 실패, 건너뜁니다.")
+            return None
+        
+        # 선택된 이미지들로 참고 이미지 생성
+        selected_image_urls = [
+            state.image_list[idx].url 
+            for idx in scene_config["image_index"]
+            if idx < len(state.image_list)
+        ]
+        
+        flux_input = {
+            "prompt": scene_config["flux-kontext-prompt"],
+            "go_fast": False,
+            "aspect_ratio": "16:9", 
+            "output_format": "jpg",
+            "prompt_upsampling": False
+        }
+        
+        seed = session_seed(state.session_id, f"scene-image-{i}")
+        if seed is not None:
+            flux_input["seed"] = seed
+        
+        # 같은 프롬프트 + 참고 이미지 + seed 조합은 캐시된 이미지 재사용 (외부 접근 URL을 만들 수 있는 저장소일 때만)
+        store = get_artifact_store()
+        if store and not store.serves_urls:
+            store = None
         
-        try:
-            # GPT-4o로 이미지 선택 및 프롬프트 생성
-            scene_config = generate_scene_config_for_flux_kontext(
-                openai_client, state, scene, i
+        cache_key = None
+        if store:
+            # 참고 이미지는 세션 캐시에서 한 번만 받고 그 내용 digest로 키 계산
+            reference_images = [img for img in load_images(selected_image_urls, session_id=state.session_id) if img]
+            cache_key = artifact_key(
+                FLUX_MODEL,
+                flux_input["prompt"],
+                seed = seed,
+                input_digests = [img.digest for img in reference_images],
+                params = {k: v for k, v in flux_input.items() if k not in ("prompt", "seed")}
             )
             
-            if not scene_config:
-                print(f"장면 {i+1} 분석 실패, 건너뜁니다.")
-                continue
-            
-            # 선택된 이미지들로 참고 이미지 생성
-            selected_image_urls = [
-                state.image_list[idx].url 
-                for idx in scene_config["image_index"]
-                if idx < len(state.image_list)
-            ]
-            
-            if not selected_image_urls:
-                scene_image_url = replicate_client.run(
-                    "black-forest-labs/flux-kontext-max",
-                    input={
-                        "prompt": scene_config["flux-kontext-prompt"],
-                        "go_fast": False,
-                        "aspect_ratio": "16:9", 
-                        "output_format": "jpg",
-                        "prompt_upsampling": False
-                    }
-                )
-            else:
-                # 참고 이미지 합성
-                reference_image_url = combine_images(selected_image_urls)
-                
-                scene_image_url = replicate_client.run(
-                    "black-forest-labs/flux-kontext-max",
-                    input={
-                        "prompt": scene_config["flux-kontext-prompt"],
-                        "input_image": reference_image_url,
-                        "go_fast": False,
-                        "aspect_ratio": "16:9", 
-                        "output_format": "jpg",
-                        "prompt_upsampling": False
-                    }
-                )
-            
-            # 결과 URL 처리
-            if hasattr(scene_image_url, 'url'):
-                image_url = scene_image_url.url
-            elif isinstance(scene_image_url, str):
-                image_url = scene_image_url
-            else:
-                image_url = str(scene_image_url)
-            
-            state.scenes_image_list.append(image_url)
-            print(f"장면 {i+1} 이미지 생성 완료: {image_url}")
-            
-        except Exception as e:
-            print(f"장면 {i+1} 이미지 생성 중 오류: {e}")
+            cached = store.get(cache_key)
+            if cached and cached.url:
+                print(f"장면 {i+1} 이미지 캐시 사용: {cached.url}")
+                return cached.url
+        
+        if selected_image_urls:
+            # 참고 이미지 합성 후 업로드한 URL 전달 (업로드할 수 없으면 data URL)
+            flux_input["input_image"] = reference_image_url(selected_image_urls, session_id=state.session_id)
+        
+        with track_call("replicate", FLUX_MODEL):
+            scene_image_url = replicate_client.run(FLUX_MODEL, input=flux_input)
+        
+        # 결과 URL 처리
+        if hasattr(scene_image_url, 'url'):
+            image_url = scene_image_url.url
+        elif isinstance(scene_image_url, str):
+            image_url = scene_image_url
+        else:
+            image_url = str(scene_image_url)
+        
+        if store:
+            store.put_url(cache_key, image_url, ".jpg", {"model": FLUX_MODEL, "scene_index": i})
+        
+        print(f"장면 {i+1} 이미지 생성 완료: {image_url}")
+        return image_url
+        
+    except Exception as e:
+        print(f"장면 {i+1} 이미지 생성 중 오류: {e}")
+        return None
+
+def generate_scene_configs_for_flux_kontext(state) -> List[Optional[dict]]:
+    """
+    GPT-4o 한 번 호출로 전체 장면의 참고 이미지 선택 및 flux-kontext 프롬프트 생성
+    장면 순서대로 반환, 응답이 없거나 검증에 실패한 장면은 None
+    """
+    if not state.scenes:
+        return []
+    
+    messages = [
+        {"role": "system", "content": create_batch_system_message()},
+        {"role": "user", "content": create_batch_user_prompt(state)}
+    ]
+    
+    try:
+        response_text = openai_chat(
+            model="gpt-4o",
+            messages=messages,
+            max_tokens=min(16000, 600 * len(state.scenes) + 500),
+            temperature=0.3,
+            response_format={"type": "json_object"},
+            cache_ttl=LLM_CACHE_TTL,
+            # 모든 장면 설정이 유효한 응답만 캐시 (일부 실패 응답이 캐시되면 매번 장면별 호출로 대체됨)
+            validate=lambda text: all(parse_scene_configs(text, len(state.scenes)))
+        )
+        
+        print(f"GPT-4o 전체 장면 분석 결과: {response_text}")
+        configs = parse_scene_configs(response_text, len(state.scenes))
+        
+    except Exception as e:
+        print(f"GPT-4o 전체 장면 분석 오류, 장면별 호출로 대체: {e}")
+        return [None] * len(state.scenes)
+    
+    invalid = [i + 1 for i, config in enumerate(configs) if config is None]
+    if invalid:
+        print(f"장면 {invalid} 분석 결과 없음/검증 실패, 장면별 호출로 대체")
+    
+    return configs
+
+def parse_scene_configs(response_text, scene_count) -> List[Optional[dict]]:
+    """전체 장면 분석 응답 → 장면 순서대로 설정 목록 (검증 실패한 장면은 None, JSON 오류는 예외)"""
+    scene_configs = json.loads(response_text).get("scenes", [])
+    
+    configs = [None] * scene_count
+    for item in scene_configs if isinstance(scene_configs, list) else []:
+        if not isinstance(item, dict):
+            continue
+        
+        index = item.get("scene_index")
+        if not isinstance(index, int) or not 1 <= index <= scene_count:
             continue
+        
+        config = {"image_index": item.get("image_index"), "flux-kontext-prompt": item.get("flux-kontext-prompt")}
+        if is_valid_scene_config(config):
+            configs[index - 1] = config
     
-    print(f"\n이미지 생성 완료: {len(state.scenes_image_list)}/{len(state.scenes)}개")
-    return state
+    return configs
 
-def generate_scene_config_for_flux_kontext(openai_client, state, scene, scene_index):
+def is_valid_scene_config(config) -> bool:
+    """image_index는 정수 배열, flux-kontext-prompt는 비어 있지 않은 문자열"""
+    if not isinstance(config, dict):
+        return False
+    
+    image_index = config.get("image_index")
+    prompt = config.get("flux-kontext-prompt")
+    
+    return (
+        isinstance(image_index, list)
+        and all(isinstance(idx, int) and idx >= 0 for idx in image_index)
+        and isinstance(prompt, str)
+        and bool(prompt.strip())
+    )
+
+def generate_scene_config_for_flux_kontext(state, scene, scene_index):
     """
     GPT-4o를 사용하여 장면 분석 후 참고 이미지 선택 및 flux-kontext 프롬프트 생성
     """
@@ -91,54 +222,39 @@ def generate_scene_config_for_flux_kontext(openai_client, state, scene, scene_in
     ]
     
     try:
-        response = openai_client.chat.completions.create(
+        response_text = openai_chat(
             model="gpt-4o",
             messages=messages,
             max_tokens=1500,
-            temperature=0.3
+            temperature=0.3,
+            cache_ttl=LLM_CACHE_TTL,
+            validate=lambda text: is_valid_scene_config(parse_scene_config(text))
         )
-        
-        response_text = response.choices[0].message.content.strip()
+
         print(f"GPT-4o 분석 결과: {response_text}")
         
-        # JSON 파싱
-        try:
-            scene_config = json.loads(response_text)
-            return scene_config
-        except json.JSONDecodeError:
-            # 코드 블록으로 감싸진 경우 처리
-            if "```json" in response_text:
-                json_text = response_text.split("```json")[1].split("```")[0].strip()
-                scene_config = json.loads(json_text)
-                return scene_config
-            else:
-                print(f"JSON 파싱 실패: {response_text}")
-                return None
+        scene_config = parse_scene_config(response_text)
+        if scene_config is None:
+            print(f"JSON 파싱 실패: {response_text}")
+        return scene_config
         
     except Exception as e:
         print(f"GPT-4o 호출 오류: {e}")
         return None
 
-def create_system_message():
-    return """당신은 영상 제작에서 각 장면의 첫 프레임 이미지 생성을 담당하는 전문가입니다.
-
-🎯 **역할**: 
-- 장면 설명을 분석하여 첫 프레임에 적합한 참고 이미지를 선정
-- flux-kontext-max AI가 첫 프레임 이미지를 생성할 수 있는 최적의 프롬프트 작성
-
-📋 **분석 과정**:
-1. 장면의 첫 프레임에 어떤 시각적 요소가 필요한지 파악
-2. 전체 영상 스타일 가이드(scene_summary)를 바탕으로 일관성 유지 방향 결정
-3. 제공된 이미지들 중 가장 적합한 참고 이미지 선택
-4. flux-kontext-max가 이해하기 쉬운 영어 프롬프트 생성
-
-🔧 **선택 기준**:
-- 장면의 주요 객체/소품과 일치하는 이미지
-- 원하는 분위기/색감을 구현할 수 있는 이미지  
-- 브랜드 아이덴티티를 잘 반영하는 이미지
-- 단, 장면의 주요 객체/소품과 일치하는 것이 없다면 image_index를 빈 리스트로 반환
+def parse_scene_config(response_text):
+    """장면별 분석 응답 JSON 파싱 (코드 블록으로 감싸진 경우 포함, 파싱 실패 시 None)"""
+    try:
+        return json.loads(response_text)
+    except json.JSONDecodeError:
+        # 코드 블록으로 감싸진 경우 처리
+        if "```json" in response_text:
+            json_text = response_text.split("```json")[1].split("```")[0].strip()
+            return json.loads(json_text)
+        return None
 
-📦 **출력 형식** (JSON만, 코드 블록이나 추가 설명 금지):
+def create_system_message():
+    return SCENE_CONFIG_GUIDE + """📦 **출력 형식** (JSON만, 코드 블록이나 추가 설명 금지):
 {
   "image_index": [0, 1],
   "flux-kontext-prompt": "A detailed English prompt for flux-kontext-max describing the first frame of the scene, incorporating visual style consistency and brand elements from reference images."
@@ -150,13 +266,71 @@ def create_system_message():
 - 첫 프레임만을 위한 프롬프트 (전체 장면 아님)
 - **구체적이고 명확한 시각적 묘사만 포함**"""
 
+def create_batch_system_message():
+    return SCENE_CONFIG_GUIDE + """📦 **출력 형식** (JSON 객체만, 코드 블록이나 추가 설명 금지):
+{
+  "scenes": [
+    {
+      "scene_index": 1,
+      "image_index": [0, 1],
+      "flux-kontext-prompt": "A detailed English prompt for flux-kontext-max describing the first frame of the scene, incorporating visual style consistency and brand elements from reference images."
+    }
+  ]
+}
+
+⚠️ **제약사항**:
+- 모든 장면에 대해 scene_index 순서대로 하나씩 작성 (scene_index는 1부터)
+- image_index는 반드시 배열 형태 (단일 이미지도 [0] 형태)
+- flux-kontext-prompt는 영어로 작성
+- 각 장면의 첫 프레임만을 위한 프롬프트 (전체 장면 아님)
+- **구체적이고 명확한 시각적 묘사만 포함**"""
+
+def create_batch_user_prompt(state):
+    prompt = f"""다음 {len(state.scenes)}개 장면 각각의 첫 프레임 이미지 생성을 위해 참고 이미지를 선택하고 프롬프트를 작성해주세요:
+"""
+    
+    for i, scene in enumerate(state.scenes):
+        prompt += f"""
+📌 장면 {i + 1}:
+제목: {scene.title}
+설명: {scene.content}
+"""
+    
+    prompt += create_context_prompt(state)
+    prompt += f"""
+
+위 정보를 바탕으로 장면마다:
+1. 첫 프레임에 가장 적합한 참고 이미지를 선택하세요
+2. 선택한 이미지들과 스타일 요약을 반영한 flux-kontext 프롬프트를 작성하세요
+3. 브랜드 일관성을 유지하면서도 각 장면만의 특색을 살려주세요
+
+{len(state.scenes)}개 장면 모두를 JSON 형식으로만 응답해주세요."""
+
+    return prompt
+
 def create_user_prompt(state, scene, scene_index):
     prompt = f"""다음 장면의 첫 프레임 이미지 생성을 위해 참고 이미지를 선택하고 프롬프트를 작성해주세요:
 
 📌 현재 장면 (장면 {scene_index + 1}):
 제목: {scene.title}
 설명: {scene.content}
+"""
+    
+    prompt += create_context_prompt(state)
+    prompt += f"""
 
+위 정보를 바탕으로:
+1. 이 장면의 첫 프레임에 가장 적합한 참고 이미지를 선택하세요
+2. 선택한 이미지들과 스타일 요약을 반영한 flux-kontext 프롬프트를 작성하세요
+3. 브랜드 일관성을 유지하면서도 이 장면만의 특색을 살려주세요
+
+JSON 형식으로만 응답해주세요."""
+
+    return prompt
+
+def create_context_prompt(state):
+    """장면 공통 정보 (스타일 요약, 매장 정보, 참고 가능한 이미지)"""
+    prompt = f"""
 📌 전체 장면 스타일 요약:
 {state.scene_summary if state.scene_summary else '스타일 가이드 없음'}
 
@@ -175,13 +349,4 @@ def create_user_prompt(state, scene, scene_index):
 - 핵심 요소: {main_objects}
 - 설명: {description}"""
 
-    prompt += f"""
-
-위 정보를 바탕으로:
-1. 이 장면의 첫 프레임에 가장 적합한 참고 이미지를 선택하세요
-2. 선택한 이미지들과 스타일 요약을 반영한 flux-kontext 프롬프트를 작성하세요
-3. 브랜드 일관성을 유지하면서도 이 장면만의 특색을 살려주세요
-
-JSON 형식으로만 응답해주세요."""
-
     return prompt
\ No newline at end of file
@@ -0,0 +1,119 @@
+# nodes/shorts/scene_planner.py
+import json
+from typing import List
+from pydantic import BaseModel, Field
+from schemas.shorts_schema import Scene
+from states.shorts_state import ShortsState
+from utils.llm_gateway import openai_chat
+from nodes.shorts.scene_generator import SCENE_GUIDE, create_context_prompt, generate_scenes
+from nodes.shorts.scenes_summarizer import SUMMARY_GUIDE, summarize_scenes
+
+
+class ScenePlan(BaseModel):
+    """장면 목록 + 스타일 요약 (통합 생성 응답)"""
+    scenes: List[Scene] = Field(min_length=1)
+    scene_summary: str = Field(min_length=1)
+
+
+# OpenAI structured outputs 스키마 (strict)
+SCENE_PLAN_SCHEMA = {
+    "name": "scene_plan",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "scenes": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "title": {"type": "string"},
+                        "content": {"type": "string"}
+                    },
+                    "required": ["title", "content"],
+                    "additionalProperties": False
+                }
+            },
+            "scene_summary": {"type": "string"}
+        },
+        "required": ["scenes", "scene_summary"],
+        "additionalProperties": False
+    }
+}
+
+
+def generate_scenes_with_summary(state: ShortsState) -> ShortsState:
+    """
+    장면 생성과 스타일 요약을 GPT-4o 한 번 호출로 처리 (generate_scenes → summarize_scenes 대체)
+    응답이 스키마 검증에 실패하거나 장면 수가 맞지 않으면 기존 두 단계 호출로 대체
+    """
+    scene_count = state.ad_duration // 5
+
+    messages = [
+        {"role": "system", "content": create_system_message()},
+        {"role": "user", "content": create_user_prompt(state)}
+    ]
+
+    try:
+        content = openai_chat(
+            model="gpt-4o",
+            messages=messages,
+            max_tokens=3000,
+            temperature=0.7,
+            response_format={"type": "json_schema", "json_schema": SCENE_PLAN_SCHEMA}
+        )
+        print(f"API 응답: {content}")
+
+        plan = ScenePlan.model_validate(json.loads(content))
+        if len(plan.scenes) != scene_count:
+            raise ValueError(f"장면 수 불일치 ({len(plan.scenes)}/{scene_count})")
+
+    # JSON 파싱/스키마 검증 실패 (JSONDecodeError, ValidationError 모두 ValueError)
+    except ValueError as e:
+        print(f"장면+요약 통합 생성 검증 실패, 장면 생성/요약 개별 호출로 대체: {e}")
+        return summarize_scenes(generate_scenes(state))
+
+    except Exception as e:
+        print(f"장면+요약 통합 생성 중 오류 발생: {e}")
+        return state
+
+    state.scenes.extend(plan.scenes)
+    state.scene_summary = plan.scene_summary
+
+    print(state.scenes)
+    print(f"장면 요약 생성 완료:")
+    print(plan.scene_summary)
+
+    return state
+
+
+def create_system_message():
+    return SCENE_GUIDE + """🎨 **스타일 요약 (scene_summary)**
+전체 장면을 관통하는 **핵심 색상 팔레트, 전체적인 분위기, 일관된 스타일 방향성**을 3-4문장으로 요약합니다.
+장면 이미지 생성 시 일관성 유지를 위한 시각적 가이드라인으로 사용됩니다.
+
+""" + SUMMARY_GUIDE + """📦 **출력 규칙**
+- **JSON 객체**만 출력 (코드 블록, 추가 설명, 서두·마무리 문장 금지)
+- scenes의 title, content는 영어로 출력
+- 형식:
+{
+  "scenes": [
+    {
+      "title": "Hook 제목 (간결·주목도 높은 문장) (영어)",
+      "content": "5초 분량의 장면을 마침표 기준 3~4문장으로 구체 묘사. 카메라 움직임, 조명, 배경, 색감, 소품 상태와 움직임을 상세 기술. (영어)"
+    }
+  ],
+  "scene_summary": "전체 영상의 색상 팔레트, 분위기, 스타일 방향성 요약"
+}
+"""
+
+
+def create_user_prompt(state: ShortsState):
+    scene_count = state.ad_duration // 5
+
+    prompt = f"""다음 정보를 바탕으로 **정확히 {scene_count}개의 장면**과 전체 장면의 스타일 요약을 생성하세요.
+- 각 장면은 반드시 5초 분량입니다.
+- 출력은 JSON 객체 형식만 사용하세요. 코드 블록, 추가 설명 금지.
+"""
+
+    return prompt + create_context_prompt(state)
@@ -1,8 +1,17 @@
-from openai import OpenAI
 from states.shorts_state import ShortsState
-from config.settings import settings
+from utils.llm_gateway import openai_chat
 
-client = OpenAI(api_key=settings.openai_api_key)
+LLM_CACHE_TTL = 60 * 60 * 24 * 7
+
+# 스타일 요약 분석 요소 (장면 요약 / 장면+요약 통합 생성 공통)
+SUMMARY_GUIDE = """🎯 **핵심 분석 요소**:
+1. **주요 색상 팔레트** (2-3가지 핵심 색상과 보조 색상)
+2. **전체적인 무드와 분위기** (고급스러운, 활기찬, 따뜻한, 모던한 등)
+3. **일관된 스타일 방향성** (미니멀, 빈티지, 컨템포러리, 내추럴 등)
+4. **공통 시각적 특성** (조명의 성격, 질감, 카메라 톤 등)
+5. **브랜드 아이덴티티와의 조화**
+
+"""
 
 def summarize_scenes(state: ShortsState) -> ShortsState:
     """
@@ -25,14 +34,14 @@ def summarize_scenes(state: ShortsState) -> ShortsState:
     ]
     
     try:
-        response = client.chat.completions.create(
+        scene_summary = openai_chat(
             model="gpt-4o-mini",
             messages=messages,
             max_tokens=1000,
-            temperature=0.3  # 일관성을 위해 낮은 temperature 사용
+            temperature=0.3,  # 일관성을 위해 낮은 temperature 사용
+            cache_ttl=LLM_CACHE_TTL
         )
         
-        scene_summary = response.choices[0].message.content.strip()
         state.scene_summary = scene_summary
         
         print(f"장면 요약 생성 완료:")
@@ -49,14 +58,7 @@ def create_system_message():
 
 전체 장면들을 종합적으로 분석하여, **핵심 색상 팔레트, 전체적인 분위기, 그리고 일관된 스타일 방향성**을 중심으로 스토리를 요약해주세요.
 
-🎯 **핵심 분석 요소**:
-1. **주요 색상 팔레트** (2-3가지 핵심 색상과 보조 색상)
-2. **전체적인 무드와 분위기** (고급스러운, 활기찬, 따뜻한, 모던한 등)
-3. **일관된 스타일 방향성** (미니멀, 빈티지, 컨템포러리, 내추럴 등)
-4. **공통 시각적 특성** (조명의 성격, 질감, 카메라 톤 등)
-5. **브랜드 아이덴티티와의 조화**
-
-📦 **출력 요구사항**:
+""" + SUMMARY_GUIDE + """📦 **출력 요구사항**:
 - 개별 장면별 설명이 아닌 **전체 영상의 통합적 스토리 요약**
 - 색상, 분위기, 스타일을 중심으로 한 **시각적 가이드라인 성격**의 요약
 - 이미지 생성 시 일관성 있는 결과물을 위한 **핵심 키워드 중심** 작성
@@ -6,14 +6,16 @@ import json
 import base64
 import random
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Any
 from pydantic import BaseModel, Field
-import anthropic
+from utils.llm_gateway import claude_message
+
+# 같은 입력(장면, 이미지, 비즈니스 정보)의 분석/프롬프트 재사용
+LLM_CACHE_TTL = 60 * 60 * 24 * 7
 
 
 def seedance_prompt_generation(state: ShortsState) -> ShortsState:
-    client = anthropic.Anthropic(api_key = settings.claude_api_key)
-    
     scene_descriptions = [scene.content for scene in state.scenes]
     
     if len(scene_descriptions) != len(state.scenes_image_list):
@@ -36,20 +38,37 @@ def seedance_prompt_generation(state: ShortsState) -> ShortsState:
     previous_prompt = ""
     is_ending = False
 
+    num_scenes = len(scene_descriptions)
+    executor = ThreadPoolExecutor(max_workers = max(1, settings.seedance_prompt_concurrency))
+
     try:
-        for i in range(len(scene_descriptions)):
-            print(f"\nScene {i+1}/{len(scene_descriptions)} 처리 중...")
+        # 씬 간 의존성이 없는 작업은 먼저 동시 실행
+        # - 비즈니스 스타일 가이드: 세션(노드 실행)당 1회만 생성
+        # - 인물 분석: 모든 (시작, 끝) 프레임 쌍 동시 분석
+        style_guide_future = executor.submit(analyze_business_context, business_info)
+        character_futures = [
+            executor.submit(analyze_character_difference, state.scenes_image_list[i], state.scenes_image_list[i + 1])
+            for i in range(num_scenes - 1)
+        ]
+        alternative_futures = []
+
+        style_guide = style_guide_future.result()
+
+        # 이전 프롬프트(previous_prompt)에 의존하는 생성 → 최적화 단계만 순차 실행
+        for i in range(num_scenes):
+            print(f"\nScene {i+1}/{num_scenes} 처리 중...")
 
             # 현재 씬 & 다음 씬 정보
             current_scene = scene_descriptions[i]
             start_frame = state.scenes_image_list[i]
 
             # 다음 씬 정보
-            if i < len(scene_descriptions) - 1:
+            if i < num_scenes - 1:
                 is_ending = False
 
                 tail_frame = state.scenes_image_list[i + 1]
                 next_scene = scene_descriptions[i + 1]
+                character_analysis = character_futures[i].result()
             
                 print(f"현재 씬: '{current_scene[:30]}...'")
                 print(f"다음 씬: '{next_scene[:30]}...'")
@@ -60,34 +79,35 @@ def seedance_prompt_generation(state: ShortsState) -> ShortsState:
 
                 tail_frame = None
                 next_scene = None
+                character_analysis = None
                 
                 print(f"마지막 씬: '{current_scene[:30]}...'")
 
 
             # 최초 Seedance 프롬프트 생성
             result = generate_seedance_prompt(
-                client = client,
                 start_image_path = start_frame,
                 tail_image_path = tail_frame,
                 scene_description = current_scene,
                 next_scene_description = next_scene,
                 scene_index = i,
-                total_scenes = len(scene_descriptions),
+                total_scenes = num_scenes,
                 business_info = business_info,
                 previous_prompt = previous_prompt,
                 is_ending = is_ending,
-                all_scenes = scene_descriptions
+                all_scenes = scene_descriptions,
+                character_analysis = character_analysis,
+                style_guide = style_guide
             )
 
             prompt = result["prompt"]
 
             # 최적화
-            prompt = optimize_prompt_for_seedance(client, prompt)
+            prompt = optimize_prompt_for_seedance(prompt)
 
             
-            # 대체 버전 생성 (옵션)
-            alternatives = []
-            alternatives = generate_alternative_versions(client, prompt, 1)
+            # 대체 버전 생성 (옵션) - 다음 씬 진행을 막지 않도록 백그라운드 실행
+            alternative_futures.append(executor.submit(generate_alternative_versions, prompt, 1))
             
             # 결과 저장
             final_result = {
@@ -97,7 +117,7 @@ def seedance_prompt_generation(state: ShortsState) -> ShortsState:
                 "start_frame": start_frame,
                 "tail_frame": tail_frame,
                 "main_prompt": prompt,
-                "alternative_prompts": alternatives,
+                "alternative_prompts": [],
                 "metadata": result["metadata"],
                 "character_analysis": result.get("character_analysis"),
                 "transition_to_next": next_scene is not None,
@@ -113,6 +133,10 @@ def seedance_prompt_generation(state: ShortsState) -> ShortsState:
             if next_scene:
                 print(f"다음 씬으로 연결 준비")
 
+        # 대체 버전 수집
+        for final_result, future in zip(state.seedance_results, alternative_futures):
+            final_result["alternative_prompts"] = future.result()
+
 
         # validation
         print("\n시퀀스 연속성 검증...")
@@ -130,13 +154,15 @@ def seedance_prompt_generation(state: ShortsState) -> ShortsState:
     except Exception as e:
        raise Exception(f"Seedance 프롬프트 생성 실패: {str(e)}")
 
+    finally:
+        executor.shutdown(wait = False, cancel_futures = True)
+
 
 
 
 # ================= Helper Functions =================
 
-def generate_seedance_prompt(client: anthropic.Anthropic,
-                             start_image_path: Optional[str] = None,
+def generate_seedance_prompt(start_image_path: Optional[str] = None,
                              tail_image_path: Optional[str] = None,
                              scene_description: Optional[str] = None,
                              next_scene_description: Optional[str] = None,
@@ -145,11 +171,14 @@ def generate_seedance_prompt(client: anthropic.Anthropic,
                              business_info: Optional[Dict[str, Any]] = None,
                              previous_prompt: Optional[str] = None,
                              is_ending: bool = False,
-                             all_scenes: Optional[List[str]] = None) -> Dict[str, Any]:
+                             all_scenes: Optional[List[str]] = None,
+                             character_analysis: Optional[Dict[str, Any]] = None,
+                             style_guide: Optional[str] = None) -> Dict[str, Any]:
         
-    """Seedance 텍스트 프롬프트 생성"""    
+    """Seedance 텍스트 프롬프트 생성 (character_analysis, style_guide가 주어지면 재사용)"""    
     if not is_ending and tail_image_path:
-        character_analysis = analyze_character_difference(client, start_image_path, tail_image_path)
+        if character_analysis is None:
+            character_analysis = analyze_character_difference(start_image_path, tail_image_path)
 
         transition_strategy = determine_transition_strategy(character_analysis)
 
@@ -169,7 +198,8 @@ def generate_seedance_prompt(client: anthropic.Anthropic,
         }
 
     # 비즈니스 정보 분석 (스타일 가이드 생성)
-    style_guide = analyze_business_context(client, business_info) if business_info else ""
+    if style_guide is None:
+        style_guide = analyze_business_context(business_info) if business_info else ""
 
      # 이전 프롬프트 분석
     continuity_hint = analyze_previous_prompt(previous_prompt) if previous_prompt else ""
@@ -390,16 +420,15 @@ def generate_seedance_prompt(client: anthropic.Anthropic,
     
     
     try:
-        response = client.messages.create(
+        seedance_prompt = claude_message(
             model = "claude-sonnet-4-20250514",
             max_tokens = 500,
             temperature = 0.2,
             system = system_prompt,
-            messages = messages_content
+            messages = messages_content,
+            cache_ttl = LLM_CACHE_TTL
         )
 
-        
-        seedance_prompt = response.content[0].text.strip()
 
         # 프롬프트 검증 및 최적화
         if is_ending:
@@ -432,8 +461,7 @@ def generate_seedance_prompt(client: anthropic.Anthropic,
 
 
 
-def analyze_business_context(client: anthropic.Anthropic,
-                             business_info: Dict[str, Any]) -> str:
+def analyze_business_context(business_info: Dict[str, Any]) -> str:
     """비즈니스 정보 분석 및 스타일 가이드라인 생성"""
     
     if not business_info:
@@ -497,7 +525,7 @@ def analyze_business_context(client: anthropic.Anthropic,
     """
 
     try:
-        response = client.messages.create(
+        style_directive = claude_message(
             model = "claude-sonnet-4-20250514",
             max_tokens = 200,
             temperature = 0.4,
@@ -507,10 +535,11 @@ def analyze_business_context(client: anthropic.Anthropic,
                     "role": "user",
                     "content": user_prompt
                 }
-            ]
+            ],
+            cache_ttl = LLM_CACHE_TTL
         )
 
-        return f"\nVISUAL STYLE DIRECTIVE: {response.content[0].text.strip()}\n"
+        return f"\nVISUAL STYLE DIRECTIVE: {style_directive}\n"
 
     except Exception as e:
         print(f"스타일 가이드 생성 실패: {str(e)}")
@@ -519,8 +548,7 @@ def analyze_business_context(client: anthropic.Anthropic,
 
 
 
-def analyze_character_difference(client: anthropic.Anthropic,
-                                 start_path: str,
+def analyze_character_difference(start_path: str,
                                  tail_path: str) -> Dict[str, Any]:
 
     """이미지 내 등장인물 분석"""
@@ -546,7 +574,7 @@ def analyze_character_difference(client: anthropic.Anthropic,
     """
     
     try:
-        response = client.messages.create(
+        response_text = claude_message(
             model = "claude-sonnet-4-20250514",
             max_tokens = 300,
             messages = [
@@ -581,11 +609,11 @@ def analyze_character_difference(client: anthropic.Anthropic,
                         }
                     ]
                 }
-            ]
+            ],
+            cache_ttl = LLM_CACHE_TTL
         )
     
         # JSON Parsing
-        response_text = response.content[0].text
         json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
         
         if json_match:
@@ -763,8 +791,7 @@ def enhance_transition_for_character_change(prompt: str,
 
 
 
-def generate_alternative_versions(client: anthropic.Anthropic,
-                                  base_prompt: str,
+def generate_alternative_versions(base_prompt: str,
                                   variation_count: int = 1) -> List[str]:
     """기본 프롬프트 대체 버전 생성"""
 
@@ -793,7 +820,8 @@ def generate_alternative_versions(client: anthropic.Anthropic,
     """
 
     try:
-        response = client.messages.create(
+        # 변형 생성이 목적이므로 캐시 사용 안 함
+        response_text = claude_message(
             model = "claude-sonnet-4-20250514",
             max_tokens = 500,
             temperature = 0.8,
@@ -809,7 +837,7 @@ def generate_alternative_versions(client: anthropic.Anthropic,
         # 각 라인을 개별 프롬프트로 분리
         variations = [
             line.strip()
-            for line in response.content[0].text.strip().split('\n')
+            for line in response_text.split('\n')
             if line.strip() and line.strip().startswith("Multiple shots")
         ]
 
@@ -822,7 +850,7 @@ def generate_alternative_versions(client: anthropic.Anthropic,
 
 
 
-def optimize_prompt_for_seedance(client: anthropic.Anthropic, prompt: str) -> str:
+def optimize_prompt_for_seedance(prompt: str) -> str:
     """Seedance 프롬프트 최적화"""
 
     system_prompt = """
@@ -910,7 +938,7 @@ def optimize_prompt_for_seedance(client: anthropic.Anthropic, prompt: str) -> st
     """
 
     try:
-        response = client.messages.create(
+        return claude_message(
             model = "claude-sonnet-4-20250514",
             max_tokens = 500,
             temperature = 0.4,
@@ -920,11 +948,10 @@ def optimize_prompt_for_seedance(client: anthropic.Anthropic, prompt: str) -> st
                     "role": "user",
                     "content": user_prompt
                 }
-            ]
+            ],
+            cache_ttl = LLM_CACHE_TTL
         )
 
-        return response.content[0].text.strip()
-
     except Exception as e:
         print(f"최적화 실패: {str(e)}")
         return prompt
@@ -7,15 +7,19 @@ import copy
 from enum import Enum
 from typing import Dict, List, Optional, Tuple, Any
 import numpy as np
-import anthropic
+from utils.llm_gateway import claude_message
+
+# 같은 템플릿/분석 결과의 프롬프트 재사용
+LLM_CACHE_TTL = 60 * 60 * 24
 
 
 def generate_suno_music_prompt(state: ShortsState) -> ShortsState:
-    if not state.video_analysis:
+    # 실제 영상 분석이 없으면 (음악 선행 생성) 예상 분석 사용
+    analysis = state.video_analysis or state.provisional_analysis
+
+    if not analysis:
         print("비디오 분석 결과를 확인할 수 없음\n")
         return state
-    
-    client = anthropic.Anthropic(api_key = settings.claude_api_key)
 
     context = {
         'industry': state.business_type.lower(),
@@ -25,24 +29,24 @@ def generate_suno_music_prompt(state: ShortsState) -> ShortsState:
     }
 
     # 템플릿 선택
-    template = select_and_adjust_template(context['industry'], state.video_analysis)
+    template = select_and_adjust_template(context['industry'], analysis)
 
 
     # 특징 추출 (기존 템플릿 정보와 병합)
-    advanced_features = extract_advanced_features(state.video_analysis)
+    advanced_features = extract_advanced_features(analysis)
     template = merge_advanced_features(template, advanced_features)
 
 
     print("Suno 음악 생성 프롬프트 생성 시작")
     print("=" * 60)
 
-    suno_data = generate_prompt(client, template, state.video_analysis, context)
+    suno_data = generate_prompt(template, analysis, context)
 
     optimized_data = optimize_for_suno(suno_data, template)
 
     validation = validate_suno_prompt(optimized_data)
 
-    metadata = generate_metadata(template, state.video_analysis, validation, context['industry'])
+    metadata = generate_metadata(template, analysis, validation, context['industry'])
 
     alternatives = generate_alternatives(optimized_data, template)
 
@@ -273,8 +277,7 @@ def merge_advanced_features(template: Dict[str, Any],
 
 
 
-def generate_prompt(client: anthropic.Anthropic,
-                    template: Dict[str, Any],
+def generate_prompt(template: Dict[str, Any],
                     analysis: Dict[str, Any],
                     context: Dict[str, Any]) -> Dict[str, Any]:
     """Suno 프롬프트 생성"""
@@ -339,7 +342,7 @@ def generate_prompt(client: anthropic.Anthropic,
     """
 
     try:
-        response = client.messages.create(
+        response_text = claude_message(
             model = "claude-sonnet-4-20250514",
             max_tokens = 500,
             temperature = 0.3,
@@ -349,11 +352,10 @@ def generate_prompt(client: anthropic.Anthropic,
                     "role": "user",
                     "content": user_prompt
                 }
-            ]
+            ],
+            cache_ttl = LLM_CACHE_TTL
         )
 
-        response_text = response.content[0].text.strip()
-
         # JSON 추출
         if "```json" in response_text:
             json_start = response_text.find("{")
@@ -1,11 +1,8 @@
 # nodes/veo_prompt_generator.py
-from openai import OpenAI
 from states.shorts_state import ShortsState
-from config.settings import settings
+from utils.llm_gateway import openai_chat
 
 
-client = OpenAI(api_key=settings.openai_api_key)
-
 # - system 프롬프트
 veo_system_prompt = """
 You are a viral marketing expert who crafts cinematic and dynamic video prompts for Veo3.
@@ -49,7 +46,8 @@ def generate_all_veo_prompts(state: ShortsState) -> ShortsState:
 
         veo_user_prompt = build_veo_prompt(scene, summary)
 
-        response = client.chat.completions.create(
+        # 창의적 생성(높은 temperature)이므로 캐시 사용 안 함
+        prompt_text = openai_chat(
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": veo_system_prompt},
@@ -59,7 +57,6 @@ def generate_all_veo_prompts(state: ShortsState) -> ShortsState:
             max_tokens=100
         )
 
-        prompt_text = response.choices[0].message.content.strip()
         veo_prompts.append({
             "scene_id": scene_id,
             "prompt": prompt_text
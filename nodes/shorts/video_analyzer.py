@@ -11,6 +11,9 @@ from scipy import signal
 from scipy.signal import find_peaks
 from scipy.ndimage import gaussian_filter1d
 
+# 프레임 분석 최소 가로 해상도 (통계는 평균값이라 축소본으로 충분)
+ANALYSIS_WIDTH = 320
+
 
 def analyze_final_video(state: ShortsState) -> ShortsState:
     """영상 분석 (오디오 생성에 사용)"""
@@ -29,39 +32,8 @@ def analyze_final_video(state: ShortsState) -> ShortsState:
     # 프레임 샘플링
     sample_strategy = determine_sampling_strategy(video_info)
 
-    # 분석 수행
-    cap = cv2.VideoCapture(state.final_video_path)
-
-    # 분석 데이터 컨테이너
-    analysis_data = {
-        'brightness': [],
-        'color_temps': [],
-        'motion': [],
-        'hue_values': [],
-        'saturation': [],
-        'energy_timeline': []
-    }
-
-    prev_frame = None
-    frame_count = 0
-    samples_taken = 0
-
-    while cap.isOpened() and samples_taken < sample_strategy['max_samples']:
-        ret, frame = cap.read()
-        if not ret:
-            break
-
-        # 샘플링 여부 결정
-        if frame_count % sample_strategy['interval'] == 0:
-            analysis_data = analyze_frame(frame, prev_frame, analysis_data,frame_count, video_info['fps'])
-            prev_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-
-            samples_taken += 1
-
-        frame_count += 1
-
-    
-    cap.release()
+    # 분석 수행 (샘플 프레임만 retrieve → 축소본에서 분석)
+    analysis_data = sample_video_frames(state.final_video_path, sample_strategy)
 
     # 분석 결과 후처리
     result = process_analysis_results(analysis_data, video_info)
@@ -125,60 +97,96 @@ def determine_sampling_strategy(video_info: dict) -> dict:
 
 
 
+def sample_video_frames(video_path: str,
+                        sample_strategy: dict,
+                        analysis_width: int = ANALYSIS_WIDTH) -> Dict[str, np.ndarray]:
+    """샘플 프레임 추출 및 분석 (미사용 프레임은 grab()으로 건너뜀)"""
+
+    max_samples = sample_strategy['max_samples']
+    interval = sample_strategy['interval']
+
+    # 분석 데이터 컨테이너 (샘플 수만큼 미리 할당된 컬럼)
+    analysis_data = {
+        name: np.full(max_samples, np.nan, dtype = np.float64)
+        for name in ('brightness', 'color_temps', 'motion', 'hue_values', 'saturation')
+    }
+
+    cap = cv2.VideoCapture(video_path)
+
+    prev_gray = None
+    frame_count = 0
+    samples_taken = 0
+
+    while cap.isOpened() and samples_taken < max_samples:
+        # 샘플링 대상이 아니면 색변환/복사 없이 건너뜀
+        if frame_count % interval != 0:
+            if not cap.grab():
+                break
+
+            frame_count += 1
+            continue
+
+        ret, frame = cap.read()
+        if not ret:
+            break
+
+        small = downscale_frame(frame, analysis_width)
+        prev_gray = analyze_frame(small, prev_gray, analysis_data, samples_taken)
+
+        samples_taken += 1
+        frame_count += 1
+
+    cap.release()
+
+    # 실제 샘플 수만큼 잘라서 반환
+    return {name: column[:samples_taken] for name, column in analysis_data.items()}
+
+
+
+def downscale_frame(frame: np.ndarray, analysis_width: int) -> np.ndarray:
+    """분석용 축소 프레임 (정수 배율 축소, 통계/모션 용도라 INTER_LINEAR로 충분)"""
+    height, width = frame.shape[:2]
+    factor = width // analysis_width
+
+    if factor <= 1:
+        return frame
+
+    return cv2.resize(frame, (width // factor, height // factor), interpolation = cv2.INTER_LINEAR)
+
+
+
 def analyze_frame(frame: np.ndarray, 
-                  prev_frame: Optional[np.ndarray],
-                  analysis_data: dict, 
-                  frame_num: int, 
-                  fps: float) -> dict:
-    """단일 프레임 분석"""
-
-    # 색공간 변환
-    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+                  prev_gray: Optional[np.ndarray],
+                  analysis_data: Dict[str, np.ndarray],
+                  index: int) -> np.ndarray:
+    """단일 프레임 분석 (결과는 index 위치에 기록, 모션 비교용 GRAY 반환)"""
+
+    # 색공간 변환 (축소 프레임 기준, 채널 평균은 BGR에서 직접 계산)
+    b_mean, _, r_mean, _ = cv2.mean(frame)
+    hsv_mean = cv2.mean(cv2.cvtColor(frame, cv2.COLOR_BGR2HSV))
+    lab_mean = cv2.mean(cv2.cvtColor(frame, cv2.COLOR_BGR2LAB))
     gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    lab = cv2.cvtColor(frame, cv2.COLOR_BGR2LAB)
 
     # 1. 밝기 분석 (LAB 색공간 사용)
-    brightness = np.mean(lab[:, :, 0]) / 255.0
-    analysis_data['brightness'].append(brightness)
+    analysis_data['brightness'][index] = lab_mean[0] / 255.0
 
-    
     # 2. 색온도 분석
-    color_temp = calculate_color_temperature(rgb)
-    analysis_data['color_temps'].append(color_temp)
+    analysis_data['color_temps'][index] = calculate_color_temperature(r_mean, b_mean)
 
-    
     # 3. HSV 분석
-    hue_mean = np.mean(hsv[:, :, 0])
-    saturation_mean = np.mean(hsv[:, :, 1]) / 255.0
-    analysis_data['hue_values'].append(hue_mean)
-    analysis_data['saturation'].append(saturation_mean)
-
-    
-    # 4. 모션 분석
-    if prev_frame is not None:
-        motion = calculate_motion_intensity(gray, prev_frame)
-        analysis_data['motion'].append(motion)
+    analysis_data['hue_values'][index] = hsv_mean[0]
+    analysis_data['saturation'][index] = hsv_mean[1] / 255.0
 
-        # 에너지 분석
-        energy = motion * saturation_mean * brightness
-        analysis_data['energy_timeline'].append({
-            'time': frame_num / fps,
-            'energy': energy,
-            'motion': motion
-        })
+    # 4. 모션 분석 (첫 샘플은 비교 대상 없음 → NaN 유지)
+    if prev_gray is not None:
+        analysis_data['motion'][index] = calculate_motion_intensity(gray, prev_gray)
 
-    return analysis_data
+    return gray
 
 
 
-def calculate_color_temperature(rgb_frame: np.ndarray) -> float:
-    """색온도 계산"""
-    
-    # 평균 RGB 값
-    r_mean = np.mean(rgb_frame[:, :, 0])
-    # g_mean = np.mean(rgb_frame[:, :, 1])
-    b_mean = np.mean(rgb_frame[:, :, 2])
+def calculate_color_temperature(r_mean: float, b_mean: float) -> float:
+    """색온도 계산 (평균 R/B 값 기반)"""
 
     # 색온도 추정 (McCamy's formula 근사)
     if b_mean > 0:
@@ -279,7 +287,7 @@ def extract_color_palette(hue_values: List[float],
                           saturation_values: List[float]) -> List[str]:
     """색상 팔레트 추출"""
     
-    if not hue_values:
+    if len(hue_values) == 0:
         return ['neutral']
 
     # HSV Hue를 색상 카테고리로 변환
@@ -329,26 +337,32 @@ def process_analysis_results(analysis_data: dict,
                              video_info: dict) -> dict:
     """분석 결과 처리 및 통합"""
 
+    brightness = analysis_data['brightness']
+    saturation = analysis_data['saturation']
+
+    # 모션은 두 번째 샘플부터 존재
+    has_motion = ~np.isnan(analysis_data['motion'])
+    motion_data = analysis_data['motion'][has_motion]
+
     # 밝기
-    avg_brightness = np.mean(analysis_data['brightness']) if analysis_data['brightness'] else 0.5
-    brightness_variance = np.var(analysis_data['brightness']) if analysis_data['brightness'] else 0.1
+    avg_brightness = np.mean(brightness) if brightness.size else 0.5
+    brightness_variance = np.var(brightness) if brightness.size else 0.1
 
     # 색온도
     color_temps = analysis_data['color_temps']
-    avg_color_temp = np.mean(color_temps) if color_temps else 5000
+    avg_color_temp = np.mean(color_temps) if color_temps.size else 5000
 
     # 모션
-    motion_data = analysis_data['motion']
-    avg_motion = np.mean(motion_data) if motion_data else 0.1
+    avg_motion = np.mean(motion_data) if motion_data.size else 0.1
 
     # 리듬 패턴
     rhythm_pattern = analyze_rhythm_advanced(motion_data, video_info['fps'])
 
     # 색상 팔레트
-    color_palette = extract_color_palette(analysis_data['hue_values'], analysis_data['saturation'])
+    color_palette = extract_color_palette(analysis_data['hue_values'], saturation)
 
-    # 에너지 커브
-    energy_curve = [e['energy'] for e in analysis_data['energy_timeline']]
+    # 에너지 커브 (모션 × 채도 × 밝기)
+    energy_curve = motion_data * saturation[has_motion] * brightness[has_motion]
 
     # 모션 피크
     motion_peaks = find_motion_peaks(motion_data, video_info['fps'])
@@ -360,7 +374,7 @@ def process_analysis_results(analysis_data: dict,
     dominant_moods = extract_mood(avg_brightness, avg_color_temp, avg_motion, color_palette)
 
     # 장면 전환 감지
-    scene_transitions = detect_scene_changes(motion_data, analysis_data['brightness'], video_info['fps'])
+    scene_transitions = detect_scene_changes(motion_data, brightness, video_info['fps'])
 
     
     result = {
@@ -2,22 +2,31 @@ from config.settings import settings
 from states.shorts_state import ShortsState
 import os
 import re
+import shutil
+import asyncio
 import json
-import requests
 import random
 import time
 from datetime import datetime
-import shutil
 from typing import List, Dict, Optional, Any
 from moviepy.editor import VideoFileClip, VideoClip
 import replicate
+from utils.rate_limiter import TokenBucket
+from utils.replicate_utils import run_predictions
+from utils.video_compositor import compose_video_sequence, FADE_FUNCTIONS
+from utils.download_utils import download_files
+from utils.ffmpeg_utils import probe_video
+from utils.frame_ops import FrameBlender, build_alpha_lut, lookup_alpha, resize_clip
+from utils.artifact_store import artifact_key, get_artifact_store, session_seed
+from utils.workspace import get_workspace
+from utils.metrics import track_encode
 
 
 def generate_video_series(state: ShortsState) -> ShortsState:
-    client_video = replicate.Client(api_token = settings.replicate_api_key)
+    client_video = replicate.Client(api_token = settings.replicate_api_key, base_url = settings.replicate_base_url)
 
-    os.makedirs("./temp", exist_ok = True)
-    os.makedirs(state.output_dir, exist_ok = True)
+    # 작업 공간은 실행 중인 워커 설정 기준으로 session_id에서 계산
+    output_dir = get_workspace(state.session_id).scratch_dir("videos")
 
     if not state.seedance_results:
         print("Seedance 프롬프트 없음")
@@ -26,13 +35,16 @@ def generate_video_series(state: ShortsState) -> ShortsState:
     
     state.video_urls = []
     state.video_files = []
-    base_seed = int(time.time())
+    # 같은 세션 재시도 시 같은 seed → 캐시된 세그먼트 재사용
+    base_seed = session_seed(state.session_id, "seedance") or int(time.time())
 
     print("Seedance 비디오 생성 시작")
     print("=" * 60)
 
     num_segments = len(state.seedance_results)
 
+    # 각 세그먼트는 시작/끝 프레임만 필요 → 모든 세그먼트 입력을 미리 구성
+    segment_inputs = []
     for i in range(num_segments):
         prompt = state.seedance_results[i]["main_prompt"]
         start_image = state.scenes_image_list[i]
@@ -41,36 +53,93 @@ def generate_video_series(state: ShortsState) -> ShortsState:
         if i < num_segments - 1:
             last_image = state.scenes_image_list[i + 1]
 
-        
-        video_url = generate_video_segment(
-            client_video = client_video,
+        segment_inputs.append(build_video_segment_input(
             prompt = prompt,
             start_image_path = start_image,
             last_image_path = last_image,
             seed = base_seed + (i * 1000)
-        )
+        ))
+
+    # 캐시된 세그먼트는 제출하지 않고 파일만 복사
+    store = get_artifact_store()
+    cache_keys = [segment_cache_key(segment_input) for segment_input in segment_inputs] if store else [None] * num_segments
+    cached_segments = [store.get(key) for key in cache_keys] if store else [None] * num_segments
+    pending = [i for i in range(num_segments) if cached_segments[i] is None]
+
+    # 나머지 세그먼트 동시 제출 (토큰 버킷으로 호출 속도 제한) 후 하나의 폴러로 대기
+    limiter = TokenBucket(rate = settings.replicate_submit_rate, capacity = settings.replicate_submit_burst)
+    pending_predictions = asyncio.run(run_predictions(
+        client_video,
+        SEEDANCE_MODEL,
+        [segment_inputs[i] for i in pending],
+        limiter = limiter,
+        poll_interval = settings.replicate_poll_interval,
+        timeout = settings.seedance_timeout_seconds,
+        # 세그먼트가 하나라도 없으면 영상을 만들 수 없으므로 실패 시 나머지 바로 취소
+        cancel_on_failure = True
+    )) if pending else []
+
+    predictions = dict(zip(pending, pending_predictions))
+
+    downloads = []
+    segment_files = {}
+    errors = []
+    for i in range(num_segments):
+        filepath = os.path.join(output_dir, f"scene_{i+1}.mp4")
+
+        if cached_segments[i] is not None:
+            print(f"Scene {i+1} 캐시 사용: {cached_segments[i].key[:12]}\n")
+            state.video_urls.append(cached_segments[i].url or cached_segments[i].path)
+
+            shutil.copyfile(cached_segments[i].path, filepath)
+            segment_files[i] = filepath
+            continue
+
+        prediction = predictions[i]
+
+        # 실패는 모아 두고 성공한 세그먼트는 먼저 받아서 캐시 (재시도 시 실패한 세그먼트만 다시 생성)
+        if isinstance(prediction, Exception):
+            errors.append(f"영상 생성 오류 (Scene {i+1}): {prediction}")
+            continue
+
+        if prediction.status != "succeeded":
+            errors.append(f"영상 생성 오류 (Scene {i+1}): {prediction.status} - {prediction.error}")
+            continue
+
+        video_url = safe_get_url(prediction.output)
 
-        
         if video_url:
             print(f"Scene {i+1} URL: {video_url}\n")
             state.video_urls.append(video_url)
 
-            filename = f"scene_{i+1}.mp4"
-            filepath = os.path.join(state.output_dir, filename)
+            downloads.append((i, video_url, filepath))
 
-            if download_video(safe_get_url(video_url), filepath):
-                state.video_files.append(filepath)
+    # 세그먼트 동시 다운로드 (공용 커넥션 풀, 이어받기, 영상 메타데이터 검증)
+    results = download_files([(url, path) for _, url, path in downloads], validate = probe_video)
 
-            # Replicate API 호출 과부화 방지
-            time.sleep(2)
+    for (i, video_url, filepath), result in zip(downloads, results):
+        if isinstance(result, Exception):
+            print(f"영상 다운로드 실패: {result}")
+            continue
+
+        print(f"영상 다운로드 완료: {filepath}")
+        segment_files[i] = filepath
+
+        if store:
+            store.put_file(cache_keys[i], filepath, {"model": SEEDANCE_MODEL, "segment_index": i})
+
+    if errors:
+        raise Exception("; ".join(errors))
+
+    # 장면 순서 유지
+    state.video_files = [segment_files[i] for i in sorted(segment_files)]
 
-    
     state.final_video_path = process_video_sequence(
         video_paths = state.video_files,
-        fade_duration = 0.8,
-        last_fadeout_duration = 2.5,
-        fade_type = 'ease_in_out',
-        output_path = "complete_video_no_audio.mp4"
+        fade_duration = CROSSFADE_DURATION,
+        last_fadeout_duration = LAST_FADEOUT_DURATION,
+        fade_type = FADE_TYPE,
+        output_path = get_workspace(state.session_id).scratch_path("complete_video_no_audio.mp4")
     )
 
     return state
@@ -78,53 +147,50 @@ def generate_video_series(state: ShortsState) -> ShortsState:
 
 # ============= Helper Functions (Video Generation) =============
 
-def generate_video_segment(client_video, 
-                           prompt: str,
-                           start_image_path: str,
-                           last_image_path: str,
-                           seed: Optional[int] = None) -> Optional[str]:
-    if(last_image_path != ""):
-        try:
-            # Seedance-1-lite 모델
-            output = client_video.run(
-                "bytedance/seedance-1-lite",
-                input = {
-                    "prompt": prompt.strip(),
-                    "image": start_image_path,
-                    "last_frame_image": last_image_path,
-                    "duration": 5,
-                    "resolution": "1080p",
-                    "aspect_ratio": "9:16",
-                    "fps": 24,
-                    "seed": seed if seed else int(time.time())
-                }
-            )
+SEEDANCE_MODEL = "bytedance/seedance-1-lite"
+
+# 세그먼트/합성 타이밍 (음악 선행 생성 시 예상 영상 길이 계산에도 사용)
+SEGMENT_DURATION = 5
+SEGMENT_FPS = 24
+CROSSFADE_DURATION = 0.8
+LAST_FADEOUT_DURATION = 2.5
+FADE_TYPE = 'ease_in_out'
+
+
+def build_video_segment_input(prompt: str,
+                              start_image_path: str,
+                              last_image_path: str,
+                              seed: Optional[int] = None) -> Dict[str, Any]:
+    """Seedance-1-lite 세그먼트 입력 구성"""
+    input = {
+        "prompt": prompt.strip(),
+        "image": start_image_path,
+        "duration": SEGMENT_DURATION,
+        "resolution": "1080p",
+        "aspect_ratio": "9:16",
+        "fps": SEGMENT_FPS,
+        "seed": seed if seed else int(time.time())
+    }
 
-            return safe_get_url(output)
+    if last_image_path != "":
+        input["last_frame_image"] = last_image_path
+
+    return input
 
-        except Exception as e:
-            raise Exception(f"영상 생성 오류: {e}")
 
-    else:
-        try:
-            # Seedance-1-lite 모델
-            output = client_video.run(
-                "bytedance/seedance-1-lite",
-                input = {
-                    "prompt": prompt.strip(),
-                    "image": start_image_path,
-                    "duration": 5,
-                    "resolution": "1080p",
-                    "aspect_ratio": "9:16",
-                    "fps": 24,
-                    "seed": seed if seed else int(time.time())
-                }
-            )
-            
-            return safe_get_url(output)
 
-        except Exception as e:
-            raise Exception(f"영상 생성 오류: {e}")
+def segment_cache_key(segment_input: Dict[str, Any]) -> str:
+    """세그먼트 입력(프롬프트, 시작/끝 이미지 내용, seed, 파라미터) 기반 캐시 키"""
+    images = [segment_input.get("image"), segment_input.get("last_frame_image")]
+    params = {k: v for k, v in segment_input.items() if k not in ("prompt", "seed", "image", "last_frame_image")}
+
+    return artifact_key(
+        SEEDANCE_MODEL,
+        segment_input["prompt"],
+        seed = segment_input.get("seed"),
+        input_images = [image for image in images if image],
+        params = params
+    )
 
 
 
@@ -150,155 +216,99 @@ def safe_get_url(output):
 
 
 
-def download_video(url: str, filename: str, retries: int = 5, delay: int = 5) -> bool:
-    """비디오 다운로드 (재시도 포함)"""
-    for attempt in range(1, retries + 1):
-        try:
-            response = requests.get(url, stream=True, timeout=30)
-            response.raise_for_status()
-            
-            with open(filename, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-            print(f"영상 다운로드 완료: {filename}")
-            return True
-        except Exception as e:
-            print(f"[시도 {attempt}/{retries}] 다운로드 오류: {e}")
-            if attempt < retries:
-                time.sleep(delay)
-            else:
-                return False
-
-
-
-
 # ============= Helper Functions (Video Edition) =============
 
 def process_video_sequence(video_paths: List[str],
                            fade_duration: float = 0.7,
                            last_fadeout_duration: float = 2.0,
                            fade_type: str = 'ease_in_out',
-                           output_path: str = "complete_video_no_audio.mp4",
-                           temp_dir: str = "temp_processing") -> str:
-    """영상 시퀀스 처리"""
-
-    fade_functions = {
-        'ease_in_out': lambda t: 3*t**2 - 2*t**3,
-        'ease_in': lambda t: t**2,
-        'ease_out': lambda t: 1 - (1-t)**2,
-        'linear': lambda t: t
-    }
-
-    os.makedirs(temp_dir, exist_ok = True)
+                           output_path: str = "complete_video_no_audio.mp4") -> str:
+    """영상 시퀀스 처리 (크로스페이드 + 페이드아웃을 단일 패스로 인코딩)"""
 
     try:
-        # 1단계: 모든 영상 해상도 확인
-        resolutions = []
-        for i, path in enumerate(video_paths):
-            if not os.path.exists(path):
-                raise FileNotFoundError(f"영상 파일을 찾을 수 없습니다: {path}")
-
-            clip = VideoFileClip(path)
-            resolutions.append(clip.size)
+        return compose_video_sequence(
+            video_paths = video_paths,
+            output_path = output_path,
+            fade_duration = fade_duration,
+            last_fadeout_duration = last_fadeout_duration,
+            fade_type = fade_type
+        )
 
-            print(f"파일 확인 ({i+1}/{len(video_paths)}): {os.path.basename(path)} - {clip.size}")
+    except FileNotFoundError:
+        raise
 
-            clip.close()
+    except Exception as e:
+        print(f"ffmpeg 합성 실패, moviepy 단일 패스 합성으로 대체: {e}")
 
-        # 2단계: 목표 해상도 지정 (가장 작은 해상도 통일)
-        min_width = min(res[0] for res in resolutions)
-        min_height = min(res[1] for res in resolutions)
-        target_resolution = (min_width, min_height)
-
-        print(f"지정 해상도: {target_resolution}")
-
-        # 3단계: 첫 번째 클립 처리
-        current_output = os.path.join(temp_dir, "temp_0.mp4")
-        first_clip = VideoFileClip(video_paths[0]).resize(target_resolution)
-
-        first_clip.write_videofile(
-            current_output,
-            codec = 'libx264',
-            audio_codec = 'aac',
-            fps = 24,
-            bitrate = '12000k',
-            preset = 'medium',
-            verbose = False,
-            logger = None
+        return compose_video_sequence_moviepy(
+            video_paths = video_paths,
+            fade_duration = fade_duration,
+            last_fadeout_duration = last_fadeout_duration,
+            fade_type = fade_type,
+            output_path = output_path
         )
 
-        first_clip.close()
 
-        # 4단계: 순차적 크로스페이드 적용
-        for i in range(1, len(video_paths)):
-            prev_output = current_output
-            current_output = os.path.join(temp_dir, f"temp_{i}.mp4")
 
-            clip1 = VideoFileClip(prev_output)
-            clip2 = VideoFileClip(video_paths[i]).resize(target_resolution)
+def compose_video_sequence_moviepy(video_paths: List[str],
+                                   fade_duration: float,
+                                   last_fadeout_duration: float,
+                                   fade_type: str,
+                                   output_path: str) -> str:
+    """moviepy 합성 (클립을 지연 연결한 뒤 한 번만 인코딩)"""
+
+    fade_func = FADE_FUNCTIONS[fade_type]
+
+    clips = [VideoFileClip(path) for path in video_paths]
+
+    try:
+        # 목표 해상도 지정 (가장 작은 해상도 통일)
+        target_resolution = (min(clip.size[0] for clip in clips), min(clip.size[1] for clip in clips))
+        resized = [resize_clip(clip, target_resolution) for clip in clips]
+
+        # 크로스페이드 체인 (프레임은 인코딩 시점에 한 번만 계산)
+        result = resized[0]
+        for i in range(1, len(resized)):
+            result = apply_crossfade(result, resized[i], fade_duration, fade_func)
 
-            result = apply_crossfade(clip1, clip2, fade_duration, fade_functions[fade_type])
+        faded_clip = apply_fadeout(result, last_fadeout_duration, fade_func)
 
-            result.write_videofile(
-                current_output,
+        with track_encode("compose_moviepy"):
+            faded_clip.write_videofile(
+                output_path,
                 codec = 'libx264',
-                audio_codec = 'aac',
                 fps = 24,
                 bitrate = '12000k',
                 preset = 'medium',
+                audio = False,
                 verbose = False,
                 logger = None
             )
 
-            clip1.close()
-            clip2.close()
-
-            result.close()
-
-            if os.path.exists(prev_output):
-                os.remove(prev_output)
-
-            print(f"진행률: {i}/{len(video_paths)-1} 완료")
-
-        # 5단계: 페이드아웃 적용
-        final_clip = VideoFileClip(current_output)
-        faded_clip = apply_fadeout(final_clip, last_fadeout_duration, fade_functions[fade_type])
-
-        faded_clip.write_videofile(
-            output_path,
-            codec = 'libx264',
-            audio_codec = 'aac',
-            fps = 24,
-            bitrate = '12000k',
-            preset = 'medium',
-            verbose = False,
-            logger = None
-        )
-
-        final_clip.close()
         faded_clip.close()
 
         return output_path
 
     finally:
-        if os.path.exists(temp_dir):
-            shutil.rmtree(temp_dir)
-        
-        print("임시 파일 정리 완료")
+        for clip in clips:
+            clip.close()
 
 
 
 def apply_crossfade(clip1: VideoFileClip, clip2: VideoFileClip, fade_duration: float, fade_func) -> VideoClip:
     """클립들간 크로스페이드 적용"""
 
+    # 곡선은 LUT로 한 번만 계산, 블렌딩 버퍼는 프레임 간 재사용
+    alpha_lut = build_alpha_lut(fade_func)
+    blender = FrameBlender()
+
     def make_frame(t):
         if t < clip1.duration - fade_duration:
             return clip1.get_frame(t)
         
         elif t < clip1.duration:
             progress = (t - (clip1.duration - fade_duration)) / fade_duration
-            alpha = fade_func(progress)
+            weight = lookup_alpha(alpha_lut, progress)
 
             frame1 = clip1.get_frame(t)
             frame2 = clip2.get_frame(t - (clip1.duration - fade_duration))
@@ -313,7 +323,7 @@ def apply_crossfade(clip1: VideoFileClip, clip2: VideoFileClip, fade_duration: f
                 frame1 = frame1[:min_h, :min_w]
                 frame2 = frame2[:min_h, :min_w]
 
-            return (1 - alpha) * frame1 + alpha * frame2
+            return blender.crossfade(frame1, frame2, weight)
         
         else:
             return clip2.get_frame(t - (clip1.duration - fade_duration))
@@ -329,13 +339,15 @@ def apply_crossfade(clip1: VideoFileClip, clip2: VideoFileClip, fade_duration: f
 def apply_fadeout(clip: VideoClip, last_fadeout_duration: float, fade_func) -> VideoClip:
     """마지막 클립 페이드아웃 적용"""
 
+    alpha_lut = build_alpha_lut(fade_func)
+    blender = FrameBlender()
+
     def make_frame(t):
         frame = clip.get_frame(t)
 
         if t >= clip.duration - last_fadeout_duration:
             progress = (clip.duration - t) / last_fadeout_duration
-            alpha = fade_func(progress)
-            return frame * alpha
+            return blender.scale(frame, lookup_alpha(alpha_lut, progress))
 
         return frame
 
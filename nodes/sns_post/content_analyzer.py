@@ -1,13 +1,15 @@
 # nodes/sns_post/content_analyzer.py
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
-from config.settings import settings
 from states.sns_post_state import SNSPostState, ContentData
 import base64, os, json, re
 from urllib.parse import urlparse
+from utils.llm_gateway import chat_model_invoke
 
 IMAGE_EXTS = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
 
+# 같은 이미지/키워드 분석 결과 재사용
+LLM_CACHE_TTL = 60 * 60 * 24 * 7
+
 def _guess_image_mime(ext: str) -> str:
     ext = ext.lower()
     if ext in {'.jpg', '.jpeg'}: return 'image/jpeg'
@@ -62,8 +64,6 @@ def content_analyzer(state: SNSPostState) -> SNSPostState:
         "규칙: 마크다운 금지, 코드블록 금지, 백틱(`) 금지, 추가 필드 금지, 한국어로 작성."
     ))
 
-    llm = ChatOpenAI(temperature=0.3, model="gpt-4o-mini", streaming=False, api_key=settings.openai_api_key)
-
     # 1) HTTP(S) 이미지 URL
     if content_path and _is_http_url(content_path):
         print(f"🌐 HTTP URL 감지: {content_path}")
@@ -96,9 +96,9 @@ def content_analyzer(state: SNSPostState) -> SNSPostState:
             {"type": "image_url", "image_url": {"url": content_path}}
         ])
         try:
-            response = llm.invoke([system_msg, human_msg])
+            response_text = chat_model_invoke("gpt-4o-mini", 0.3, [system_msg, human_msg], cache_ttl=LLM_CACHE_TTL)
 
-            data = _extract_json(response.content or "")
+            data = _extract_json(response_text)
             if not data:
                 raise ValueError("JSON 파싱 실패")
             content = ContentData(**data)
@@ -157,8 +157,8 @@ def content_analyzer(state: SNSPostState) -> SNSPostState:
     ])
 
     try:
-        response = llm.invoke([system_msg, human_msg])
-        data = _extract_json(response.content)
+        response_text = chat_model_invoke("gpt-4o-mini", 0.3, [system_msg, human_msg], cache_ttl=LLM_CACHE_TTL)
+        data = _extract_json(response_text)
         if not data:
             raise ValueError("JSON 파싱 실패")
         content = ContentData(**data)
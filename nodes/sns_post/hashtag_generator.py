@@ -1,13 +1,11 @@
 # nodes/sns_post/hashtag_generator.py
 import re, json
 from typing import List
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import SystemMessage, HumanMessage
 from states.sns_post_state import SNSPostState
-from config.settings import settings
 from utils.json_utils import to_json_str
-from langchain_core.output_parsers import StrOutputParser
+from utils.llm_gateway import chat_model_invoke
 
 def _normalize_hashtags(raw: List[str]) -> List[str]:
     norm = []
@@ -43,8 +41,6 @@ def hashtag_generator(state: SNSPostState) -> SNSPostState:
         print("⚠️ 생성된 게시글이 없습니다.")
         return state
 
-    llm = ChatOpenAI(temperature=0.7, model="gpt-4o-mini", streaming=False, api_key=settings.openai_api_key)
-
     hashtag_prompt = ChatPromptTemplate([
         ("system", """당신은 KPI 중심의 해시태그 최적화 전문가입니다.
         입력(게시글, 업종, 지역, 트렌드)을 바탕으로 플랫폼별 노출과 참여를 극대화하는 해시태그를 생성하세요.
@@ -96,8 +92,8 @@ def hashtag_generator(state: SNSPostState) -> SNSPostState:
     )
     
     try:
-        chain = llm | StrOutputParser()
-        response = chain.invoke(messages)
+        # 창의적 생성(높은 temperature)이므로 캐시 사용 안 함
+        response = chat_model_invoke("gpt-4o-mini", 0.7, messages)
         print("[결과]", response)
 
         # 쉼표로 구분된 해시태그를 파싱
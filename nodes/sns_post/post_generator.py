@@ -1,18 +1,14 @@
 # nodes/sns_post/post_generator.py
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import SystemMessage, HumanMessage
-from config.settings import settings
 from states.sns_post_state import SNSPostState, PostData
 import json
 from utils.json_utils import to_json_str
-from langchain_core.output_parsers import StrOutputParser
+from utils.llm_gateway import chat_model_invoke
 
 def post_generator(state: SNSPostState) -> SNSPostState:
     print("\n3️⃣ [POST_GENERATOR] 게시글 생성 시작")
     
-    llm = ChatOpenAI(temperature=0.5, model="gpt-4o-mini", streaming=False, api_key=settings.openai_api_key)
-
     post_prompt = ChatPromptTemplate([
         ("system", """당신은 KPI 중심의 전문 SNS 마케터입니다.
         주어진 입력 정보를 바탕으로 '해시태그 없는' 게시글 본문을 생성합니다.
@@ -54,8 +50,8 @@ def post_generator(state: SNSPostState) -> SNSPostState:
         }
     )
     try:
-        chain = llm | StrOutputParser()
-        response = chain.invoke(messages)
+        # 재요청 시 다른 게시글을 기대하므로 캐시 사용 안 함
+        response = chat_model_invoke("gpt-4o-mini", 0.5, messages)
 
         try:
             post = PostData(**json.loads(response))
@@ -1,21 +1,44 @@
 # nodes/sns_post/trend_analyzer.py
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import SystemMessage, HumanMessage
 from langchain_core.output_parsers import JsonOutputParser
 from datetime import datetime
-from config.settings import settings
+from typing import Optional
 from states.sns_post_state import SNSPostState, TrendData
 import json
-from utils.json_utils import to_json_str
-from langchain_core.output_parsers import StrOutputParser
+from utils.llm_gateway import chat_model_invoke
+from utils.trend_store import TrendStore
+
+# 플랫폼/업종/지역/날짜별 트렌드 (프로세스 내 공유, 만료 전 백그라운드 갱신)
+trend_store = TrendStore()
+
 
 def trend_analyzer(state: SNSPostState) -> SNSPostState:
-    """트렌드 분석"""
+    """트렌드 분석 (공통 트렌드는 트렌드 캐시에서 조회, 콘텐츠/사용자 키워드만 요청별로 반영)"""
     print("\n2️⃣ [TREND_ANALYZER] 트렌드 분석 시작")
-    
-    llm = ChatOpenAI(temperature=0.7, model="gpt-4o", streaming=False, api_key=settings.openai_api_key)
-    
+
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    key = (state.sns_platform, state.business_type, state.location, current_date)
+
+    try:
+        base_trend = trend_store.get(
+            key,
+            lambda: analyze_trend(state.sns_platform, state.business_type, state.location, current_date)
+        )
+        trend = personalize_trend(base_trend, state)
+        print("[결과]", trend)
+
+        return state.model_copy(update={"trend_analysis": trend})
+
+    except Exception as e:
+        print(f"❌ [TREND_ANALYZER] 오류: {e}")
+        return state
+
+
+def analyze_trend(sns_platform: str, business_type: str, location: Optional[str], current_date: str) -> TrendData:
+    """플랫폼/업종/지역/날짜 기준 공통 트렌드 분석 (GPT-4o 호출, 파싱 실패 시 예외 → 캐시하지 않음)"""
+    print(f"[TREND_ANALYZER] 트렌드 캐시 미스, 트렌드 분석 호출: {sns_platform}/{business_type}/{location}/{current_date}")
+
     trend_prompt = ChatPromptTemplate.from_messages([
         ("system", """당신은 SNS 트렌드 분석 전문가입니다.
         주어진 정보를 바탕으로 최신 SNS 트렌드를 분석하고 추천해주세요.
@@ -35,8 +58,6 @@ def trend_analyzer(state: SNSPostState) -> SNSPostState:
         - 마크다운 금지, 코드블록 금지, 백틱(`) 금지, 추가 필드 금지, 한국어로 작성.
         """),
         ("human", """분석 요청 정보:
-        - 게시할 콘텐츠: {content_summary}
-        - 사용자가 중요하게 생각하는 키워드: {user_keywords}
         - 업로드할 SNS 플랫폼: {sns_platform}
         - 업종: {business_type}
         - 매장 위치: {location}
@@ -45,27 +66,25 @@ def trend_analyzer(state: SNSPostState) -> SNSPostState:
     ])
     messages = trend_prompt.invoke(
         {
-            "content_summary" : to_json_str(state.content_summary),
-            "user_keywords" : state.user_keywords,
-            "sns_platform" : state.sns_platform,
-            "business_type" : state.business_type,
-            "location" : state.location,
-            "current_date" : datetime.now().strftime("%Y-%m-%d")
+            "sns_platform" : sns_platform,
+            "business_type" : business_type,
+            "location" : location,
+            "current_date" : current_date
         }
     )
-    
-    try:
-        chain = llm | StrOutputParser()
-        response = chain.invoke(messages)        
-        try:
-            trend = TrendData(**json.loads(response))
-            print("[결과]", trend)
 
-        except Exception:
-            print("⚠️ [TREND_ANALYZER] JSON 파싱 실패, 원문 보존")
-                
-        return state.model_copy(update={"trend_analysis": trend})
-        
+    response = chat_model_invoke("gpt-4o", 0.7, messages)
+    try:
+        return TrendData(**json.loads(response))
     except Exception as e:
-        print(f"❌ [TREND_ANALYZER] 오류: {e}")
-        return state
\ No newline at end of file
+        print("⚠️ [TREND_ANALYZER] JSON 파싱 실패")
+        raise ValueError(f"트렌드 응답 파싱 실패: {e}")
+
+
+def personalize_trend(trend: TrendData, state: SNSPostState) -> TrendData:
+    """공통 트렌드 키워드 앞에 사용자 키워드와 콘텐츠 키워드를 추가 (중복 제거, LLM 호출 없음)"""
+    content_keywords = state.content_summary.keywords if state.content_summary else []
+    keywords = list(dict.fromkeys([*state.user_keywords, *content_keywords, *trend.keywords]))
+
+    # 캐시된 공통 트렌드는 요청 간 공유되므로 복사본 반환
+    return trend.model_copy(update={"keywords": keywords})
@@ -4,30 +4,36 @@ from fastapi import APIRouter, HTTPException, Response
 from fastapi.responses import FileResponse, StreamingResponse, JSONResponse
 from pathlib import Path
 from typing import Optional, Dict
-from services.shorts_service import resume_agent_flow, run_agent_flow
-from schemas.shorts_schema import ScenarioRequest, ScenarioResponse, VideoRequest, VideoResponse
+from services.shorts_service import run_agent_flow
+from services.shorts_job_service import enqueue_video_job, get_video_job
+from schemas.shorts_schema import ScenarioRequest, ScenarioResponse, VideoRequest, VideoJobResponse, VideoJobStatusResponse
 
 router = APIRouter(prefix = "/api/shorts/agent", tags=["Shorts Agent"])
-video_sessions: Dict[str, dict] = {}
 
 @router.post("/scenarios", response_model = ScenarioResponse)
-async def invoke_agent(payload: ScenarioRequest):
+def invoke_agent(payload: ScenarioRequest):
     """
     LangGraph 마케팅 에이전트를 실행하여 시나리오 3개 생성 후 결과 반환
     """
     return run_agent_flow(payload)
 
 
-@router.post("/videos", response_model = VideoResponse)
+@router.post("/videos", response_model = VideoJobResponse, status_code = 202)
 async def resume_agent_after_select_scenario(payload: VideoRequest):
     """
-    시나리오 선택 후 LangGraph 마케팅 에이전트를 재개해서 장면/장면이미지 생성 후 결과 반환
+    시나리오 선택 후 영상 생성 작업을 큐에 등록하고 job id 반환 (실제 생성은 워커에서 수행)
     """
-    response = resume_agent_flow(payload)
-
-    if response.key:
-        video_sessions[payload.session_id] = {
-            "key": response.key
-        }
-    
-    return response
+    return enqueue_video_job(payload)
+
+
+@router.get("/videos/{job_id}", response_model = VideoJobStatusResponse)
+async def get_video_job_status(job_id: str):
+    """
+    영상 생성 작업 상태 조회 (queued / running / succeeded / failed)
+    """
+    job = get_video_job(job_id)
+
+    if job is None:
+        raise HTTPException(status_code = 404, detail = f"작업을 찾을 수 없습니다: {job_id}")
+
+    return job
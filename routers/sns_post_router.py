@@ -6,10 +6,7 @@ from schemas.sns_post_schema import (
     SNSPostResponse, 
     HashtagResponse,
 )
-from core.sns_post_graph import run_sns_post_generation
-from states.sns_post_state import SNSPostState
-from nodes.sns_post.hashtag_generator import hashtag_generator
-from nodes.sns_post.trend_analyzer import trend_analyzer
+from core.sns_post_graph import run_hashtag_generation, run_sns_post_generation
 
 
 router = APIRouter(prefix="/sns-post/agent", tags=["SNS Post Agent"])
@@ -49,31 +46,15 @@ def generate_hashtags(request: HashtagRequest):
     기존 게시물 정보를 바탕으로 해시태그만 생성합니다.
     """
     try:
-        # 트렌드 분석을 위한 임시 상태 생성
-        temp_state = SNSPostState(
-            content_data="",  # 해시태그 생성에는 불필요
+        final_state = run_hashtag_generation(
+            post_title=request.post_title,
+            post_content=request.post_content,
+            user_keywords=request.user_keywords,
             sns_platform=request.sns_platform,
             business_type=request.business_type,
-            user_keywords=request.user_keywords,
             location=request.location
         )
         
-        # 1. 트렌드 분석 실행
-        temp_state = trend_analyzer(temp_state)
-        
-        # 2. 임시 PostData 생성
-        from states.sns_post_state import PostData
-        temp_post = PostData(
-            title=request.post_title,
-            content=request.post_content,
-        )
-        
-        # 3. generated_post 설정
-        temp_state = temp_state.model_copy(update={"generated_post": temp_post})
-        
-        # 4. 해시태그 생성
-        final_state = hashtag_generator(temp_state)
-        
         return HashtagResponse(
             hashtags=final_state.hashtags
         )
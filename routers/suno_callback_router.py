@@ -0,0 +1,20 @@
+# routers/suno_callback_router.py
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, HTTPException
+from config.settings import settings
+from utils.suno_tracker import record_suno_callback
+
+router = APIRouter(prefix = "/api/shorts/suno", tags = ["Suno Callback"])
+
+
+@router.post("/callback")
+def receive_suno_callback(payload: Dict[str, Any], token: Optional[str] = None):
+    """
+    Suno 생성 완료 콜백 수신 → 대기 중인 음악 생성 작업 즉시 재개
+    """
+    if settings.suno_callback_token and token != settings.suno_callback_token:
+        raise HTTPException(status_code = 403, detail = "잘못된 콜백 토큰")
+
+    result = record_suno_callback(payload)
+
+    return {"received": result is not None}
@@ -1,6 +1,6 @@
 # schemas/agent_schema.py
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Optional, Literal
 
 
 class Scenario(BaseModel):
@@ -47,6 +47,26 @@ class VideoResponse(BaseModel):
     key: Optional[str] = Field(default = None, description = "S3에 저장된 최종 비디오 key")
 
 
+JobStatus = Literal["queued", "running", "succeeded", "failed"]
+
+
+class VideoJobResponse(BaseModel):
+    job_id: str
+    session_id: str
+    status: JobStatus
+
+
+class VideoJobStatusResponse(BaseModel):
+    job_id: str
+    session_id: str
+    status: JobStatus
+    key: Optional[str] = Field(default = None, description = "S3에 저장된 최종 비디오 key")
+    error: Optional[str] = Field(default = None, description = "실패 사유")
+    created_at: Optional[str] = None
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+
 class InputImageInfo(BaseModel):
     url: str
     main_objects: List[str] = Field(default_factory = list)
@@ -0,0 +1,242 @@
+# services/shorts_job_service.py
+import json
+import uuid
+from datetime import datetime
+from typing import Optional, Tuple
+from config.settings import settings
+from utils.redis_utils import get_redis_client
+from utils.image_utils import clear_image_cache
+from utils.workspace import cleanup_workspace
+from schemas.shorts_schema import VideoRequest, VideoJobResponse, VideoJobStatusResponse
+
+JOB_KEY_PREFIX = "shorts:job:"
+SESSION_JOB_KEY_PREFIX = "shorts:session-job:"
+ACTIVE_STATUSES = ("queued", "running")
+
+# 세션 점유 후 작업 정보가 이 시간 안에 생기지 않으면 등록 중 종료된 것으로 보고 해제
+SESSION_CLAIM_GRACE_SECONDS = 30
+
+
+def _job_key(job_id: str) -> str:
+    return f"{JOB_KEY_PREFIX}{job_id}"
+
+
+def _decode(record: dict) -> dict:
+    return {k.decode(): v.decode() for k, v in record.items()}
+
+
+# 키 값이 job_id와 같을 때만 삭제 (다른 작업이 점유한 세션 키는 유지)
+RELEASE_SESSION_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def _session_key(session_id: str) -> str:
+    return f"{SESSION_JOB_KEY_PREFIX}{session_id}"
+
+
+def _processing_key(worker_id: str) -> str:
+    return f"{settings.shorts_job_queue}:processing:{worker_id}"
+
+
+def _lease_key(worker_id: str) -> str:
+    return f"{settings.shorts_job_queue}:lease:{worker_id}"
+
+
+def _queue_entry(job_id: str, session_id: str) -> str:
+    """큐 항목 (작업 정보가 만료돼도 세션 점유를 해제할 수 있도록 session_id 포함)"""
+    return json.dumps({"job_id": job_id, "session_id": session_id})
+
+
+def parse_queue_entry(entry: str) -> Tuple[str, Optional[str]]:
+    """큐 항목 → (job_id, session_id) (이전 형식의 job_id만 있는 항목은 session_id 없음)"""
+    try:
+        data = json.loads(entry)
+    except json.JSONDecodeError:
+        return entry, None
+
+    return data["job_id"], data.get("session_id")
+
+
+def _release_session(session_id: str, job_id: str) -> None:
+    get_redis_client().eval(RELEASE_SESSION_SCRIPT, 1, _session_key(session_id), job_id)
+
+
+def enqueue_video_job(payload: VideoRequest) -> VideoJobResponse:
+    """영상 생성(그래프 재개) 작업을 큐에 등록하고 바로 job id 반환"""
+    redis_client = get_redis_client()
+
+    job_id = str(uuid.uuid4())
+    job_key = _job_key(job_id)
+    ttl = settings.shorts_job_ttl_seconds
+
+    # 세션 점유는 SET NX 한 번으로 처리 (같은 세션의 동시 요청 중 하나만 등록 → 중복 재개 방지)
+    session_key = _session_key(payload.session_id)
+
+    while not redis_client.set(session_key, job_id, nx = True, ex = ttl):
+        existing_job_id = redis_client.get(session_key)
+        if existing_job_id is None:
+            continue
+
+        existing_job_id = existing_job_id.decode()
+        existing = get_video_job(existing_job_id)
+
+        if existing is None:
+            # 작업 정보가 아직 없으면 다른 요청이 방금 점유 후 등록 중
+            claimed_seconds = ttl - redis_client.ttl(session_key)
+            if claimed_seconds < SESSION_CLAIM_GRACE_SECONDS:
+                return VideoJobResponse(job_id = existing_job_id, session_id = payload.session_id, status = "queued")
+
+            # 유예 시간이 지나도 없으면 점유 후 등록 전에 종료된 요청 → 해제 후 다시 점유 시도
+            print(f"[JOB] 등록되지 않은 세션 점유 해제: {existing_job_id} (session: {payload.session_id})")
+            _release_session(payload.session_id, existing_job_id)
+            continue
+
+        if existing.status in ACTIVE_STATUSES:
+            return VideoJobResponse(job_id = existing.job_id, session_id = existing.session_id, status = existing.status)
+
+        # 끝난 작업의 키가 남아 있으면 해제 후 다시 점유 시도
+        _release_session(payload.session_id, existing_job_id)
+
+    pipe = redis_client.pipeline()
+    pipe.hset(job_key, mapping = {
+        "job_id": job_id,
+        "session_id": payload.session_id,
+        "status": "queued",
+        "payload": payload.model_dump_json(),
+        "created_at": datetime.now().isoformat()
+    })
+    pipe.expire(job_key, ttl)
+    pipe.lpush(settings.shorts_job_queue, _queue_entry(job_id, payload.session_id))
+    pipe.execute()
+
+    print(f"[JOB] 영상 생성 작업 등록: {job_id} (session: {payload.session_id})")
+
+    return VideoJobResponse(job_id = job_id, session_id = payload.session_id, status = "queued")
+
+
+def renew_worker_lease(worker_id: str) -> None:
+    """워커 생존 표시 (SHORTS_WORKER_LEASE_SECONDS 안에 갱신되지 않으면 다른 워커가 처리 중 작업을 재등록)"""
+    get_redis_client().set(_lease_key(worker_id), 1, ex = settings.shorts_worker_lease_seconds)
+
+
+def release_worker_lease(worker_id: str) -> None:
+    get_redis_client().delete(_lease_key(worker_id))
+
+
+def claim_video_job(worker_id: str, timeout: int = 5) -> Optional[str]:
+    """큐에서 작업을 꺼내 워커의 처리 중 목록으로 이동 (워커가 죽어도 작업이 남음, 완료 후 ack_video_job)"""
+    entry = get_redis_client().blmove(
+        settings.shorts_job_queue,
+        _processing_key(worker_id),
+        timeout,
+        src = "RIGHT",
+        dest = "LEFT"
+    )
+
+    return entry.decode() if entry else None
+
+
+def ack_video_job(worker_id: str, entry: str) -> None:
+    """처리 완료된 작업을 처리 중 목록에서 제거"""
+    get_redis_client().lrem(_processing_key(worker_id), 1, entry)
+
+
+def requeue_stale_jobs() -> int:
+    """임대(lease)가 만료된 워커의 처리 중 작업을 큐 앞(다음 처리 대상)으로 되돌림 (어느 워커든 주기적으로 실행)"""
+    redis_client = get_redis_client()
+    prefix = _processing_key("")
+    requeued = 0
+
+    for processing_key in redis_client.scan_iter(match = f"{prefix}*"):
+        worker_id = processing_key.decode()[len(prefix):]
+        if redis_client.exists(_lease_key(worker_id)):
+            continue
+
+        while redis_client.lmove(processing_key, settings.shorts_job_queue, "RIGHT", "RIGHT"):
+            requeued += 1
+
+    if requeued:
+        print(f"[JOB] 종료된 워커의 처리 중 작업 {requeued}개 재등록")
+
+    return requeued
+
+
+def get_video_job(job_id: str) -> Optional[VideoJobStatusResponse]:
+    """작업 상태 조회"""
+    record = get_redis_client().hgetall(_job_key(job_id))
+
+    if not record:
+        return None
+
+    record = _decode(record)
+    record.pop("payload", None)
+
+    return VideoJobStatusResponse(**record)
+
+
+def _update_job(job_id: str, **fields) -> None:
+    job_key = _job_key(job_id)
+    redis_client = get_redis_client()
+
+    pipe = redis_client.pipeline()
+    pipe.hset(job_key, mapping = fields)
+    pipe.expire(job_key, settings.shorts_job_ttl_seconds)
+    pipe.execute()
+
+
+def run_video_job(job_id: str, session_id: Optional[str] = None) -> None:
+    """워커 프로세스에서 작업 실행 (LangGraph 재개)"""
+    # 워커에서만 그래프 로드
+    from services.shorts_service import resume_agent_flow
+
+    record = get_redis_client().hgetall(_job_key(job_id))
+
+    if not record:
+        print(f"[JOB] 작업 정보 없음 (만료?): {job_id}")
+
+        # 세션 점유가 남아 있으면 해제 (TTL까지 같은 세션 요청이 막히지 않도록)
+        if session_id:
+            _release_session(session_id, job_id)
+        return
+
+    record = _decode(record)
+    payload = VideoRequest.model_validate_json(record["payload"])
+
+    _update_job(job_id, status = "running", started_at = datetime.now().isoformat())
+    print(f"[JOB] 작업 시작: {job_id} (session: {payload.session_id})")
+
+    succeeded = False
+
+    try:
+        response = resume_agent_flow(payload)
+
+        fields = {"status": "succeeded", "finished_at": datetime.now().isoformat()}
+        if response.key:
+            fields["key"] = response.key
+
+        _update_job(job_id, **fields)
+        print(f"[JOB] 작업 완료: {job_id} → {response.key}")
+
+        succeeded = True
+        clear_image_cache(payload.session_id)
+
+    except Exception as e:
+        _update_job(
+            job_id,
+            status = "failed",
+            error = str(e),
+            finished_at = datetime.now().isoformat()
+        )
+        print(f"[JOB] 작업 실패: {job_id} - {e}")
+
+    finally:
+        # 성공 시 최종 영상은 S3에 업로드됨 → 세션 작업 공간 삭제
+        # 실패 시에도 중간 파일(tmpfs)은 바로 삭제 (최종 결과 디렉토리는 오래되면 워커가 정리)
+        cleanup_workspace(payload.session_id, scratch_only = not succeeded)
+
+        # 세션 점유 해제 (같은 세션의 재시도 요청 허용)
+        _release_session(payload.session_id, job_id)
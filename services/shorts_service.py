@@ -9,7 +9,11 @@ def run_agent_flow(payload: ScenarioRequest) -> ScenarioResponse:
      # 새로운 세션 ID 생성
     session_id = str(uuid.uuid4())
     
-    state = ShortsState(**payload.model_dump())
+    # 파일 작업 공간은 영상을 만드는 워커가 session_id로 계산 (API 서버에서는 만들지 않음)
+    state = ShortsState(
+        **payload.model_dump(),
+        session_id = session_id
+    )
 
     result = graph.invoke(
         state,
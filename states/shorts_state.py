@@ -22,6 +22,7 @@ class ShortsState(BaseModel):
     scenario_prompt: str
 
     # 나중에 채워질 필드들
+    session_id: Optional[str] = Field(default = None, description = "그래프 thread_id (세션별 결정적 seed 계산용)")
     image_list: List[InputImageInfo] = Field(default_factory = list)
     ad_duration: int = 15 # default
     scenarios: List[Scenario] = Field(default_factory = list)  # {"title", "content"}
@@ -39,11 +40,11 @@ class ShortsState(BaseModel):
     # Seedance Video Generator
     video_urls: List[str] = Field(default_factory = list, description = "생성된 비디오 URL")
     video_files: List[str] = Field(default_factory = list, description = "다운로드 비디오 경로")
-    output_dir: str = Field(default = "./videos", description = "다운로드 비디오 저장 폴더")
     final_video_path: Optional[str] = Field(default = None, description = "최종 비디오 (오디오X) 경로")
 
     # Generated Video Analysis
     video_analysis: Optional[Dict[str, Any]] = Field(default = None, description = "생성 비디오 분석 결과")
+    provisional_analysis: Optional[Dict[str, Any]] = Field(default = None, description = "장면 이미지 + 계획 타이밍 기반 예상 분석 결과 (음악 선행 생성용)")
  
     # Suno(Music) Prompt Generator
     music_prompt: Optional[Dict[str, Any]] = Field(default = None, description = "음악 생성 프롬프트")
@@ -52,10 +53,9 @@ class ShortsState(BaseModel):
     # Suno Music Generator
     music_urls: List[str] = Field(default_factory = list, description = "생성 음악 URL")
     music_files: List[str] = Field(default_factory = list, description = "음악 파일 경로")
-    music_output_dir: str = Field(default = "./audio", description = "오디오 파일 저장 폴더")
+    music_reconciliation: Optional[Dict[str, Any]] = Field(default = None, description = "예상/실제 분석 비교 결과 (음악 유지 또는 재생성)")
 
     # Final Video With Audio
-    final_video_audio_dir: str = Field(default = "./final", description = "최종 비디오(오디오 포함) 저장 폴더")
     final_video_audio_filename: str = Field(default = "final_video.mp4", description = "최종 비디오(오디오 포함) 파일명")
     final_video_audio_path: Optional[str] = Field(default = None, description = "최종 비디오(오디오 포함) 저장 경로")
 
@@ -0,0 +1,457 @@
+# utils/artifact_store.py
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from config.settings import settings
+from utils.download_utils import fetch_bytes
+from utils.s3_uploader import get_s3_client
+
+
+@dataclass
+class Artifact:
+    """캐시된 생성 결과물 (로컬 파일 경로 + 외부에서 접근 가능한 URL)"""
+    key: str
+    path: str
+    url: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory = dict)
+
+
+# ================= Key =================
+
+# URL/경로 → 내용 digest (최근 DIGEST_CACHE_MAX_ENTRIES개만 유지)
+DIGEST_CACHE_MAX_ENTRIES = 1024
+
+_digest_cache: "OrderedDict[str, str]" = OrderedDict()
+_digest_lock = threading.Lock()
+
+
+def remember_digest(value: str, data: bytes) -> str:
+    """이미 받은 내용으로 digest 계산 후 기억 (이후 content_digest에서 다시 받지 않음)"""
+    digest = hashlib.sha256(data).hexdigest()
+
+    # data URL은 키 자체가 크므로 기억하지 않음
+    if not value.startswith("data:"):
+        with _digest_lock:
+            _digest_cache[value] = digest
+            _digest_cache.move_to_end(value)
+
+            while len(_digest_cache) > DIGEST_CACHE_MAX_ENTRIES:
+                _digest_cache.popitem(last = False)
+
+    return digest
+
+
+def content_digest(value: str) -> str:
+    """입력 이미지 digest (URL은 내용을 받아 해시, data URL/로컬 경로는 내용 자체로 해시)"""
+    with _digest_lock:
+        cached = _digest_cache.get(value)
+        if cached:
+            _digest_cache.move_to_end(value)
+    if cached:
+        return cached
+
+    if value.startswith(("http://", "https://")):
+        try:
+            data = fetch_bytes(value)
+        except Exception as e:
+            # 내용을 받을 수 없으면 URL 자체로 해시 (캐시 적중률만 낮아짐)
+            print(f"입력 이미지 digest 실패, URL로 대체 ({value}): {e}")
+            data = value.encode("utf-8")
+    elif os.path.exists(value):
+        with open(value, "rb") as f:
+            data = f.read()
+    else:
+        data = value.encode("utf-8")
+
+    return remember_digest(value, data)
+
+
+def artifact_key(model: str,
+                 prompt: str,
+                 seed: Optional[int] = None,
+                 input_images: Optional[List[str]] = None,
+                 params: Optional[Dict[str, Any]] = None,
+                 input_digests: Optional[List[str]] = None) -> str:
+    """모델 + 프롬프트 + 입력 이미지 내용 + seed + 파라미터 기반 캐시 키 (sha256)
+
+    input_digests: 호출 측에서 이미 받은 입력 이미지의 내용 digest (지정 시 input_images 대신 사용)
+    """
+    if input_digests is None:
+        input_digests = [content_digest(image) for image in (input_images or []) if image]
+
+    payload = {
+        "model": model,
+        "prompt": prompt,
+        "seed": seed,
+        "input_images": input_digests,
+        "params": params or {}
+    }
+
+    encoded = json.dumps(payload, sort_keys = True, ensure_ascii = False, default = str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def session_seed(session_id: Optional[str], label: str) -> Optional[int]:
+    """세션별 결정적 seed (같은 세션 재시도 시 같은 입력 → 캐시 적중)"""
+    if not session_id:
+        return None
+
+    digest = hashlib.sha256(f"{session_id}:{label}".encode("utf-8")).hexdigest()
+    return int(digest[:8], 16) % (2 ** 31)
+
+
+# ================= Backends =================
+
+def evict_lru_files(root_dir: str, max_bytes: int, skip_dirs: tuple = ()) -> Tuple[List[str], int]:
+    """디렉토리 전체 용량이 max_bytes 이하가 될 때까지 수정 시각이 오래된 파일부터 삭제, (삭제 경로, 남은 용량) 반환"""
+    entries = []
+    total = 0
+
+    for directory, dirnames, filenames in os.walk(root_dir):
+        dirnames[:] = [name for name in dirnames if name not in skip_dirs]
+
+        for filename in filenames:
+            if filename.endswith((".json", ".tmp")):
+                continue
+
+            path = os.path.join(directory, filename)
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+    removed = []
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+
+        os.remove(path)
+        removed.append(path)
+        total -= size
+
+    return removed, total
+
+
+class LocalArtifactBackend:
+    """로컬 디스크 저장소 (접근 시각 기준 LRU, 전체 용량 제한)
+
+    전체 용량은 저장할 때마다 더해서 추적하고, 한도를 넘었거나
+    artifact_evict_interval_seconds가 지났을 때만(다른 프로세스 저장분 반영) 디렉토리 전체 확인
+    """
+
+    def __init__(self, root_dir: str, max_bytes: int, public_base_url: Optional[str] = None):
+        self.root_dir = root_dir
+        self.max_bytes = max_bytes
+        self.public_base_url = public_base_url.rstrip("/") if public_base_url else None
+        self._total_bytes: Optional[int] = None
+        self._last_evicted_at = 0.0
+        self._lock = threading.Lock()
+
+        os.makedirs(root_dir, exist_ok = True)
+
+    @property
+    def serves_urls(self) -> bool:
+        """외부에서 접근 가능한 URL 제공 여부 (ARTIFACT_PUBLIC_BASE_URL 설정 시)"""
+        return self.public_base_url is not None
+
+    def _relative_path(self, key: str, ext: str) -> str:
+        return os.path.join(key[:2], f"{key}{ext}")
+
+    def _meta_path(self, key: str) -> str:
+        return os.path.join(self.root_dir, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[Artifact]:
+        meta_path = self._meta_path(key)
+        if not os.path.exists(meta_path):
+            return None
+
+        with open(meta_path, "r", encoding = "utf-8") as f:
+            metadata = json.load(f)
+
+        relative_path = self._relative_path(key, metadata.get("ext", ""))
+        path = os.path.join(self.root_dir, relative_path)
+        if not os.path.exists(path):
+            return None
+
+        # 최근 사용 표시 (LRU)
+        now = time.time()
+        os.utime(path, (now, now))
+
+        return Artifact(key = key, path = path, url = self._url(relative_path), metadata = metadata)
+
+    def put(self, key: str, source_path: str, ext: str, metadata: Dict[str, Any]) -> Artifact:
+        relative_path = self._relative_path(key, ext)
+        path = os.path.join(self.root_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok = True)
+
+        previous_size = os.path.getsize(path) if os.path.exists(path) else 0
+
+        # 임시 파일에 복사 후 교체 (동시 저장 시 깨진 파일 방지)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        shutil.copyfile(source_path, temp_path)
+        os.replace(temp_path, path)
+
+        metadata = {**metadata, "ext": ext, "size": os.path.getsize(path), "created_at": time.time()}
+        with open(self._meta_path(key), "w", encoding = "utf-8") as f:
+            json.dump(metadata, f, ensure_ascii = False)
+
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += metadata["size"] - previous_size
+
+            needs_evict = (
+                self._total_bytes is None
+                or self._total_bytes > self.max_bytes
+                or time.time() - self._last_evicted_at >= settings.artifact_evict_interval_seconds
+            )
+
+        if needs_evict:
+            self.evict()
+
+        return Artifact(key = key, path = path, url = self._url(relative_path), metadata = metadata)
+
+    def evict(self) -> None:
+        """전체 용량이 max_bytes를 넘으면 오래 사용하지 않은 파일부터 삭제"""
+        with self._lock:
+            removed, total = evict_lru_files(self.root_dir, self.max_bytes, skip_dirs = ("incoming", "s3-cache"))
+
+            for path in removed:
+                key = os.path.splitext(os.path.basename(path))[0]
+
+                meta_path = self._meta_path(key)
+                if os.path.exists(meta_path):
+                    os.remove(meta_path)
+
+            self._total_bytes = total
+            self._last_evicted_at = time.time()
+
+    def _url(self, relative_path: str) -> Optional[str]:
+        if not self.public_base_url:
+            return None
+
+        return f"{self.public_base_url}/{relative_path.replace(os.sep, '/')}"
+
+
+class S3ArtifactBackend:
+    """S3 저장소 (presigned URL 제공, 최근 수정 시각 기준 LRU, 전체 용량 제한)
+
+    로컬 파일이 필요한 결과물(영상/음악)은 local_dir에 내려받아 사용
+    """
+
+    def __init__(self, bucket: str, prefix: str, max_bytes: int, local_dir: str, url_ttl_seconds: int):
+        self.bucket = bucket
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.local_dir = local_dir
+        self.url_ttl_seconds = url_ttl_seconds
+        self._last_evicted_at = 0.0
+        self._lock = threading.Lock()
+
+        self.client = get_s3_client()
+
+        os.makedirs(local_dir, exist_ok = True)
+
+    @property
+    def serves_urls(self) -> bool:
+        """presigned URL 제공"""
+        return True
+
+    def _object_key(self, key: str, ext: str) -> str:
+        return f"{self.prefix}{key[:2]}/{key}{ext}"
+
+    def _meta_key(self, key: str) -> str:
+        return f"{self.prefix}{key[:2]}/{key}.json"
+
+    def get(self, key: str) -> Optional[Artifact]:
+        try:
+            response = self.client.get_object(Bucket = self.bucket, Key = self._meta_key(key))
+            metadata = json.loads(response["Body"].read())
+        except self.client.exceptions.NoSuchKey:
+            return None
+
+        object_key = self._object_key(key, metadata.get("ext", ""))
+        local_path = os.path.join(self.local_dir, os.path.basename(object_key))
+
+        try:
+            # 최근 사용 표시 (자기 자신으로 복사 → LastModified 갱신)
+            self.client.copy_object(
+                Bucket = self.bucket,
+                Key = object_key,
+                CopySource = {"Bucket": self.bucket, "Key": object_key},
+                MetadataDirective = "REPLACE"
+            )
+
+            if os.path.exists(local_path):
+                now = time.time()
+                os.utime(local_path, (now, now))
+            else:
+                self.client.download_file(self.bucket, object_key, local_path)
+
+        except Exception as e:
+            print(f"아티팩트 조회 실패 ({key}): {e}")
+            return None
+
+        return Artifact(key = key, path = local_path, url = self._url(object_key), metadata = metadata)
+
+    def put(self, key: str, source_path: str, ext: str, metadata: Dict[str, Any]) -> Artifact:
+        object_key = self._object_key(key, ext)
+        metadata = {**metadata, "ext": ext, "size": os.path.getsize(source_path), "created_at": time.time()}
+
+        self.client.upload_file(source_path, self.bucket, object_key)
+        self.client.put_object(
+            Bucket = self.bucket,
+            Key = self._meta_key(key),
+            Body = json.dumps(metadata, ensure_ascii = False).encode("utf-8"),
+            ContentType = "application/json"
+        )
+
+        local_path = os.path.join(self.local_dir, os.path.basename(object_key))
+        if os.path.abspath(source_path) != os.path.abspath(local_path):
+            shutil.copyfile(source_path, local_path)
+
+        self.evict()
+
+        return Artifact(key = key, path = local_path, url = self._url(object_key), metadata = metadata)
+
+    def evict(self) -> None:
+        """prefix 전체 용량이 max_bytes를 넘으면 오래된 객체부터 삭제 (목록 조회 비용 때문에 주기 제한)"""
+        with self._lock:
+            if time.time() - self._last_evicted_at < settings.artifact_evict_interval_seconds:
+                return
+            self._last_evicted_at = time.time()
+
+        # 로컬 사본도 같은 용량 제한 적용
+        evict_lru_files(self.local_dir, self.max_bytes)
+
+        objects = []
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket = self.bucket, Prefix = self.prefix):
+            objects.extend(obj for obj in page.get("Contents", []) if not obj["Key"].endswith(".json"))
+
+        total = sum(obj["Size"] for obj in objects)
+        if total <= self.max_bytes:
+            return
+
+        for obj in sorted(objects, key = lambda o: o["LastModified"]):
+            key = os.path.splitext(os.path.basename(obj["Key"]))[0]
+            self.client.delete_objects(Bucket = self.bucket, Delete = {"Objects": [
+                {"Key": obj["Key"]},
+                {"Key": self._meta_key(key)}
+            ]})
+
+            total -= obj["Size"]
+            if total <= self.max_bytes:
+                break
+
+    def _url(self, object_key: str) -> str:
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params = {"Bucket": self.bucket, "Key": object_key},
+            ExpiresIn = self.url_ttl_seconds
+        )
+
+
+# ================= Store =================
+
+class ArtifactStore:
+    """생성 결과물 캐시 (키: artifact_key)"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    @property
+    def serves_urls(self) -> bool:
+        """저장한 결과물을 외부 접근 URL로 제공할 수 있는지 (로컬 저장소 + ARTIFACT_PUBLIC_BASE_URL 미설정이면 False)"""
+        return self.backend.serves_urls
+
+    def get(self, key: str) -> Optional[Artifact]:
+        try:
+            artifact = self.backend.get(key)
+        except Exception as e:
+            print(f"아티팩트 캐시 조회 실패 ({key[:12]}): {e}")
+            return None
+
+        if artifact:
+            print(f"아티팩트 캐시 적중: {key[:12]} ({artifact.metadata.get('model')})")
+
+        return artifact
+
+    def put_file(self, key: str, path: str, metadata: Optional[Dict[str, Any]] = None) -> Optional[Artifact]:
+        """생성 결과 파일 저장 (캐시 저장 실패는 작업 실패로 보지 않음)"""
+        try:
+            ext = os.path.splitext(path)[1]
+            return self.backend.put(key, path, ext, metadata or {})
+        except Exception as e:
+            print(f"아티팩트 캐시 저장 실패 ({key[:12]}): {e}")
+            return None
+
+    def put_bytes(self, key: str, data: bytes, ext: str, metadata: Optional[Dict[str, Any]] = None) -> Optional[Artifact]:
+        """메모리의 결과물 저장"""
+        temp_path = os.path.join(settings.artifact_local_dir, "incoming", f"{key}.{threading.get_ident()}{ext}")
+        os.makedirs(os.path.dirname(temp_path), exist_ok = True)
+
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(data)
+
+            return self.put_file(key, temp_path, metadata)
+
+        except Exception as e:
+            print(f"아티팩트 캐시 저장 실패 ({key[:12]}): {e}")
+            return None
+
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def put_url(self, key: str, url: str, ext: str, metadata: Optional[Dict[str, Any]] = None) -> Optional[Artifact]:
+        """생성 결과 URL 내용을 받아 저장"""
+        try:
+            data = fetch_bytes(url)
+        except Exception as e:
+            print(f"아티팩트 캐시 저장 실패 ({key[:12]}): {e}")
+            return None
+
+        # 이 결과물을 입력으로 쓰는 다음 단계(장면 이미지 → 영상 세그먼트)의 캐시 키 계산 시 다시 받지 않도록
+        remember_digest(url, data)
+
+        return self.put_bytes(key, data, ext, {**(metadata or {}), "source_url": url})
+
+
+_artifact_store = None
+_artifact_store_lock = threading.Lock()
+
+
+def get_artifact_store() -> Optional[ArtifactStore]:
+    """설정된 백엔드의 공용 아티팩트 저장소 (artifact_backend == 'none'이면 None)"""
+    global _artifact_store
+
+    backend_name = settings.artifact_backend.lower()
+    if backend_name == "none":
+        return None
+
+    with _artifact_store_lock:
+        if _artifact_store is None:
+            if backend_name == "s3":
+                backend = S3ArtifactBackend(
+                    bucket = settings.artifact_s3_bucket,
+                    prefix = settings.artifact_s3_prefix,
+                    max_bytes = settings.artifact_max_bytes,
+                    local_dir = os.path.join(settings.artifact_local_dir, "s3-cache"),
+                    url_ttl_seconds = settings.artifact_url_ttl_seconds
+                )
+            else:
+                backend = LocalArtifactBackend(
+                    root_dir = settings.artifact_local_dir,
+                    max_bytes = settings.artifact_max_bytes,
+                    public_base_url = settings.artifact_public_base_url
+                )
+
+            _artifact_store = ArtifactStore(backend)
+
+    return _artifact_store
@@ -0,0 +1,137 @@
+# utils/checkpoint_serde.py
+import time
+import zlib
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import orjson
+import redis
+from langgraph.checkpoint.redis.jsonplus_redis import JsonPlusRedisSerializer
+
+CHECKPOINT_BLOB_PREFIX = "checkpoint_blob:"
+
+# 체크포인트 JSON 안에 남기는 blob 참조 (LangChain 직렬화 형식 → 로드 시 _reviver로 복원)
+BLOB_REF_ID = ["checkpoint_blob"]
+
+
+class CompressedBlobSerializer(JsonPlusRedisSerializer):
+    """RedisSaver용 직렬화기: 큰 값은 압축 후 내용 해시 기반 blob으로 한 번만 저장하고 참조만 기록
+
+    - 체크포인트: 채널별로 min_blob_bytes 이상인 값만 blob으로 분리 (작은 값은 그대로 인라인)
+    - pending writes: 값 전체가 크면 blob으로 분리
+    - 같은 내용은 같은 해시 → 바뀌지 않은 채널/노드 출력은 단계마다 다시 쓰지 않음
+
+    blob_ttl_seconds는 체크포인트 TTL의 2배 이상으로 설정
+    (남은 수명이 절반 이하일 때만 연장하므로 새 체크포인트보다 먼저 만료되지 않도록)
+    """
+
+    def __init__(self,
+                 redis_client: redis.Redis,
+                 min_blob_bytes: int = 2048,
+                 blob_ttl_seconds: int = 60 * 60 * 24 * 3,
+                 compression_level: int = 6,
+                 cache_size: int = 256,
+                 known_blobs_size: int = 4096):
+        super().__init__()
+        self.redis_client = redis_client
+        self.min_blob_bytes = min_blob_bytes
+        self.blob_ttl_seconds = blob_ttl_seconds
+        self.compression_level = compression_level
+        self.cache_size = cache_size
+        self.known_blobs_size = known_blobs_size
+
+        # 이 프로세스에서 최근 저장/확인한 blob 만료 시각 (LRU), 최근 로드한 blob 원문
+        self._known_blobs: "OrderedDict[str, float]" = OrderedDict()
+        self._blob_cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ---------- 저장 ----------
+
+    def dumps_typed(self, obj: Any) -> Tuple[str, str]:
+        if isinstance(obj, (bytes, bytearray)):
+            return super().dumps_typed(obj)
+
+        if isinstance(obj, dict) and "channel_values" in obj and "channel_versions" in obj:
+            channel_values = {
+                channel: self._offload(self.dumps(value))
+                for channel, value in (obj.get("channel_values") or {}).items()
+            }
+            return "json", self.dumps({**obj, "channel_values": channel_values}).decode("utf-8")
+
+        return "json", orjson.dumps(self._offload(self.dumps(obj))).decode("utf-8")
+
+    def _offload(self, encoded: bytes) -> Any:
+        """직렬화된 값이 크면 blob 저장 후 참조 반환, 작으면 그대로 (orjson Fragment)"""
+        if len(encoded) < self.min_blob_bytes:
+            return orjson.Fragment(encoded)
+
+        digest = hashlib.sha256(encoded).hexdigest()
+        self._store_blob(digest, encoded)
+
+        return {"lc": 2, "type": "constructor", "id": BLOB_REF_ID, "kwargs": {"sha256": digest, "size": len(encoded)}}
+
+    def _store_blob(self, digest: str, encoded: bytes) -> None:
+        now = time.time()
+
+        with self._lock:
+            expires_at = self._known_blobs.get(digest)
+            if expires_at is not None:
+                self._known_blobs.move_to_end(digest)
+
+        key = f"{CHECKPOINT_BLOB_PREFIX}{digest}"
+
+        # 이미 저장된 blob: 만료가 가까울 때만 TTL 연장
+        if expires_at is not None:
+            if expires_at - now > self.blob_ttl_seconds / 2:
+                return
+            if self.redis_client.expire(key, self.blob_ttl_seconds):
+                self._remember_blob(digest, now + self.blob_ttl_seconds)
+                return
+
+        compressed = zlib.compress(encoded, self.compression_level)
+
+        # 다른 프로세스가 먼저 저장했으면 TTL만 갱신됨
+        pipe = self.redis_client.pipeline(transaction = False)
+        pipe.set(key, compressed, ex = self.blob_ttl_seconds, nx = True)
+        pipe.expire(key, self.blob_ttl_seconds)
+        pipe.execute()
+
+        self._remember_blob(digest, now + self.blob_ttl_seconds)
+
+    def _remember_blob(self, digest: str, expires_at: float) -> None:
+        """저장한 blob 만료 시각 기록 (최근 known_blobs_size개만 유지)"""
+        with self._lock:
+            self._known_blobs[digest] = expires_at
+            self._known_blobs.move_to_end(digest)
+
+            while len(self._known_blobs) > self.known_blobs_size:
+                self._known_blobs.popitem(last = False)
+
+    # ---------- 로드 ----------
+
+    def _reviver(self, value: Dict[str, Any]) -> Any:
+        if value.get("id") == BLOB_REF_ID and value.get("type") == "constructor":
+            return self._revive_if_needed(orjson.loads(self._load_blob(value["kwargs"]["sha256"])))
+
+        return super()._reviver(value)
+
+    def _load_blob(self, digest: str) -> bytes:
+        with self._lock:
+            cached = self._blob_cache.get(digest)
+            if cached is not None:
+                self._blob_cache.move_to_end(digest)
+                return cached
+
+        compressed: Optional[bytes] = self.redis_client.get(f"{CHECKPOINT_BLOB_PREFIX}{digest}")
+        if compressed is None:
+            raise KeyError(f"체크포인트 blob 없음 (만료?): {digest}")
+
+        encoded = zlib.decompress(compressed)
+
+        with self._lock:
+            self._blob_cache[digest] = encoded
+            if len(self._blob_cache) > self.cache_size:
+                self._blob_cache.popitem(last = False)
+
+        return encoded
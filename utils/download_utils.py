@@ -0,0 +1,256 @@
+# utils/download_utils.py
+import os
+import random
+import threading
+import time
+import hashlib
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Mapping, Optional, Tuple, Union
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from config.settings import settings
+from utils.metrics import record_transfer, track_call
+
+# 재시도하지 않는 HTTP 상태 코드 (요청 자체가 잘못된 경우)
+NON_RETRYABLE_STATUS = {400, 401, 403, 404, 405, 410}
+
+# 스트리밍 단위 (연결이 끊겨도 받은 만큼은 .part에 남도록 작게 유지)
+CHUNK_SIZE = 64 * 1024
+
+
+class DownloadError(Exception):
+    """다운로드 실패 (재시도 소진 또는 무결성 검사 실패)"""
+
+
+_session = None
+_session_lock = threading.Lock()
+
+_global_slots = threading.BoundedSemaphore(max(1, settings.download_max_concurrency))
+_host_slots: Dict[str, threading.BoundedSemaphore] = {}
+_host_slots_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """공용 HTTP 세션 (프로세스 내 커넥션 풀 공유)"""
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            pool_size = max(settings.download_max_concurrency, settings.download_max_per_host)
+            adapter = HTTPAdapter(pool_connections = pool_size, pool_maxsize = pool_size)
+
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+
+    return _session
+
+
+@contextmanager
+def download_slot(url: str):
+    """전체/호스트별 동시 다운로드 수 제한"""
+    host = urlparse(url).netloc
+
+    with _host_slots_lock:
+        host_slot = _host_slots.get(host)
+        if host_slot is None:
+            host_slot = threading.BoundedSemaphore(max(1, settings.download_max_per_host))
+            _host_slots[host] = host_slot
+
+    with _global_slots, host_slot:
+        yield
+
+
+def backoff_delay(attempt: int) -> float:
+    """지수 백오프 + full jitter (attempt는 1부터)"""
+    ceiling = min(settings.download_backoff_max, settings.download_backoff_base * (2 ** (attempt - 1)))
+    return random.uniform(0, ceiling)
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code not in NON_RETRYABLE_STATUS
+
+    return True
+
+
+def _expected_total_size(response: requests.Response, offset: int) -> Optional[int]:
+    """응답 헤더 기준 전체 파일 크기 (Content-Range 우선, 압축 전송이면 알 수 없음)"""
+    if response.headers.get("Content-Encoding", "identity") != "identity":
+        return None
+
+    content_range = response.headers.get("Content-Range")
+    if content_range and "/" in content_range:
+        total = content_range.rsplit("/", 1)[1]
+        if total.isdigit():
+            return int(total)
+
+    content_length = response.headers.get("Content-Length")
+    if content_length and content_length.isdigit():
+        return offset + int(content_length)
+
+    return None
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def _stream_to_part(url: str, part_path: str, headers: Optional[Dict[str, str]]) -> Optional[int]:
+    """.part 파일로 스트리밍 (기존 .part가 있으면 Range로 이어받기), 예상 전체 크기 반환"""
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+
+    # 압축 전송이면 Range/크기 검사가 의미 없으므로 원본 바이트 요청
+    request_headers = {"Accept-Encoding": "identity", **(headers or {})}
+    if offset:
+        request_headers["Range"] = f"bytes={offset}-"
+
+    timeout = (settings.download_connect_timeout, settings.download_read_timeout)
+
+    with get_http_session().get(url, headers = request_headers, stream = True, timeout = timeout) as response:
+        # 이어받을 범위가 없음 → 처음부터 다시
+        if response.status_code == 416:
+            os.remove(part_path)
+            raise DownloadError(f"Range 요청 거부 (offset {offset})")
+
+        response.raise_for_status()
+
+        # 서버가 Range를 무시하면 전체 응답 → 처음부터 기록
+        if offset and response.status_code != 206:
+            offset = 0
+
+        total_size = _expected_total_size(response, offset)
+
+        with open(part_path, "ab" if offset else "wb") as f:
+            for chunk in response.iter_content(chunk_size = CHUNK_SIZE):
+                if chunk:
+                    f.write(chunk)
+
+    return total_size
+
+
+def download_file(url: str,
+                  path: str,
+                  headers: Optional[Dict[str, str]] = None,
+                  expected_size: Optional[int] = None,
+                  expected_sha256: Optional[str] = None,
+                  validate: Optional[Callable[[str], None]] = None,
+                  retries: Optional[int] = None) -> str:
+    """파일 다운로드 (스트리밍 저장, Range 이어받기, 백오프 재시도, 무결성 검사)
+
+    완료 전까지 path + '.part'에 기록하고 검사를 통과하면 path로 교체
+    validate는 완성된 파일 경로를 받아 문제가 있으면 예외를 발생시키는 함수
+    """
+    retries = retries or settings.download_retries
+    part_path = f"{path}.part"
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok = True)
+
+    for attempt in range(1, retries + 1):
+        try:
+            with download_slot(url), track_call("download", "file"):
+                total_size = _stream_to_part(url, part_path, headers)
+
+            # 무결성 검사
+            size = os.path.getsize(part_path)
+
+            if size == 0:
+                os.remove(part_path)
+                raise DownloadError("빈 파일")
+
+            if total_size is not None and size < total_size:
+                # .part 유지 → 다음 시도에서 이어받기
+                raise DownloadError(f"불완전한 파일 ({size}/{total_size} bytes)")
+
+            if (total_size is not None and size > total_size) or (expected_size is not None and size != expected_size):
+                os.remove(part_path)
+                raise DownloadError(f"파일 크기 불일치 ({size} bytes)")
+
+            if expected_sha256 and _sha256(part_path) != expected_sha256.lower():
+                os.remove(part_path)
+                raise DownloadError("체크섬 불일치")
+
+            if validate:
+                try:
+                    validate(part_path)
+                except Exception as e:
+                    os.remove(part_path)
+                    raise DownloadError(f"파일 검증 실패: {e}")
+
+            os.replace(part_path, path)
+            record_transfer("http", "download", size)
+            return path
+
+        except Exception as e:
+            if not is_retryable(e) or attempt == retries:
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+                raise DownloadError(f"다운로드 실패 ({url}): {e}") from e
+
+            delay = backoff_delay(attempt)
+            print(f"[시도 {attempt}/{retries}] 다운로드 오류: {e} ({delay:.1f}초 후 재시도)")
+            time.sleep(delay)
+
+
+def download_files(items: List[Tuple[str, str]],
+                   validate: Optional[Callable[[str], None]] = None) -> List[Union[str, Exception]]:
+    """여러 파일 동시 다운로드 (입력 순서 유지, 실패 항목은 예외 객체)"""
+    if not items:
+        return []
+
+    def run(item: Tuple[str, str]) -> Union[str, Exception]:
+        url, path = item
+        try:
+            return download_file(url, path, validate = validate)
+        except Exception as e:
+            return e
+
+    max_workers = max(1, min(settings.download_max_concurrency, len(items)))
+    with ThreadPoolExecutor(max_workers = max_workers) as executor:
+        return list(executor.map(run, items))
+
+
+def fetch_bytes(url: str,
+                headers: Optional[Dict[str, str]] = None,
+                retries: Optional[int] = None) -> bytes:
+    """작은 리소스(이미지 등)를 메모리로 가져오기 (공용 세션, 타임아웃, 백오프 재시도)"""
+    return fetch_with_headers(url, headers, retries)[0]
+
+
+def fetch_with_headers(url: str,
+                       headers: Optional[Dict[str, str]] = None,
+                       retries: Optional[int] = None) -> Tuple[bytes, Mapping[str, str]]:
+    """fetch_bytes와 같고 응답 헤더(ETag 등)도 함께 반환"""
+    retries = retries or settings.download_retries
+    timeout = (settings.download_connect_timeout, settings.download_read_timeout)
+
+    for attempt in range(1, retries + 1):
+        try:
+            with download_slot(url), track_call("download", "fetch"):
+                response = get_http_session().get(url, headers = headers, timeout = timeout)
+                response.raise_for_status()
+
+            expected = _expected_total_size(response, 0)
+            if expected is not None and len(response.content) != expected:
+                raise DownloadError(f"불완전한 응답 ({len(response.content)}/{expected} bytes)")
+
+            record_transfer("http", "download", len(response.content))
+            return response.content, response.headers
+
+        except Exception as e:
+            if not is_retryable(e) or attempt == retries:
+                raise DownloadError(f"다운로드 실패 ({url}): {e}") from e
+
+            delay = backoff_delay(attempt)
+            print(f"[시도 {attempt}/{retries}] 다운로드 오류: {e} ({delay:.1f}초 후 재시도)")
+            time.sleep(delay)
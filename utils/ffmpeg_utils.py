@@ -0,0 +1,39 @@
+# utils/ffmpeg_utils.py
+import subprocess
+from typing import List, Dict, Any
+from moviepy.config import get_setting
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+
+
+def get_ffmpeg_exe() -> str:
+    """moviepy와 동일한 ffmpeg 바이너리 경로"""
+    return get_setting("FFMPEG_BINARY")
+
+
+def run_ffmpeg(args: List[str]) -> None:
+    """ffmpeg 실행 (실패 시 stderr 마지막 부분을 포함해 예외 발생)"""
+    command = [get_ffmpeg_exe(), "-hide_banner", "-loglevel", "error", "-y", *args]
+    result = subprocess.run(command, stdout = subprocess.PIPE, stderr = subprocess.PIPE)
+
+    if result.returncode != 0:
+        stderr = result.stderr.decode("utf-8", errors = "ignore").strip()
+        raise RuntimeError(f"ffmpeg 실행 실패 (code {result.returncode}): {stderr[-2000:]}")
+
+
+def probe_video(path: str) -> Dict[str, Any]:
+    """디코딩 없이 영상 메타데이터(길이, 해상도, fps) 조회"""
+    infos = ffmpeg_parse_infos(path)
+
+    return {
+        "duration": infos.get("video_duration") or infos.get("duration"),
+        "size": tuple(infos["video_size"]),
+        "fps": infos.get("video_fps"),
+        "audio_found": infos.get("audio_found", False)
+    }
+
+
+def probe_media_duration(path: str) -> float:
+    """디코딩 없이 미디어(오디오/영상) 길이 조회"""
+    infos = ffmpeg_parse_infos(path)
+
+    return infos.get("duration") or infos.get("audio_duration") or 0.0
@@ -0,0 +1,103 @@
+# utils/frame_ops.py
+import cv2
+import numpy as np
+from typing import Callable, Dict, Tuple
+
+# 알파 LUT 해상도 (진행도 0~1을 ALPHA_STEPS 구간으로 양자화)
+ALPHA_STEPS = 256
+# 정수 블렌딩 고정소수점 스케일 (가중치 0~256, 결과는 >> 8)
+ALPHA_SCALE = 256
+
+
+def build_alpha_lut(fade_func: Callable[[float], float], steps: int = ALPHA_STEPS) -> np.ndarray:
+    """곡선 함수를 진행도별 정수 가중치(0~256) 테이블로 미리 계산"""
+    progress = np.linspace(0.0, 1.0, steps)
+    alphas = np.clip([fade_func(p) for p in progress], 0.0, 1.0)
+
+    return np.rint(alphas * ALPHA_SCALE).astype(np.uint16)
+
+
+def lookup_alpha(lut: np.ndarray, progress: float) -> int:
+    """진행도(0~1)에 해당하는 정수 가중치 조회"""
+    index = int(round(min(max(progress, 0.0), 1.0) * (len(lut) - 1)))
+    return int(lut[index])
+
+
+class FrameBlender:
+    """uint8 프레임 블렌딩 (프레임 간 버퍼 재사용)
+
+    반환되는 배열은 내부 버퍼이므로 다음 호출 전에 소비(인코딩/복사)해야 함
+    """
+
+    def __init__(self):
+        self._buffers: Dict[Tuple[str, tuple], np.ndarray] = {}
+
+    def _buffer(self, name: str, shape: tuple, dtype) -> np.ndarray:
+        key = (name, shape)
+        buffer = self._buffers.get(key)
+
+        if buffer is None or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype = dtype)
+            self._buffers[key] = buffer
+
+        return buffer
+
+    def crossfade(self, frame1: np.ndarray, frame2: np.ndarray, weight: int) -> np.ndarray:
+        """(frame1 * (256 - w) + frame2 * w) >> 8"""
+        if weight <= 0:
+            return frame1
+        if weight >= ALPHA_SCALE:
+            return frame2
+
+        acc = self._buffer("acc", frame1.shape, np.uint16)
+        tmp = self._buffer("tmp", frame1.shape, np.uint16)
+        out = self._buffer("out", frame1.shape, np.uint8)
+
+        np.multiply(frame1, np.uint16(ALPHA_SCALE - weight), out = acc, casting = "unsafe")
+        np.multiply(frame2, np.uint16(weight), out = tmp, casting = "unsafe")
+        np.add(acc, tmp, out = acc)
+        np.add(acc, np.uint16(ALPHA_SCALE // 2), out = acc)
+        np.right_shift(acc, 8, out = acc)
+        np.copyto(out, acc, casting = "unsafe")
+
+        return out
+
+    def scale(self, frame: np.ndarray, weight: int) -> np.ndarray:
+        """(frame * w) >> 8 (페이드아웃용 밝기 감쇠)"""
+        if weight >= ALPHA_SCALE:
+            return frame
+
+        out = self._buffer("out", frame.shape, np.uint8)
+
+        if weight <= 0:
+            out.fill(0)
+            return out
+
+        acc = self._buffer("acc", frame.shape, np.uint16)
+
+        np.multiply(frame, np.uint16(weight), out = acc, casting = "unsafe")
+        np.add(acc, np.uint16(ALPHA_SCALE // 2), out = acc)
+        np.right_shift(acc, 8, out = acc)
+        np.copyto(out, acc, casting = "unsafe")
+
+        return out
+
+
+def resize_frame(frame: np.ndarray, target_resolution: tuple) -> np.ndarray:
+    """프레임 리사이즈 (이미 목표 크기면 그대로 반환)"""
+    width, height = target_resolution
+
+    if frame.shape[1] == width and frame.shape[0] == height:
+        return frame
+
+    return cv2.resize(frame, (width, height), interpolation = cv2.INTER_AREA)
+
+
+def resize_clip(clip, target_resolution: tuple):
+    """moviepy 클립 리사이즈 (해상도가 같으면 원본 클립 그대로 사용)"""
+    target_resolution = (int(target_resolution[0]), int(target_resolution[1]))
+
+    if tuple(clip.size) == target_resolution:
+        return clip
+
+    return clip.fl_image(lambda frame: resize_frame(frame, target_resolution))
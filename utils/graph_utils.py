@@ -0,0 +1,26 @@
+# utils/graph_utils.py
+from functools import wraps
+from typing import Any, Callable, Dict
+from pydantic import BaseModel
+
+
+def changed_fields(node: Callable[[BaseModel], BaseModel]) -> Callable[[BaseModel], Dict[str, Any]]:
+    """state 전체를 반환하는 노드를 변경된 필드만 반환하도록 감싸기
+
+    병렬 브랜치의 노드들이 같은 superstep에서 동일 키를 쓰면 LangGraph가 충돌로 처리하므로,
+    각 노드가 실제로 수정한 필드만 업데이트로 내보냄 (체크포인트에도 바뀐 채널만 기록됨)
+    (병렬 노드끼리 리스트 등 가변 객체를 공유하므로 노드에는 깊은 복사본을 전달)
+    """
+
+    @wraps(node)
+    def wrapper(state: BaseModel) -> Dict[str, Any]:
+        before = state.model_copy(deep = True)
+        result = node(state.model_copy(deep = True))
+
+        return {
+            name: getattr(result, name)
+            for name in type(result).model_fields
+            if getattr(result, name) != getattr(before, name)
+        }
+
+    return wrapper
@@ -1,25 +1,142 @@
-from typing import List
-import requests
+from typing import Dict, List, Optional, Tuple
 import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from io import BytesIO
 from PIL import Image
+from config.settings import settings
+from utils.artifact_store import get_artifact_store, remember_digest
+from utils.download_utils import fetch_bytes, fetch_with_headers
+
+
+@dataclass
+class CachedImage:
+    """디코딩/축소된 이미지 (version: ETag, 없으면 내용 해시 / digest: 원본 내용 sha256)"""
+    url: str
+    version: str
+    image: Image.Image
+    digest: str
+
+
+@dataclass
+class SessionImageCache:
+    """세션 하나의 참고 이미지 캐시 (URL별 디코딩 결과, 같은 이미지 조합의 합성 JPEG와 업로드 URL)"""
+    images: Dict[str, Future] = field(default_factory=dict)
+    composites: Dict[Tuple[Tuple[str, str], ...], bytes] = field(default_factory=dict)
+    hosted: Dict[Tuple[Tuple[str, str], ...], str] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+_session_caches: "OrderedDict[str, SessionImageCache]" = OrderedDict()
+_session_caches_lock = threading.Lock()
+
+
+def _session_cache(session_id: Optional[str]) -> Optional[SessionImageCache]:
+    """세션 캐시 (session_id가 없으면 캐시하지 않음, 최근 세션 image_cache_max_sessions개만 유지)"""
+    if not session_id:
+        return None
+
+    with _session_caches_lock:
+        cache = _session_caches.get(session_id)
+
+        if cache is None:
+            cache = SessionImageCache()
+            _session_caches[session_id] = cache
+
+            while len(_session_caches) > max(1, settings.image_cache_max_sessions):
+                _session_caches.popitem(last=False)
+        else:
+            _session_caches.move_to_end(session_id)
+
+    return cache
+
+
+def clear_image_cache(session_id: Optional[str]) -> None:
+    """세션 이미지 캐시 삭제 (작업 종료 시)"""
+    with _session_caches_lock:
+        _session_caches.pop(session_id, None)
 
-def download_and_encode_image(url):
-    """이미지 URL을 다운로드하고 base64로 인코딩"""
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
 
-        # 이미지를 PIL로 열어서 처리
-        image = Image.open(BytesIO(response.content))
+def decode_image(data: bytes, max_size: Optional[int] = None) -> Image.Image:
+    """이미지 디코딩 후 RGB 변환 및 max_size 이내로 축소
 
-        # RGBA나 다른 모드를 RGB로 변환
-        if image.mode in ('RGBA', 'LA', 'P'):
-            image = image.convert('RGB')
+    JPEG는 draft 모드로 디코딩 단계에서 1/2 ~ 1/8 크기로 읽어 전체 해상도 디코딩을 생략
+    """
+    max_size = max_size or settings.image_max_size
+    image = Image.open(BytesIO(data))
 
-        # 이미지 크기 최적화
-        max_size = (1024, 1024)
-        image.thumbnail(max_size, Image.Resampling.LANCZOS)
+    if image.format == 'JPEG':
+        image.draft('RGB', (max_size, max_size))
+
+    # RGBA나 다른 모드를 RGB로 변환
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+
+    # 이미 max_size 이하면 thumbnail이 디코딩하지 않으므로 여기서 디코딩 (캐시된 이미지를 여러 스레드가 공유)
+    image.load()
+    return image
+
+
+def _fetch_image(url: str) -> CachedImage:
+    data, headers = fetch_with_headers(url)
+    version = headers.get('ETag') or hashlib.sha1(data).hexdigest()
+    return CachedImage(url=url, version=version, image=decode_image(data), digest=remember_digest(url, data))
+
+
+def load_image(url: str, session_id: Optional[str] = None) -> CachedImage:
+    """이미지 로드 (같은 세션에서는 URL당 한 번만 다운로드/디코딩, 동시 요청은 첫 요청 결과 공유)"""
+    cache = _session_cache(session_id)
+    if cache is None:
+        return _fetch_image(url)
+
+    with cache.lock:
+        future = cache.images.get(url)
+        owner = future is None
+        if owner:
+            future = Future()
+            cache.images[url] = future
+
+    if owner:
+        try:
+            future.set_result(_fetch_image(url))
+        except Exception as e:
+            # 실패는 캐시하지 않음 (다음 요청에서 재시도)
+            with cache.lock:
+                cache.images.pop(url, None)
+            future.set_exception(e)
+
+    return future.result()
+
+
+def load_images(urls: List[str], session_id: Optional[str] = None) -> List[Optional[CachedImage]]:
+    """여러 이미지 동시 로드 (입력 순서 유지, 실패한 이미지는 None)"""
+    unique_urls = list(dict.fromkeys(urls))
+    if not unique_urls:
+        return []
+
+    def run(url: str) -> Optional[CachedImage]:
+        try:
+            return load_image(url, session_id)
+        except Exception as e:
+            print(f"이미지 로드 실패 ({url}): {e}")
+            return None
+
+    max_workers = max(1, min(settings.download_max_concurrency, len(unique_urls)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        loaded = dict(zip(unique_urls, executor.map(run, unique_urls)))
+
+    return [loaded[url] for url in urls]
+
+
+def download_and_encode_image(url):
+    """이미지 URL을 다운로드하고 base64로 인코딩"""
+    try:
+        image = decode_image(fetch_bytes(url))
 
         # base64로 인코딩
         buffer = BytesIO()
@@ -31,25 +148,33 @@ def download_and_encode_image(url):
         print(f"이미지 처리 실패 ({url}): {e}")
         return None
 
-def combine_images(image_url: List[str]):
-    # URL에서 이미지 불러오기
-    images = []
-    for url in image_url:
-        try:
-            response = requests.get(url)
-            response.raise_for_status()
-            img = Image.open(BytesIO(response.content))
-            images.append(img)
-        except Exception as e:
-            print(f"이미지 로드 실패 ({url}): {e}")
-            continue
-    
+
+def _composite(image_url: List[str], session_id: Optional[str] = None) -> Tuple[Tuple[Tuple[str, str], ...], bytes]:
+    """참고 이미지를 가로로 이어붙인 JPEG (합성 키, JPEG 바이트)
+
+    session_id 지정 시 이미지와 합성 결과를 세션 캐시에서 재사용 (같은 이미지 조합은 한 번만 합성)
+    """
+    images = [img for img in load_images(image_url, session_id) if img]
+
     if not images:
         raise ValueError("유효한 이미지가 없습니다")
 
+    cache = _session_cache(session_id)
+    composite_key = tuple((img.url, img.version) for img in images)
+
+    if cache:
+        with cache.lock:
+            cached = cache.composites.get(composite_key)
+        if cached:
+            return composite_key, cached
+
     # 이미지 크기 맞추기 (가장 작은 높이에 맞춰 리사이즈)
-    min_height = min(img.height for img in images)
-    resized_images = [img.resize((int(img.width * min_height / img.height), min_height)) for img in images]
+    min_height = min(img.image.height for img in images)
+    resized_images = [
+        img.image if img.image.height == min_height
+        else img.image.resize((int(img.image.width * min_height / img.image.height), min_height))
+        for img in images
+    ]
 
     # 가로로 이어붙이기
     total_width = sum(img.width for img in resized_images)
@@ -60,10 +185,64 @@ def combine_images(image_url: List[str]):
         combined_img.paste(img, (x_offset, 0))
         x_offset += img.width
 
-    # 메모리에서 바로 Base64 URL 변환
+    # 이미지 수와 관계없이 전송 크기 제한
+    combined_img.thumbnail((settings.reference_image_max_width, min_height), Image.Resampling.LANCZOS)
+
     buffer = BytesIO()
-    combined_img.save(buffer, format="JPEG")  # JPEG 포맷으로 저장
-    base64_string = base64.b64encode(buffer.getvalue()).decode("utf-8")
-    base64_url = f"data:image/jpeg;base64,{base64_string}"
+    combined_img.save(buffer, format="JPEG", quality=settings.reference_image_quality, optimize=True)
+    data = buffer.getvalue()
+
+    if cache:
+        with cache.lock:
+            cache.composites[composite_key] = data
+
+    return composite_key, data
+
+
+def _data_url(data: bytes) -> str:
+    return f"data:image/jpeg;base64,{base64.b64encode(data).decode('utf-8')}"
+
+
+def combine_images(image_url: List[str], session_id: Optional[str] = None):
+    """참고 이미지를 가로로 이어붙인 JPEG data URL"""
+    return _data_url(_composite(image_url, session_id)[1])
+
+
+def reference_image_url(image_url: List[str], session_id: Optional[str] = None) -> str:
+    """참고 이미지 합성 결과를 결과물 저장소(S3/로컬)에 올린 URL
+
+    내용 해시를 키로 저장하므로 같은 합성 결과는 같은 객체 재사용
+    저장소가 없거나 외부 접근 URL을 만들 수 없으면(로컬 저장소 + ARTIFACT_PUBLIC_BASE_URL 미설정) data URL
+    """
+    composite_key, data = _composite(image_url, session_id)
+
+    cache = _session_cache(session_id)
+    if cache:
+        with cache.lock:
+            hosted = cache.hosted.get(composite_key)
+        if hosted:
+            return hosted
+
+    url = _host_image(data)
+    if not url:
+        return _data_url(data)
+
+    if cache:
+        with cache.lock:
+            cache.hosted[composite_key] = url
+
+    return url
+
+
+def _host_image(data: bytes) -> Optional[str]:
+    # 외부 접근 URL을 만들 수 없는 저장소면 저장하지 않음 (호출 측에서 data URL 사용)
+    store = get_artifact_store()
+    if store is None or not store.serves_urls:
+        return None
+
+    key = hashlib.sha256(data).hexdigest()
+    artifact = store.get(key)
+    if artifact is None:
+        artifact = store.put_bytes(key, data, ".jpg", {"model": "reference_image"})
 
-    return base64_url
\ No newline at end of file
+    return artifact.url if artifact else None
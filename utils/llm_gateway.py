@@ -0,0 +1,182 @@
+# utils/llm_gateway.py
+import json
+import hashlib
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import anthropic
+from openai import OpenAI
+from langchain_openai import ChatOpenAI
+from langchain_core.messages import BaseMessage
+from langchain_core.prompt_values import PromptValue
+from config.settings import settings
+from utils.redis_utils import get_redis_client
+from utils.metrics import record_llm_cache, record_llm_usage, track_call
+
+CACHE_KEY_PREFIX = "llm:cache:"
+
+# langchain 메시지 타입 → chat completions role
+LANGCHAIN_ROLES = {"system": "system", "human": "user", "ai": "assistant"}
+
+
+_openai_client = None
+_anthropic_client = None
+_chat_models: Dict[Tuple[str, float], ChatOpenAI] = {}
+_clients_lock = threading.Lock()
+
+
+# ================= Clients =================
+
+def get_openai_client() -> OpenAI:
+    """공용 OpenAI 클라이언트 (프로세스 내 keep-alive 커넥션 풀 공유)"""
+    global _openai_client
+
+    with _clients_lock:
+        if _openai_client is None:
+            _openai_client = OpenAI(api_key = settings.openai_api_key, base_url = settings.openai_base_url)
+
+    return _openai_client
+
+
+def get_anthropic_client() -> anthropic.Anthropic:
+    """공용 Anthropic 클라이언트 (프로세스 내 keep-alive 커넥션 풀 공유)"""
+    global _anthropic_client
+
+    with _clients_lock:
+        if _anthropic_client is None:
+            _anthropic_client = anthropic.Anthropic(api_key = settings.claude_api_key, base_url = settings.anthropic_base_url)
+
+    return _anthropic_client
+
+
+def get_chat_model(model: str, temperature: float) -> ChatOpenAI:
+    """공용 langchain ChatOpenAI (모델/temperature 조합별 1개)"""
+    with _clients_lock:
+        llm = _chat_models.get((model, temperature))
+        if llm is None:
+            llm = ChatOpenAI(
+                temperature = temperature,
+                model = model,
+                streaming = False,
+                api_key = settings.openai_api_key,
+                base_url = settings.openai_base_url
+            )
+            _chat_models[(model, temperature)] = llm
+
+    return llm
+
+
+# ================= Cache =================
+
+def cache_key(provider: str, request: Dict[str, Any]) -> str:
+    """요청 전체(모델, 메시지, temperature, 기타 파라미터) 기반 exact-match 캐시 키"""
+    encoded = json.dumps({"provider": provider, **request}, sort_keys = True, ensure_ascii = False, default = str)
+    return CACHE_KEY_PREFIX + hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _is_valid(text: str, validate: Optional[Callable[[str], Any]]) -> bool:
+    """호출 측 검증 (예외 또는 False 반환이면 실패)"""
+    if validate is None:
+        return True
+
+    try:
+        return validate(text) is not False
+    except Exception as e:
+        print(f"LLM 응답 검증 실패, 캐시하지 않음: {e}")
+        return False
+
+
+def cached_completion(provider: str,
+                      request: Dict[str, Any],
+                      cache_ttl: Optional[int],
+                      call: Callable[[], str],
+                      validate: Optional[Callable[[str], Any]] = None) -> str:
+    """캐시 조회 후 없으면 call() 실행 결과 저장 (cache_ttl이 없으면 캐시 사용 안 함)
+
+    validate 지정 시 검증을 통과한 응답만 저장 (검증에 실패한 캐시 값은 삭제 후 다시 호출)
+    Redis 오류는 캐시 미사용으로 처리 (LLM 호출은 그대로 진행)
+    """
+    if not cache_ttl or not settings.llm_cache_enabled:
+        return call()
+
+    key = cache_key(provider, request)
+
+    try:
+        cached = get_redis_client().get(key)
+        record_llm_cache(cached is not None)
+        if cached is not None:
+            text = cached.decode("utf-8")
+            if _is_valid(text, validate):
+                print(f"LLM 캐시 적중: {request.get('model')} ({key[-12:]})")
+                return text
+
+            get_redis_client().delete(key)
+    except Exception as e:
+        print(f"LLM 캐시 조회 실패: {e}")
+
+    text = call()
+
+    if text and _is_valid(text, validate):
+        try:
+            get_redis_client().setex(key, cache_ttl, text.encode("utf-8"))
+        except Exception as e:
+            print(f"LLM 캐시 저장 실패: {e}")
+
+    return text
+
+
+# ================= Calls =================
+
+def openai_chat(cache_ttl: Optional[int] = None, validate: Optional[Callable[[str], Any]] = None, **request) -> str:
+    """OpenAI chat completions 호출 후 응답 텍스트 반환 (request는 chat.completions.create 인자)"""
+
+    def call() -> str:
+        with track_call("openai", request.get("model", "")):
+            response = get_openai_client().chat.completions.create(**request)
+
+        if response.usage:
+            record_llm_usage("openai", request.get("model", ""), response.usage.prompt_tokens, response.usage.completion_tokens)
+
+        return (response.choices[0].message.content or "").strip()
+
+    return cached_completion("openai", request, cache_ttl, call, validate)
+
+
+def claude_message(cache_ttl: Optional[int] = None, validate: Optional[Callable[[str], Any]] = None, **request) -> str:
+    """Anthropic messages 호출 후 응답 텍스트 반환 (request는 messages.create 인자)"""
+
+    def call() -> str:
+        with track_call("anthropic", request.get("model", "")):
+            response = get_anthropic_client().messages.create(**request)
+
+        record_llm_usage("anthropic", request.get("model", ""), response.usage.input_tokens, response.usage.output_tokens)
+
+        return response.content[0].text.strip()
+
+    return cached_completion("anthropic", request, cache_ttl, call, validate)
+
+
+def chat_model_invoke(model: str,
+                      temperature: float,
+                      messages: Union[PromptValue, List[BaseMessage]],
+                      cache_ttl: Optional[int] = None,
+                      validate: Optional[Callable[[str], Any]] = None) -> str:
+    """langchain ChatOpenAI 호출 후 응답 텍스트 반환 (프롬프트 템플릿 결과 또는 메시지 리스트)"""
+    if isinstance(messages, PromptValue):
+        messages = messages.to_messages()
+
+    request = {
+        "model": model,
+        "temperature": temperature,
+        "messages": [{"role": LANGCHAIN_ROLES.get(m.type, m.type), "content": m.content} for m in messages]
+    }
+
+    def call() -> str:
+        with track_call("openai", model):
+            response = get_chat_model(model, temperature).invoke(messages)
+
+        usage = response.usage_metadata or {}
+        record_llm_usage("openai", model, usage.get("input_tokens"), usage.get("output_tokens"))
+
+        return response.content or ""
+
+    return cached_completion("openai", request, cache_ttl, call, validate)
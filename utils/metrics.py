@@ -0,0 +1,169 @@
+# utils/metrics.py
+"""
+노드/외부 호출 계측 (Prometheus)
+
+API 서버와 워커 프로세스의 값을 함께 보려면 두 프로세스 모두 같은 PROMETHEUS_MULTIPROC_DIR 환경 변수로 실행
+(prometheus_client import 전에 설정되어 있어야 함)
+"""
+import os
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Iterator, Optional, Tuple
+from langgraph.errors import GraphInterrupt
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess
+)
+
+# 노드/외부 호출은 수 초 ~ 수십 분까지 분포
+DURATION_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1200, 1800)
+
+# 모델별 100만 토큰당 가격 (USD, 입력/출력)
+MODEL_PRICES = {
+    "gpt-4o": (2.5, 10.0),
+    "gpt-4o-mini": (0.15, 0.6),
+    "claude-sonnet-4-20250514": (3.0, 15.0)
+}
+
+
+NODE_DURATION = Histogram(
+    "aivle_node_duration_seconds",
+    "LangGraph 노드 실행 시간",
+    ["graph", "node", "status"],
+    buckets = DURATION_BUCKETS
+)
+
+EXTERNAL_CALL_DURATION = Histogram(
+    "aivle_external_call_duration_seconds",
+    "외부 API 호출 시간 (OpenAI, Anthropic, Replicate, Suno, S3, 다운로드)",
+    ["provider", "operation", "status"],
+    buckets = DURATION_BUCKETS
+)
+
+ENCODE_DURATION = Histogram(
+    "aivle_encode_duration_seconds",
+    "영상/오디오 인코딩 시간",
+    ["operation", "status"],
+    buckets = DURATION_BUCKETS
+)
+
+LLM_TOKENS = Counter(
+    "aivle_llm_tokens_total",
+    "LLM 토큰 사용량",
+    ["provider", "model", "kind"]
+)
+
+LLM_COST = Counter(
+    "aivle_llm_cost_usd_total",
+    "LLM 예상 비용 (MODEL_PRICES 기준)",
+    ["provider", "model"]
+)
+
+LLM_CACHE_REQUESTS = Counter(
+    "aivle_llm_cache_requests_total",
+    "LLM 응답 캐시 조회 결과",
+    ["result"]
+)
+
+TRANSFER_BYTES = Counter(
+    "aivle_transfer_bytes_total",
+    "다운로드/업로드 바이트",
+    ["provider", "direction"]
+)
+
+
+def _status(error: Optional[BaseException]) -> str:
+    if error is None:
+        return "ok"
+
+    # 사람 입력 대기(interrupt)는 실패가 아님
+    return "interrupted" if isinstance(error, GraphInterrupt) else "error"
+
+
+@contextmanager
+def _timed(histogram: Histogram, **labels) -> Iterator[None]:
+    started = time.perf_counter()
+    error = None
+
+    try:
+        yield
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        histogram.labels(**labels, status = _status(error)).observe(time.perf_counter() - started)
+
+
+def track_call(provider: str, operation: str):
+    """외부 호출 시간 측정 (with 블록, 예외 발생 시 status=error)"""
+    return _timed(EXTERNAL_CALL_DURATION, provider = provider, operation = operation)
+
+
+def observe_call(provider: str, operation: str, seconds: float, ok: bool = True) -> None:
+    """직접 측정한 외부 호출 시간 기록 (폴링 등 with 블록으로 감쌀 수 없는 경우)"""
+    EXTERNAL_CALL_DURATION.labels(provider = provider, operation = operation, status = "ok" if ok else "error").observe(seconds)
+
+
+def track_encode(operation: str):
+    """인코딩 시간 측정 (with 블록)"""
+    return _timed(ENCODE_DURATION, operation = operation)
+
+
+def timed_node(graph: str, node: str) -> Callable[[Callable], Callable]:
+    """노드 실행 시간 측정 데코레이터"""
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with _timed(NODE_DURATION, graph = graph, node = node):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def record_llm_usage(provider: str, model: str, prompt_tokens: Optional[int], completion_tokens: Optional[int]) -> None:
+    """토큰 사용량 및 예상 비용 기록"""
+    prompt_tokens = prompt_tokens or 0
+    completion_tokens = completion_tokens or 0
+
+    LLM_TOKENS.labels(provider = provider, model = model, kind = "prompt").inc(prompt_tokens)
+    LLM_TOKENS.labels(provider = provider, model = model, kind = "completion").inc(completion_tokens)
+
+    prices: Optional[Tuple[float, float]] = MODEL_PRICES.get(model)
+    if prices:
+        LLM_COST.labels(provider = provider, model = model).inc(
+            (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1_000_000
+        )
+
+
+def record_llm_cache(hit: bool) -> None:
+    LLM_CACHE_REQUESTS.labels(result = "hit" if hit else "miss").inc()
+
+
+def record_transfer(provider: str, direction: str, size: int) -> None:
+    """다운로드(direction=download)/업로드(direction=upload) 바이트 기록"""
+    TRANSFER_BYTES.labels(provider = provider, direction = direction).inc(size)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """/metrics 응답 본문 (멀티프로세스 모드면 모든 프로세스 값 합산)"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int) -> None:
+    """종료된 워커 프로세스의 멀티프로세스 파일 정리"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
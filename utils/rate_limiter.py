@@ -0,0 +1,39 @@
+# utils/rate_limiter.py
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """토큰 버킷 방식 호출 속도 제한 (초당 rate개 보충, 최대 capacity개 누적)"""
+
+    def __init__(self, rate: float, capacity: int = 1):
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다")
+
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _try_take(self, tokens: float) -> float:
+        """토큰을 가져오면 0, 부족하면 필요한 대기 시간(초) 반환"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1) -> None:
+        while (wait := self._try_take(tokens)) > 0:
+            time.sleep(wait)
+
+    async def async_acquire(self, tokens: float = 1) -> None:
+        while (wait := self._try_take(tokens)) > 0:
+            await asyncio.sleep(wait)
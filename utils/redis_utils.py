@@ -0,0 +1,14 @@
+# utils/redis_utils.py
+import redis
+from config.settings import settings
+
+_redis_client = None
+
+def get_redis_client() -> redis.Redis:
+    """공용 Redis 클라이언트 (프로세스 내 커넥션 풀 공유)"""
+    global _redis_client
+
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(settings.redis_url)
+
+    return _redis_client
@@ -0,0 +1,123 @@
+# utils/replicate_utils.py
+import asyncio
+import time
+from typing import List, Dict, Optional, Any
+from replicate.prediction import Prediction
+from utils.rate_limiter import TokenBucket
+from utils.metrics import observe_call
+
+TERMINAL_STATUSES = ("succeeded", "failed", "canceled")
+
+
+async def submit_predictions(client,
+                             model: str,
+                             inputs: List[Dict[str, Any]],
+                             limiter: Optional[TokenBucket] = None) -> List[Any]:
+    """prediction을 모두 먼저 제출 (실패한 항목은 Exception 객체로 반환)"""
+
+    async def submit(input: Dict[str, Any]):
+        if limiter:
+            await limiter.async_acquire()
+        return await client.predictions.async_create(model = model, input = input)
+
+    return await asyncio.gather(*(submit(input) for input in inputs), return_exceptions = True)
+
+
+async def poll_predictions(client,
+                           predictions: List[Prediction],
+                           poll_interval: float = 3.0,
+                           timeout: float = 900,
+                           operation: str = "prediction",
+                           cancel_on_failure: bool = False) -> List[Prediction]:
+    """진행 중인 prediction 전체를 하나의 루프에서 함께 상태 확인 (완료까지 걸린 시간 기록)
+
+    cancel_on_failure: 하나라도 실패하면 나머지를 바로 취소 (전체가 성공해야 쓸모 있는 작업)
+    """
+
+    results = {p.id: p for p in predictions}
+    pending = [p.id for p in predictions if p.status not in TERMINAL_STATUSES]
+    started = time.monotonic()
+    deadline = started + timeout
+
+    while pending:
+        if time.monotonic() > deadline:
+            # 남은 prediction은 Replicate에서 계속 실행(과금)되므로 취소 후 실패 처리
+            await cancel_predictions(client, pending)
+            raise TimeoutError(f"Replicate prediction 시간 초과: {pending}")
+
+        await asyncio.sleep(poll_interval)
+
+        refreshed = await asyncio.gather(
+            *(client.predictions.async_get(prediction_id) for prediction_id in pending),
+            return_exceptions = True
+        )
+
+        still_pending = []
+        failed = False
+        for prediction_id, prediction in zip(pending, refreshed):
+            # 일시적 조회 오류는 다음 주기에 재시도
+            if isinstance(prediction, Exception):
+                print(f"prediction 상태 조회 실패 ({prediction_id}): {prediction}")
+                still_pending.append(prediction_id)
+                continue
+
+            results[prediction_id] = prediction
+            if prediction.status not in TERMINAL_STATUSES:
+                still_pending.append(prediction_id)
+            else:
+                observe_call("replicate", operation, time.monotonic() - started, prediction.status == "succeeded")
+                failed = failed or prediction.status != "succeeded"
+
+        pending = still_pending
+
+        if failed and cancel_on_failure and pending:
+            print(f"prediction 실패, 남은 prediction 취소: {pending}")
+            results.update(await cancel_predictions(client, pending))
+            break
+
+    return [results[p.id] for p in predictions]
+
+
+async def cancel_predictions(client, prediction_ids: List[str]) -> Dict[str, Prediction]:
+    """prediction 취소 후 취소 응답의 최신 상태 반환 (취소 실패는 로그만 남기고 제외)"""
+    cancelled = await asyncio.gather(
+        *(client.predictions.async_cancel(prediction_id) for prediction_id in prediction_ids),
+        return_exceptions = True
+    )
+
+    results = {}
+    for prediction_id, result in zip(prediction_ids, cancelled):
+        if isinstance(result, Exception):
+            print(f"prediction 취소 실패 ({prediction_id}): {result}")
+        else:
+            print(f"prediction 취소: {prediction_id} ({result.status})")
+            results[prediction_id] = result
+
+    return results
+
+
+async def run_predictions(client,
+                          model: str,
+                          inputs: List[Dict[str, Any]],
+                          limiter: Optional[TokenBucket] = None,
+                          poll_interval: float = 3.0,
+                          timeout: float = 900,
+                          cancel_on_failure: bool = False) -> List[Any]:
+    """입력 목록을 한 번에 제출하고 완료까지 대기 (입력 순서 유지, 제출 실패는 Exception)
+
+    cancel_on_failure: 제출 실패나 prediction 실패가 하나라도 있으면 나머지를 바로 취소
+    """
+
+    submitted = await submit_predictions(client, model, inputs, limiter)
+
+    in_flight = [p for p in submitted if not isinstance(p, Exception)]
+
+    if cancel_on_failure and len(in_flight) < len(submitted):
+        print("prediction 제출 실패, 제출된 prediction 취소")
+        cancelled = await cancel_predictions(client, [p.id for p in in_flight if p.status not in TERMINAL_STATUSES])
+        in_flight = [cancelled.get(p.id, p) for p in in_flight]
+
+    finished = await poll_predictions(client, in_flight, poll_interval, timeout, operation = model, cancel_on_failure = cancel_on_failure)
+    finished_by_id = {p.id: p for p in finished}
+
+    return [p if isinstance(p, Exception) else finished_by_id[p.id] for p in submitted]
@@ -0,0 +1,160 @@
+# utils/s3_uploader.py
+import os
+import time
+import tempfile
+import threading
+import subprocess
+from dataclasses import dataclass
+from typing import BinaryIO, List, Optional
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from config.settings import settings
+from utils.ffmpeg_utils import get_ffmpeg_exe
+from utils.metrics import record_transfer, track_call
+
+# 파이프 출력용 MP4 (moov를 앞에 두는 fragmented MP4 → 탐색 없이 순차 기록)
+FRAGMENTED_MP4_ARGS = ["-movflags", "frag_keyframe+empty_moov+default_base_moof", "-f", "mp4"]
+
+
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+
+def get_s3_client():
+    """공용 S3 클라이언트 (커넥션 풀 공유, S3_ENDPOINT_URL 지정 시 로컬 S3 호환 서버 사용)"""
+    global _s3_client
+
+    with _s3_client_lock:
+        if _s3_client is None:
+            _s3_client = boto3.client(
+                's3',
+                endpoint_url = settings.s3_endpoint_url,
+                aws_access_key_id = settings.aws_access_key_id,
+                aws_secret_access_key = settings.aws_secret_access_key,
+                region_name = settings.aws_default_region,
+                config = Config(
+                    max_pool_connections = settings.s3_max_pool_connections,
+                    retries = {"max_attempts": 5, "mode": "adaptive"},
+                    # 로컬 S3 호환 서버는 버킷 서브도메인을 지원하지 않으므로 경로 방식 사용
+                    s3 = {"addressing_style": "path"} if settings.s3_endpoint_url else None
+                )
+            )
+
+    return _s3_client
+
+
+def get_transfer_config() -> TransferConfig:
+    """멀티파트 업로드 설정 (파트 크기, 동시 업로드 수)"""
+    return TransferConfig(
+        multipart_threshold = settings.s3_multipart_threshold,
+        multipart_chunksize = settings.s3_multipart_chunksize,
+        max_concurrency = settings.s3_max_concurrency,
+        use_threads = True
+    )
+
+
+@dataclass
+class UploadResult:
+    """업로드 결과 및 측정값"""
+    bucket: str
+    key: str
+    size: int
+    seconds: float
+
+    @property
+    def throughput_mbps(self) -> float:
+        return self.size * 8 / 1_000_000 / self.seconds if self.seconds > 0 else 0.0
+
+
+class _CountingReader:
+    """읽은 바이트 수를 세고, 지정 시 읽은 내용을 로컬 파일에도 기록"""
+
+    def __init__(self, stream: BinaryIO, copy_to: Optional[BinaryIO] = None):
+        self.stream = stream
+        self.copy_to = copy_to
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.stream.read(size)
+        self.size += len(chunk)
+
+        if self.copy_to is not None and chunk:
+            self.copy_to.write(chunk)
+
+        return chunk
+
+
+def _log_upload(result: UploadResult, label: str) -> UploadResult:
+    record_transfer("s3", "upload", result.size)
+    print(
+        f"S3 업로드 완료 ({label}): s3://{result.bucket}/{result.key} "
+        f"{result.size / 1024 ** 2:.1f}MB, {result.seconds:.2f}초, {result.throughput_mbps:.1f}Mbps"
+    )
+    return result
+
+
+def upload_file(path: str, key: str, bucket: Optional[str] = None, content_type: str = "video/mp4") -> UploadResult:
+    """파일 업로드 (크기가 threshold 이상이면 멀티파트 동시 업로드)"""
+    bucket = bucket or settings.s3_bucket
+    started = time.perf_counter()
+
+    with track_call("s3", "upload"):
+        get_s3_client().upload_file(
+            path, bucket, key,
+            ExtraArgs = {"ContentType": content_type},
+            Config = get_transfer_config()
+        )
+
+    return _log_upload(UploadResult(bucket, key, os.path.getsize(path), time.perf_counter() - started), "file")
+
+
+def stream_ffmpeg_to_s3(ffmpeg_args: List[str],
+                        key: str,
+                        bucket: Optional[str] = None,
+                        local_copy_path: Optional[str] = None,
+                        content_type: str = "video/mp4") -> UploadResult:
+    """ffmpeg 출력을 파이프로 받아 인코딩과 동시에 멀티파트 업로드
+
+    ffmpeg_args: 입력/필터/코덱 인자 (출력 형식/경로 제외, fragmented MP4로 stdout 출력)
+    local_copy_path: 지정 시 업로드하면서 같은 내용을 로컬에도 기록
+    ffmpeg 실패 시 업로드된 객체 삭제 후 예외 발생
+    """
+    bucket = bucket or settings.s3_bucket
+    client = get_s3_client()
+
+    command = [get_ffmpeg_exe(), "-hide_banner", "-loglevel", "error", "-y", *ffmpeg_args, *FRAGMENTED_MP4_ARGS, "pipe:1"]
+
+    started = time.perf_counter()
+
+    with track_call("s3", "stream_upload"), tempfile.TemporaryFile() as stderr_file:
+        process = subprocess.Popen(command, stdout = subprocess.PIPE, stderr = stderr_file)
+        copy_file = open(local_copy_path, "wb") if local_copy_path else None
+
+        try:
+            reader = _CountingReader(process.stdout, copy_file)
+            client.upload_fileobj(
+                reader, bucket, key,
+                ExtraArgs = {"ContentType": content_type},
+                Config = get_transfer_config()
+            )
+
+        except Exception:
+            process.kill()
+            raise
+
+        finally:
+            returncode = process.wait()
+            process.stdout.close()
+            if copy_file is not None:
+                copy_file.close()
+
+        if returncode != 0:
+            # 파이프가 중간에 끊겨도 업로드는 완료되므로 불완전한 객체 삭제
+            client.delete_object(Bucket = bucket, Key = key)
+
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode("utf-8", errors = "ignore").strip()
+            raise RuntimeError(f"ffmpeg 실행 실패 (code {returncode}): {stderr[-2000:]}")
+
+    return _log_upload(UploadResult(bucket, key, reader.size, time.perf_counter() - started), "stream")
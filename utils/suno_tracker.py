@@ -0,0 +1,241 @@
+# utils/suno_tracker.py
+import json
+import time
+import asyncio
+import threading
+import concurrent.futures
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+import redis.asyncio as aioredis
+from config.settings import settings
+from utils.redis_utils import get_redis_client
+from utils.metrics import track_call
+
+SUNO_TASK_KEY_PREFIX = "suno:task:"
+SUNO_CALLBACK_CHANNEL = "suno:callbacks"
+
+# 생성 진행 중 상태 (record-info)
+PENDING_STATUSES = {"PENDING", "TEXT_SUCCESS", "FIRST_SUCCESS"}
+
+# 콜백 결과 보관 시간 (대기 등록 전에 콜백이 먼저 도착한 경우 대비)
+CALLBACK_RESULT_TTL = 60 * 60
+
+
+class SunoTaskError(Exception):
+    """Suno 생성 실패"""
+
+
+def _audio_urls(tracks: List[Dict[str, Any]]) -> List[str]:
+    """곡 목록에서 오디오 URL 추출 (record-info는 audioUrl, 콜백은 audio_url)"""
+    urls = [track.get("audioUrl") or track.get("audio_url") for track in tracks or []]
+    return [url for url in urls if url]
+
+
+def parse_record_info(data: Dict[str, Any]) -> Tuple[str, List[str]]:
+    """record-info 응답 → (상태, 오디오 URL 목록)"""
+    record = data.get("data") or {}
+    status = record.get("status") or "PENDING"
+    urls = _audio_urls((record.get("response") or {}).get("sunoData"))
+
+    return status, urls
+
+
+def parse_callback(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Suno 콜백 본문 → 결과 (완료/실패만, 중간 단계 콜백은 None)"""
+    data = payload.get("data") or {}
+    task_id = data.get("task_id") or data.get("taskId")
+    callback_type = data.get("callbackType")
+
+    if not task_id:
+        return None
+
+    if payload.get("code") != 200 or callback_type == "error":
+        return {"task_id": task_id, "status": "FAILED", "audio_urls": [], "error": payload.get("msg")}
+
+    if callback_type == "complete":
+        return {"task_id": task_id, "status": "SUCCESS", "audio_urls": _audio_urls(data.get("data")), "error": None}
+
+    return None
+
+
+def record_suno_callback(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """콜백 결과를 Redis에 저장하고 대기 중인 워커에 알림 (API 프로세스에서 호출)"""
+    result = parse_callback(payload)
+    if result is None:
+        return None
+
+    encoded = json.dumps(result, ensure_ascii = False)
+
+    pipe = get_redis_client().pipeline()
+    pipe.setex(f"{SUNO_TASK_KEY_PREFIX}{result['task_id']}", CALLBACK_RESULT_TTL, encoded)
+    pipe.publish(SUNO_CALLBACK_CHANNEL, encoded)
+    pipe.execute()
+
+    print(f"[SUNO] 콜백 수신: {result['task_id']} ({result['status']})")
+
+    return result
+
+
+# ================= Tracker =================
+
+@dataclass
+class _PendingTask:
+    future: asyncio.Future
+    next_poll_at: float
+    interval: float
+    last_status: Optional[str] = None
+
+
+class SunoTaskTracker:
+    """대기 중인 Suno 작업 전체를 하나의 이벤트 루프에서 추적
+
+    - 콜백: Redis pub/sub으로 수신 즉시 완료 처리
+    - 폴링: 콜백이 없을 때의 대체 경로, 작업별로 진행 상태가 바뀌지 않으면 간격을 늘림
+    """
+
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+        self._tasks: Dict[str, _PendingTask] = {}
+        self._ready = threading.Event()
+
+        self._thread = threading.Thread(target = self._run, name = "suno-tracker", daemon = True)
+        self._thread.start()
+        self._ready.wait()
+
+    def wait(self, task_id: str, timeout: Optional[float] = None) -> List[str]:
+        """작업 완료까지 대기 후 오디오 URL 목록 반환 (실패 시 SunoTaskError, 시간 초과 시 TimeoutError)"""
+        timeout = timeout or settings.suno_timeout_seconds
+        future = asyncio.run_coroutine_threadsafe(self._track(task_id), self._loop)
+
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Suno 오디오 생성 시간 초과 ({task_id})")
+
+    # ---------- 이벤트 루프 (tracker 스레드) ----------
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+
+        self._wakeup = asyncio.Event()
+        self._http = httpx.AsyncClient(base_url = settings.suno_api_base_url, timeout = 30)
+        self._redis = aioredis.from_url(settings.redis_url)
+
+        self._loop.create_task(self._poll_loop())
+        self._loop.create_task(self._listen_callbacks())
+        self._ready.set()
+
+        self._loop.run_forever()
+
+    async def _track(self, task_id: str) -> List[str]:
+        future = self._loop.create_future()
+
+        # 콜백을 받는 경우 폴링은 안전장치로만 드물게 실행
+        interval = settings.suno_poll_max_interval if settings.suno_callback_url else settings.suno_poll_min_interval
+        self._tasks[task_id] = _PendingTask(future = future, next_poll_at = time.monotonic() + interval, interval = interval)
+        self._wakeup.set()
+
+        try:
+            # 대기 등록 전에 도착한 콜백 확인
+            stored = await self._redis.get(f"{SUNO_TASK_KEY_PREFIX}{task_id}")
+            if stored:
+                self._resolve(json.loads(stored))
+        except Exception as e:
+            print(f"[SUNO] 콜백 결과 조회 실패: {e}")
+
+        try:
+            return await future
+        finally:
+            self._tasks.pop(task_id, None)
+
+    def _resolve(self, result: Dict[str, Any]) -> None:
+        task = self._tasks.get(result["task_id"])
+        if task is None or task.future.done():
+            return
+
+        if result["status"] == "SUCCESS" and result["audio_urls"]:
+            task.future.set_result(result["audio_urls"])
+        else:
+            task.future.set_exception(SunoTaskError(f"{result['status']}: {result.get('error')}"))
+
+    async def _listen_callbacks(self) -> None:
+        while True:
+            try:
+                pubsub = self._redis.pubsub()
+                await pubsub.subscribe(SUNO_CALLBACK_CHANNEL)
+
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._resolve(json.loads(message["data"]))
+
+            except Exception as e:
+                print(f"[SUNO] 콜백 구독 오류: {e} (재연결 대기)")
+                await asyncio.sleep(settings.suno_poll_max_interval)
+
+    async def _poll_loop(self) -> None:
+        while True:
+            now = time.monotonic()
+            due = [(task_id, task) for task_id, task in self._tasks.items() if task.next_poll_at <= now]
+
+            if due:
+                await asyncio.gather(*(self._poll(task_id, task) for task_id, task in due))
+
+            # 다음 폴링 시각까지 대기 (새 작업 등록 시 즉시 깨어남)
+            next_at = min((task.next_poll_at for task in self._tasks.values()), default = now + 60)
+            self._wakeup.clear()
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout = max(0.0, next_at - time.monotonic()))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll(self, task_id: str, task: _PendingTask) -> None:
+        try:
+            with track_call("suno", "record_info"):
+                response = await self._http.get(
+                    "/api/v1/generate/record-info",
+                    params = {"taskId": task_id},
+                    headers = {"Authorization": f"Bearer {settings.suno_api_key}"}
+                )
+                response.raise_for_status()
+            status, urls = parse_record_info(response.json())
+
+        except Exception as e:
+            print(f"[SUNO] 상태 조회 실패 ({task_id}): {e}")
+            status, urls = task.last_status, []
+
+        print(f"[SUNO] {task_id} Status: {status}")
+
+        if status == "SUCCESS" or (urls and status not in PENDING_STATUSES):
+            self._resolve({"task_id": task_id, "status": "SUCCESS", "audio_urls": urls})
+            return
+
+        if status is not None and status not in PENDING_STATUSES:
+            self._resolve({"task_id": task_id, "status": status, "audio_urls": [], "error": "생성 실패"})
+            return
+
+        # 진행 단계가 바뀌면 곧 끝날 가능성이 높으므로 짧게, 그대로면 점점 길게
+        if status != task.last_status:
+            task.interval = settings.suno_poll_min_interval
+        else:
+            task.interval = min(settings.suno_poll_max_interval, task.interval * 1.5)
+
+        task.last_status = status
+        task.next_poll_at = time.monotonic() + task.interval
+
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+
+def get_suno_tracker() -> SunoTaskTracker:
+    """프로세스 공용 Suno 작업 추적기 (첫 호출 시 시작)"""
+    global _tracker
+
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = SunoTaskTracker()
+
+    return _tracker
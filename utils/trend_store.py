@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional
+from config.settings import settings
+
+
+@dataclass
+class TrendEntry:
+    """캐시된 값 (expires_at/next_refresh_at: time.monotonic 기준 만료 시각/다음 갱신 가능 시각)"""
+    value: Any
+    expires_at: float
+    refreshing: bool = False
+    next_refresh_at: float = 0.0
+
+
+class TrendStore:
+    """TTL 캐시 + 동시 미스 단일 호출(single-flight) + 만료 전 백그라운드 갱신
+
+    - 만료 전이면 캐시 값을 즉시 반환
+    - 같은 키의 동시 미스는 첫 요청의 loader 결과를 공유 (loader 1회 호출)
+    - 만료 refresh_ahead초 이내에 조회된 키(자주 쓰이는 키)는 캐시 값을 반환하고 백그라운드에서 갱신
+    - 실패는 캐시하지 않음 (갱신 실패 시 기존 값을 만료까지 유지, refresh_retry초 동안 갱신 재시도 안 함)
+    """
+
+    def __init__(self,
+                 ttl: Optional[float] = None,
+                 refresh_ahead: Optional[float] = None,
+                 max_entries: Optional[int] = None,
+                 refresh_retry: Optional[float] = None):
+        self._ttl = ttl
+        self._refresh_ahead = refresh_ahead
+        self._max_entries = max_entries
+        self._refresh_retry = refresh_retry
+        self._entries: "OrderedDict[Hashable, TrendEntry]" = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl if self._ttl is not None else settings.trend_cache_ttl_seconds
+
+    @property
+    def refresh_ahead(self) -> float:
+        return self._refresh_ahead if self._refresh_ahead is not None else settings.trend_refresh_ahead_seconds
+
+    @property
+    def refresh_retry(self) -> float:
+        return self._refresh_retry if self._refresh_retry is not None else settings.trend_refresh_retry_seconds
+
+    @property
+    def max_entries(self) -> int:
+        return self._max_entries if self._max_entries is not None else settings.trend_cache_max_entries
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """캐시 조회, 없거나 만료됐으면 loader() 결과 저장 후 반환"""
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and now < entry.expires_at:
+                self._entries.move_to_end(key)
+
+                refresh_at = max(entry.expires_at - self.refresh_ahead, entry.next_refresh_at)
+                if not entry.refreshing and now >= refresh_at:
+                    entry.refreshing = True
+                    threading.Thread(target = self._refresh, args = (key, entry, loader), daemon = True).start()
+
+                return entry.value
+
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if owner:
+            try:
+                value = loader()
+                self._put(key, value)
+                future.set_result(value)
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+
+        return future.result()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = TrendEntry(value = value, expires_at = time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > max(1, self.max_entries):
+                self._entries.popitem(last = False)
+
+    def _refresh(self, key: Hashable, entry: TrendEntry, loader: Callable[[], Any]) -> None:
+        try:
+            self._put(key, loader())
+            print(f"트렌드 캐시 백그라운드 갱신 완료: {key}")
+        except Exception as e:
+            print(f"트렌드 캐시 백그라운드 갱신 실패 ({key}): {e}")
+            # 제공자 장애 시 요청마다 갱신 호출이 나가지 않도록 재시도 간격 적용
+            with self._lock:
+                entry.refreshing = False
+                entry.next_refresh_at = time.monotonic() + self.refresh_retry
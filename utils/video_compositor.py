@@ -0,0 +1,185 @@
+# utils/video_compositor.py
+import os
+from typing import List
+from utils.ffmpeg_utils import run_ffmpeg, probe_video
+from utils.metrics import track_encode
+
+# 크로스페이드/페이드아웃 곡선 (t: 0 → 1)
+FADE_FUNCTIONS = {
+    'ease_in_out': lambda t: 3*t**2 - 2*t**3,
+    'ease_in': lambda t: t**2,
+    'ease_out': lambda t: 1 - (1-t)**2,
+    'linear': lambda t: t
+}
+
+# xfade custom 표현식용 A(앞 영상) 가중치 (P: 전환 진행에 따라 1 → 0)
+# 크로스페이드: 1 - f(1-P), 페이드아웃: f(P) → 픽셀 단위로 평가되므로 st/ld·분기 없이 P 다항식으로 전개
+CROSSFADE_WEIGHTS = {
+    'ease_in_out': "P*P*(3-2*P)",
+    'ease_in': "P*(2-P)",
+    'ease_out': "P*P",
+    'linear': "P"
+}
+
+FADEOUT_WEIGHTS = {
+    'ease_in_out': "P*P*(3-2*P)",
+    'ease_in': "P*P",
+    'ease_out': "P*(2-P)",
+    'linear': "P"
+}
+
+
+def xfade_filter(duration: float, offset: float, weight: str) -> str:
+    """xfade 필터 문자열 (linear는 내장 fade 전환, 그 외는 custom 표현식)"""
+    if weight == "P":
+        transition = "transition=fade"
+    else:
+        transition = f"transition=custom:expr='B+(A-B)*{weight}'"
+
+    return f"xfade={transition}:duration={duration}:offset={offset:.6f}"
+
+
+def build_sequence_filtergraph(durations: List[float],
+                               target_resolution: tuple,
+                               fade_duration: float,
+                               last_fadeout_duration: float,
+                               fade_type: str,
+                               fps: int = 24) -> str:
+    """세그먼트 크로스페이드 + 마지막 페이드아웃을 하나의 filtergraph로 구성"""
+    width, height = target_resolution
+    filters = []
+
+    # 1. 입력 정규화 (해상도/fps/픽셀 포맷/타임베이스 통일)
+    for i in range(len(durations)):
+        filters.append(
+            f"[{i}:v]scale={width}:{height},setsar=1,fps={fps},format=yuv420p,settb=AVTB[v{i}]"
+        )
+
+    # 2. 순차 크로스페이드 (offset = 지금까지의 출력 길이 - 페이드 길이)
+    current = "v0"
+    total_duration = durations[0]
+
+    for i in range(1, len(durations)):
+        offset = total_duration - fade_duration
+        filters.append(
+            f"[{current}][v{i}]{xfade_filter(fade_duration, offset, CROSSFADE_WEIGHTS[fade_type])}[x{i}]"
+        )
+        current = f"x{i}"
+        total_duration = offset + durations[i]
+
+    # 3. 마지막 페이드아웃 (검정 화면과 xfade → 전체 길이 유지, YUV 검정값으로 감쇠)
+    fadeout = min(last_fadeout_duration, total_duration)
+    filters.append(
+        f"color=c=black:s={width}x{height}:r={fps}:d={fadeout},format=yuv420p,settb=AVTB[black]"
+    )
+    filters.append(
+        f"[{current}][black]{xfade_filter(fadeout, total_duration - fadeout, FADEOUT_WEIGHTS[fade_type])}[out]"
+    )
+
+    return ";".join(filters)
+
+
+def compose_video_sequence(video_paths: List[str],
+                           output_path: str,
+                           fade_duration: float = 0.7,
+                           last_fadeout_duration: float = 2.0,
+                           fade_type: str = 'ease_in_out',
+                           fps: int = 24,
+                           bitrate: str = '12000k',
+                           preset: str = 'medium') -> str:
+    """영상 시퀀스를 한 번의 디코딩/인코딩으로 합성 (ffmpeg filtergraph)"""
+
+    if not video_paths:
+        raise ValueError("합성할 영상이 없습니다")
+
+    if fade_type not in CROSSFADE_WEIGHTS:
+        raise ValueError(f"지원하지 않는 페이드 타입: {fade_type}")
+
+    # 1단계: 메타데이터만 읽어 길이/해상도 확인
+    durations = []
+    resolutions = []
+    for i, path in enumerate(video_paths):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"영상 파일을 찾을 수 없습니다: {path}")
+
+        info = probe_video(path)
+        durations.append(info["duration"])
+        resolutions.append(info["size"])
+
+        print(f"파일 확인 ({i+1}/{len(video_paths)}): {os.path.basename(path)} - {info['size']}, {info['duration']:.2f}s")
+
+    # 2단계: 목표 해상도 지정 (가장 작은 해상도 통일)
+    target_resolution = (min(res[0] for res in resolutions), min(res[1] for res in resolutions))
+    print(f"지정 해상도: {target_resolution}")
+
+    # 3단계: 단일 패스 합성 + 인코딩
+    filtergraph = build_sequence_filtergraph(
+        durations, target_resolution, fade_duration, last_fadeout_duration, fade_type, fps
+    )
+
+    args = []
+    for path in video_paths:
+        args += ["-i", path]
+
+    args += [
+        "-filter_complex", filtergraph,
+        "-map", "[out]",
+        "-an",
+        "-c:v", "libx264",
+        "-b:v", bitrate,
+        "-preset", preset,
+        "-pix_fmt", "yuv420p",
+        "-r", str(fps),
+        "-movflags", "+faststart",
+        output_path
+    ]
+
+    with track_encode("compose"):
+        run_ffmpeg(args)
+    print(f"영상 합성 완료 ({len(video_paths)}개 세그먼트): {output_path}")
+
+    return output_path
+
+
+def mux_video_with_audio_args(video_path: str,
+                              audio_path: str,
+                              duration: float,
+                              fadeout_duration: float = 2.5,
+                              audio_bitrate: str = '192k') -> List[str]:
+    """mux용 ffmpeg 인자 (출력 형식/경로 제외): 영상 스트림 복사, 오디오만 길이 맞춤 + 페이드아웃"""
+
+    fadeout = min(fadeout_duration, duration)
+    audio_filter = (
+        f"atrim=0:{duration:.6f},asetpts=PTS-STARTPTS,"
+        f"afade=t=out:st={duration - fadeout:.6f}:d={fadeout:.6f}"
+    )
+
+    return [
+        "-i", video_path,
+        "-i", audio_path,
+        "-map", "0:v:0",
+        "-map", "1:a:0",
+        "-c:v", "copy",
+        "-af", audio_filter,
+        "-c:a", "aac",
+        "-b:a", audio_bitrate,
+        "-t", f"{duration:.6f}"
+    ]
+
+
+def mux_video_with_audio(video_path: str,
+                         audio_path: str,
+                         output_path: str,
+                         duration: float,
+                         fadeout_duration: float = 2.5,
+                         audio_bitrate: str = '192k') -> str:
+    """영상 트랙은 스트림 복사, 오디오만 길이 맞춤 + 페이드아웃 후 mux (재인코딩 없음)"""
+
+    with track_encode("mux"):
+        run_ffmpeg([
+            *mux_video_with_audio_args(video_path, audio_path, duration, fadeout_duration, audio_bitrate),
+            "-movflags", "+faststart",
+            output_path
+        ])
+
+    return output_path
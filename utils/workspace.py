@@ -0,0 +1,112 @@
+# utils/workspace.py
+import os
+import re
+import time
+import shutil
+from dataclasses import dataclass
+from typing import Optional
+from config.settings import settings
+
+# session_id가 없는 실행(로컬 테스트 등)이 함께 쓰는 작업 공간
+DEFAULT_SESSION = "default"
+
+
+@dataclass(frozen = True)
+class SessionWorkspace:
+    """세션별 작업 공간
+
+    - root: 최종 결과물 (디스크)
+    - scratch: 세그먼트/중간 합성/오디오 등 중간 파일 (설정 시 tmpfs)
+    """
+    session_id: str
+    root: str
+    scratch: str
+
+    def scratch_dir(self, *parts: str) -> str:
+        """중간 파일 디렉토리 (생성 후 반환)"""
+        path = os.path.join(self.scratch, *parts)
+        os.makedirs(path, exist_ok = True)
+        return path
+
+    def output_path(self, *parts: str) -> str:
+        """최종 결과 파일 경로 (상위 디렉토리 생성)"""
+        return self._file_path(self.root, parts)
+
+    def scratch_path(self, *parts: str) -> str:
+        """중간 파일 경로 (상위 디렉토리 생성)"""
+        return self._file_path(self.scratch, parts)
+
+    @staticmethod
+    def _file_path(base: str, parts: tuple) -> str:
+        path = os.path.join(base, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok = True)
+        return path
+
+
+def _safe_name(session_id: Optional[str]) -> str:
+    return re.sub(r"[^A-Za-z0-9_-]", "_", session_id or DEFAULT_SESSION)
+
+
+def _scratch_root() -> str:
+    """중간 파일 위치 (tmpfs 경로가 설정되어 있고 사용 가능하면 tmpfs)"""
+    scratch_root = settings.workspace_scratch_root
+
+    if scratch_root:
+        try:
+            os.makedirs(scratch_root, exist_ok = True)
+            if os.access(scratch_root, os.W_OK):
+                return scratch_root
+        except OSError as e:
+            print(f"scratch 경로 사용 불가 ({scratch_root}): {e}, 디스크 작업 공간 사용")
+
+    return os.path.join(settings.workspace_root, "scratch")
+
+
+def get_workspace(session_id: Optional[str]) -> SessionWorkspace:
+    """세션 작업 공간 (같은 session_id → 같은 경로, 노드 간 공유)"""
+    name = _safe_name(session_id)
+
+    workspace = SessionWorkspace(
+        session_id = name,
+        root = os.path.join(settings.workspace_root, "sessions", name),
+        scratch = os.path.join(_scratch_root(), name)
+    )
+
+    os.makedirs(workspace.root, exist_ok = True)
+    os.makedirs(workspace.scratch, exist_ok = True)
+
+    return workspace
+
+
+def cleanup_workspace(session_id: Optional[str], scratch_only: bool = False) -> None:
+    """세션 작업 공간 삭제 (작업 종료 시, scratch_only면 중간 파일만 삭제)"""
+    name = _safe_name(session_id)
+
+    paths = [os.path.join(_scratch_root(), name)]
+    if not scratch_only:
+        paths.append(os.path.join(settings.workspace_root, "sessions", name))
+
+    for path in paths:
+        shutil.rmtree(path, ignore_errors = True)
+
+    print(f"작업 공간 정리: {name}{' (중간 파일)' if scratch_only else ''}")
+
+
+def cleanup_stale_workspaces(max_age_seconds: Optional[int] = None) -> int:
+    """오래된 작업 공간 삭제 (비정상 종료로 남은 세션), 삭제한 세션 수 반환"""
+    max_age_seconds = max_age_seconds or settings.workspace_max_age_seconds
+    deadline = time.time() - max_age_seconds
+    removed = 0
+
+    for base in (os.path.join(settings.workspace_root, "sessions"), _scratch_root()):
+        if not os.path.isdir(base):
+            continue
+
+        for name in os.listdir(base):
+            path = os.path.join(base, name)
+
+            if os.path.isdir(path) and os.path.getmtime(path) < deadline:
+                shutil.rmtree(path, ignore_errors = True)
+                removed += 1
+
+    return removed
@@ -0,0 +1,116 @@
+# workers/shorts_worker.py
+"""
+Shorts 영상 생성 워커
+
+API 서버와 별도 프로세스로 실행:
+    python -m workers.shorts_worker --concurrency 2
+"""
+import argparse
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from config.settings import settings
+from services.shorts_job_service import (
+    ack_video_job,
+    claim_video_job,
+    parse_queue_entry,
+    release_worker_lease,
+    renew_worker_lease,
+    requeue_stale_jobs,
+    run_video_job
+)
+from utils.workspace import cleanup_stale_workspaces
+from utils.metrics import mark_process_dead
+
+
+def heartbeat_loop(worker_id: str, stop: threading.Event) -> None:
+    """작업 실행 중에도 임대(lease) 갱신 (갱신이 끊기면 다른 워커가 처리 중 작업을 재등록)"""
+    interval = max(1, settings.shorts_worker_lease_seconds // 3)
+
+    while not stop.wait(interval):
+        try:
+            renew_worker_lease(worker_id)
+        except Exception as e:
+            print(f"[WORKER] 임대 갱신 실패 ({worker_id}): {e}")
+
+
+def worker_loop(worker_index: int) -> None:
+    """큐에서 작업을 하나씩 꺼내 실행"""
+    # Ctrl-C는 부모 프로세스가 받아 워커를 종료 (SIGTERM은 기본 동작, 벤치마크처럼 스레드로 실행하면 생략)
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # 프로세스/스레드마다 고유 (재시작하면 새 id → 이전 처리 중 목록은 임대 만료 후 재등록)
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{worker_index}"
+
+    renew_worker_lease(worker_id)
+    stop = threading.Event()
+    threading.Thread(target = heartbeat_loop, args = (worker_id, stop), daemon = True).start()
+
+    print(f"[WORKER {worker_index}] 대기 중 (queue: {settings.shorts_job_queue}, id: {worker_id})")
+
+    last_requeue_at = 0.0
+
+    try:
+        while True:
+            # 종료된 워커가 남긴 작업 확인 (임대 시간 주기)
+            if time.monotonic() - last_requeue_at >= settings.shorts_worker_lease_seconds:
+                requeue_stale_jobs()
+                last_requeue_at = time.monotonic()
+
+            entry = claim_video_job(worker_id)
+
+            if entry is None:
+                continue
+
+            run_video_job(*parse_queue_entry(entry))
+            ack_video_job(worker_id, entry)
+
+    finally:
+        stop.set()
+        release_worker_lease(worker_id)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = "Shorts 영상 생성 워커")
+    parser.add_argument("--concurrency", type = int, default = settings.shorts_worker_concurrency, help = "워커 프로세스 수")
+    args = parser.parse_args()
+
+    # 비정상 종료 등으로 남은 오래된 세션 작업 공간 정리
+    removed = cleanup_stale_workspaces()
+    if removed:
+        print(f"[WORKER] 오래된 작업 공간 {removed}개 정리")
+
+    # 이전 워커가 실행 중 종료되어 처리 중 목록에 남은 작업 재등록 (임대가 만료된 목록만)
+    requeue_stale_jobs()
+
+    processes = [
+        multiprocessing.Process(target = worker_loop, args = (i,), daemon = True)
+        for i in range(max(1, args.concurrency))
+    ]
+
+    def shutdown(signum, frame):
+        print("[WORKER] 종료 신호 수신, 워커 종료")
+        for process in processes:
+            process.terminate()
+            process.join(timeout = 10)
+            mark_process_dead(process.pid)
+        sys.exit(0)
+
+    for process in processes:
+        process.start()
+
+    # 자식 프로세스가 상속하지 않도록 시작 후 등록
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()